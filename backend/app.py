@@ -1,12 +1,19 @@
-from flask import Flask, request, redirect, session, jsonify, render_template, url_for, make_response
-from database import DBhandler
+from flask import Flask, request, redirect, session, jsonify, render_template, url_for, make_response, g
+from database import DBhandler, valid_user_id
+from unit_of_work import begin_unit_of_work, end_unit_of_work
+from metrics import REGISTRY, begin_request, end_request, observe_request
+from async_database import AsyncDBhandler
+from cache import CachedDBhandler
+from thumbnails import make_thumbnail
 from datetime import datetime, timedelta
 from markupsafe import Markup
 from werkzeug.utils import secure_filename
+import asyncio
 import hashlib
 import json
 import os
 import logging
+import time
 from typing import Optional, Dict, Any
 
 # Flask 애플리케이션 초기화
@@ -27,6 +34,21 @@ app.config["MAX_CONTENT_LENGTH"] = int(os.getenv("MAX_CONTENT_LENGTH", 5 * 1024
 app.config["SESSION_COOKIE_HTTPONLY"] = True
 app.config["SESSION_COOKIE_SECURE"] = (os.getenv("FLASK_ENV") == "production")
 app.config["PERMANENT_SESSION_LIFETIME"] = timedelta(days=int(os.getenv("SESSION_DAYS", 7)))
+# DB 스트림 복제본: DB_REPLICA=1이면 item/likes/review 노드를 메모리에 미러링 (시작 시 최대 DB_REPLICA_WAIT초 대기)
+app.config["DB_REPLICA"] = os.getenv("DB_REPLICA", "0") == "1"
+app.config["DB_REPLICA_WAIT"] = float(os.getenv("DB_REPLICA_WAIT", 10))
+app.config["DB_REPLICA_NODES"] = tuple(n for n in os.getenv("DB_REPLICA_NODES", "item,likes,review").split(",") if n)
+# 복제본 스냅샷 디렉터리: 지정하면 미러를 디스크에 보존하고 재시작 시 변경 피드로 변경분만 받음 (DB_CHANGE_FEED=1 필요)
+app.config["DB_SNAPSHOT_DIR"] = os.getenv("DB_SNAPSHOT_DIR") or None
+# DB 읽기 캐시: DB_CACHE=1이면 활성화 (기본 비활성화 - 무효화가 프로세스 단위라 다른 워커는 TTL 동안 이전 값을 읽음),
+# 네임스페이스별 TTL(초)과 최대 항목 수 설정
+# (복제본 사용 시 미러가 항상 최신이므로 items/reviews/likes의 기본 TTL은 0 = 캐시 안 함)
+app.config["DB_CACHE"] = os.getenv("DB_CACHE", "0") == "1"
+app.config["DB_CACHE_MAX_ENTRIES"] = int(os.getenv("DB_CACHE_MAX_ENTRIES", 1024))
+app.config["DB_CACHE_TTLS"] = {
+    ns: float(os.getenv(f"DB_CACHE_TTL_{ns.upper()}", 0 if app.config["DB_REPLICA"] and ns != "users" else default))
+    for ns, default in (("items", 30), ("reviews", 60), ("users", 300), ("likes", 10))
+}
 
 logging.basicConfig(level=logging.INFO)
 app.logger.setLevel(logging.INFO)
@@ -45,12 +67,19 @@ def get_db() -> DBhandler:
     """
     DBhandler 인스턴스를 싱글톤 패턴으로 로드하거나 반환합니다.
     데이터베이스 연결을 요청 시에만 수행하여 효율적이며, 테스트 용이성을 높입니다.
+    DB_REPLICA가 켜져 있으면 스트림 복제본을 시작하고,
+    DB_CACHE가 켜져 있으면 읽기 캐시(CachedDBhandler)로 감싸서 반환합니다.
     :return: (DBhandler) 데이터베이스 핸들러 인스턴스.
     """
     global DB
     # DB 핸들러를 지연 생성(lazy load)
     if DB is None:
         DB = DBhandler()
+        if app.config["DB_REPLICA"]:
+            DB.enable_replica(app.config["DB_REPLICA_NODES"], app.config["DB_REPLICA_WAIT"],
+                              app.config["DB_SNAPSHOT_DIR"])
+        if app.config["DB_CACHE"]:
+            DB = CachedDBhandler(DB, app.config["DB_CACHE_TTLS"], app.config["DB_CACHE_MAX_ENTRIES"])
     # 테스트/재사용을 위해 전역 인스턴스를 반환
     return DB
 
@@ -58,6 +87,121 @@ def get_db() -> DBhandler:
 if DB is None:
     DB = get_db()
 
+ASYNC_DB: Optional[AsyncDBhandler] = None
+
+def get_async_db() -> AsyncDBhandler:
+    """
+    async 뷰에서 쓰는 AsyncDBhandler 인스턴스를 지연 생성하여 반환합니다.
+    get_db()의 DBhandler 설정을 그대로 쓰고, 읽기 캐시가 켜져 있으면 같은 캐시 인스턴스를 공유합니다.
+    :return: (AsyncDBhandler) 비동기 데이터베이스 핸들러 인스턴스.
+    """
+    global ASYNC_DB
+    if ASYNC_DB is None:
+        db_handler = get_db()
+        if isinstance(db_handler, CachedDBhandler):
+            ASYNC_DB = CachedDBhandler(AsyncDBhandler(db_handler.handler), cache=db_handler.cache)
+        else:
+            ASYNC_DB = AsyncDBhandler(db_handler)
+    return ASYNC_DB
+
+async def or_default(awaitable, default, message: str, *args):
+    """
+    asyncio.gather로 함께 실행하는 조회 하나를 감싸, 실패하면 로그를 남기고 default를 반환합니다.
+    (gather는 하나가 실패하면 전체가 실패하므로, 보조 조회의 실패가 페이지 전체 오류가 되지 않도록 함)
+    """
+    try:
+        return await awaitable
+    except Exception:
+        app.logger.exception(message, *args)
+        return default
+
+@app.before_request
+def begin_db_unit_of_work() -> None:
+    """
+    요청마다 DB 읽기 identity map(UnitOfWork)을 시작합니다.
+    같은 요청 안에서 같은 경로를 다시 읽으면 DB에 가지 않고, 쓴 값은 다시 조회하지 않고 읽습니다.
+    """
+    g.db_uow_token = begin_unit_of_work()
+
+@app.teardown_request
+def end_db_unit_of_work(exc: Optional[BaseException] = None) -> None:
+    """요청이 끝나면 UnitOfWork를 버립니다. (다음 요청은 항상 DB의 최신 값을 읽음)"""
+    token = g.pop("db_uow_token", None)
+    if token is not None:
+        end_unit_of_work(token)
+
+@app.before_request
+def begin_request_metrics() -> None:
+    """요청 처리 시간 측정을 시작하고, 이 요청의 DB 호출을 현재 엔드포인트로 귀속시킵니다."""
+    g.metrics_started = time.perf_counter()
+    g.metrics_token = begin_request(request.endpoint)
+
+@app.after_request
+def observe_request_metrics(response):
+    """엔드포인트별 요청 처리 시간과 상태 코드를 기록합니다."""
+    started = g.get("metrics_started")
+    if started is not None:
+        observe_request(request.endpoint, response.status_code, time.perf_counter() - started)
+    return response
+
+@app.teardown_request
+def end_request_metrics(exc: Optional[BaseException] = None) -> None:
+    """요청이 끝나면 DB 호출의 엔드포인트 귀속을 해제합니다."""
+    token = g.pop("metrics_token", None)
+    if token is not None:
+        end_request(token)
+
+@app.route("/api/cache-stats", methods=['GET'])
+def cache_stats_api():
+    """
+    [API] DB 읽기 캐시의 네임스페이스별 적중/실패 통계를 반환합니다.
+    :method: GET
+    :return: (JSON) 캐시 활성화 여부와 통계. 상태 코드 200.
+    """
+    # 구현: 캐시 래퍼일 때만 통계 제공
+    db_handler = get_db()
+    if not isinstance(db_handler, CachedDBhandler):
+        return jsonify({"enabled": False}), 200
+    return jsonify({"enabled": True, **db_handler.cache_stats()}), 200
+
+
+@app.route("/api/transport-stats", methods=['GET'])
+def transport_stats_api():
+    """
+    [API] DB 전송 계층의 요청/재시도 횟수와 연결 풀 상태를 반환합니다. (DB_POOL_SIZE 조정용)
+    :method: GET
+    :return: (JSON) 동기 핸들러 통계와 async 뷰용 핸들러 통계(async). 상태 코드 200.
+    """
+    return jsonify(dict(get_db().transport_stats(), **{"async": get_async_db().transport_stats()})), 200
+
+
+@app.route("/metrics", methods=['GET'])
+def metrics_api():
+    """
+    [API] Prometheus 텍스트 형식의 메트릭을 반환합니다.
+    엔드포인트별 요청 처리 시간, 엔드포인트/DB 메서드별 호출 시간, DB 왕복 수, 응답 바이트와
+    읽기 캐시/ETag 캐시 통계를 포함합니다.
+    :method: GET
+    :return: (text/plain) Prometheus exposition format. 상태 코드 200.
+    """
+    # 구현: 캐시 통계는 수집 시점의 누적 값을 그대로 내보냄
+    extra = []
+    db_handler = get_db()
+    if isinstance(db_handler, CachedDBhandler):
+        namespaces = db_handler.cache_stats()["namespaces"]
+        for field in ("hits", "misses", "evictions", "invalidations"):
+            extra.append((f"ewhamarket_cache_{field}_total", "counter", f"읽기 캐시 {field} 수, 네임스페이스별",
+                          [((("namespace", ns),), counts[field]) for ns, counts in sorted(namespaces.items())]))
+        extra.append(("ewhamarket_cache_hit_ratio", "gauge", "읽기 캐시 적중률, 네임스페이스별",
+                      [((("namespace", ns),), counts["hit_rate"]) for ns, counts in sorted(namespaces.items())]))
+    etag_stats = db_handler.transport_stats().get("etag_cache", {})
+    for field in ("not_modified", "fetched", "negative_hits"):
+        extra.append((f"ewhamarket_etag_cache_{field}_total", "counter", f"상품 단건 ETag 캐시 {field} 수",
+                      [((), etag_stats.get(field, 0))]))
+    response = make_response(REGISTRY.render(extra), 200)
+    response.headers["Content-Type"] = "text/plain; version=0.0.4; charset=utf-8"
+    return response
+
 # ==============================================================================
 # 3. 정적 페이지 및 리다이렉션 라우팅
 # ==============================================================================
@@ -119,6 +263,9 @@ def check_userid():
     userid = request.args.get('userid')
     if not userid:
         return jsonify({"available": False, "message": "아이디를 입력하세요."}), 400
+    # 구현: Firebase 키에 쓸 수 없는 문자(. $ # [ ] /)가 있는 ID는 거부
+    if not valid_user_id(userid):
+        return jsonify({"available": False, "message": "아이디에 . $ # [ ] / 문자는 쓸 수 없습니다."}), 400
     
     is_available = get_db().user_duplicate_check(userid)
     
@@ -139,6 +286,9 @@ def register_user():
     # 구현: 회원가입 폼에서 전달된 데이터를 읽음
     data = request.form
     pw = data.get('pw')
+    # 구현: 필수 값과 ID 형식 검증 (쓸 수 없는 문자가 있는 ID는 경로가 중첩되어 다른 사용자를 덮어쓸 수 있음)
+    if not pw or not valid_user_id(data.get('id')):
+        return redirect(url_for('signup_page'))
 
     # 구현: 비밀번호를 SHA-256로 해시화
     pw_hash = hashlib.sha256(pw.encode('utf-8')).hexdigest()
@@ -324,6 +474,7 @@ def submit_item_post():
         # 구현: 업로드된 이미지 파일 존재 여부 확인 및 저장
         image_file = request.files.get("photos")
         img_path = ""
+        thumb_path = None
         
         if image_file and image_file.filename:
             import time
@@ -336,6 +487,8 @@ def submit_item_post():
             os.makedirs(save_dir, exist_ok=True)
             img_path = f"uploads/{unique_filename}"
             image_file.save(os.path.join(save_dir, unique_filename))
+            # 구현: 목록 페이지용 썸네일 생성 (Pillow가 없으면 None → 원본 이미지 사용)
+            thumb_path = make_thumbnail(save_dir, unique_filename)
 
         # 구현: 폼 데이터 읽기 및 메타 생성
         data = request.form
@@ -345,7 +498,7 @@ def submit_item_post():
         created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
         # 구현: Firebase에 상품 데이터 삽입 요청
-        get_db().insert_item(key_name, data, img_path, author_id, trade_method, created_at)
+        get_db().insert_item(key_name, data, img_path, author_id, trade_method, created_at, thumb_path=thumb_path)
 
         return f"""
         <html><body style='font-family:sans-serif; text-align:center;'>
@@ -360,48 +513,41 @@ def submit_item_post():
         return make_response("<h3>❌ 오류 발생</h3>", 500)
 
 @app.route('/product-list.html')
-def product_list():
+async def product_list():
     """
     상품 목록을 조회하고 페이지네이션 및 카테고리 필터를 적용하여 렌더링합니다.
-    :query_param page: (int) 현재 페이지 번호 (기본값 1).
+    카테고리 필터와 페이지 구간은 DB 쿼리로 처리하여 현재 페이지의 상품만 전송받습니다.
+    :query_param page: (int) 현재 페이지 번호 (기본값 1, 표시용).
     :query_param category: (str) 선택된 카테고리 (기본값 '전체').
+    :query_param cursor: (str) 이전 페이지 경계 항목의 정렬 키 (없으면 첫 페이지).
+    :query_param dir: (str) 'next'(더 오래된 상품) 또는 'prev'(더 최근 상품).
     :return: (HTML) product-list.html
     """
     # 구현: 페이지/페이징 변수 초기화
     page = request.args.get("page", 1, type=int)
     per_page = 4
-    start_idx = per_page * (page - 1)
-    end_idx = per_page * page
+    cursor = request.args.get("cursor") or None
+    direction = request.args.get("dir", "next")
 
-    # 구현: 카테고리 필터 적용
+    # 구현: 카테고리 필터 적용 (DB 쿼리로 위임)
     selected_category = request.args.get('category', '전체')
+    category = selected_category if selected_category and selected_category != '전체' else None
 
-    all_items = get_db().get_items() or {}
-
-    if selected_category and selected_category != '전체':
-        filtered_items = {k: v for k, v in all_items.items() if (v.get('category') == selected_category)}
-    else:
-        filtered_items = all_items
-
-    item_counts = len(filtered_items)
+    # 구현: 현재 페이지와 전체 개수(카테고리별 카운터)를 동시에 조회
+    db_handler = get_async_db()
+    result, item_counts = await asyncio.gather(
+        db_handler.get_items_page(category, cursor=cursor, direction=direction, per_page=per_page),
+        db_handler.get_item_count(category),
+    )
     page_count = (item_counts + per_page - 1) // per_page if item_counts > 0 else 1
+    page = 1 if not cursor else min(max(page, 1), page_count)
 
-    datas_for_page = dict(list(filtered_items.items())[start_idx:end_idx])
+    datas_for_page = dict(result["items"])
     
-    like_info = {}
     current_user = session.get('id')
-    db_handler = get_db()
     
-    # 구현: 각 아이템에 대해 좋아요 정보 조회 및 템플릿에 전달
-    for item_key in datas_for_page.keys():
-        try:
-            count = db_handler.get_like_count(item_key)
-            liked = db_handler.get_like_status(item_key, current_user) if current_user else False
-        except Exception:
-            app.logger.exception("like_info 조회 중 예외 for %s", item_key)
-            count = 0
-            liked = False
-        like_info[item_key] = { 'liked': bool(liked), 'count': int(count) }
+    # 구현: 페이지의 아이템 전체에 대해 좋아요 정보를 일괄 조회 및 템플릿에 전달
+    like_info = await build_like_info(db_handler, list(datas_for_page.keys()), current_user)
 
     return render_template(
         "product-list.html",
@@ -409,41 +555,41 @@ def product_list():
         total=item_counts,
         page=page,
         page_count=page_count,
+        next_cursor=result["next_cursor"],
+        prev_cursor=result["prev_cursor"],
         selected_category=selected_category,
         like_info=like_info
     )
 
 @app.route('/product-detail/<name>')
-def product_detail(name: str):
+async def product_detail(name: str):
     """
     특정 상품의 상세 정보를 조회하고 렌더링합니다.
     :param name: (str) 상품 이름 (Firebase Key).
     :return: (HTML) product-detail.html 또는 404 Not Found.
     """
-    # 구현: 해당 상품 데이터를 DB에서 조회
-    db_handler = get_db()
-    data = db_handler.get_item_byname(str(name))
+    # 구현: 해당 상품 데이터와 현재 사용자의 좋아요 상태를 동시에 조회
+    db_handler = get_async_db()
+    current_user = session.get('id')
+    if current_user:
+        data, liked = await asyncio.gather(
+            db_handler.get_item_byname(str(name)),
+            or_default(db_handler.get_like_status(name, current_user), False, "좋아요 상태 조회 중 예외 for %s", name),
+        )
+    else:
+        data, liked = await db_handler.get_item_byname(str(name)), False
     
     if data:
         seller_info = {}
-        # 구현: 판매자 정보 보강 (author 기반 조회)
+        # 구현: 판매자 정보 보강 (author 기반 조회, 상품 데이터가 있어야 하므로 이어서 실행)
         try:
             author_id = data.get('author')
             if author_id:
-                seller_info = db_handler.get_user_info(author_id) or {}
+                seller_info = await db_handler.get_user_info(author_id) or {}
         except Exception:
             app.logger.exception("상품 판매자 정보 조회 중 예외")
             seller_info = {}
 
-        current_user = session.get('id')
-        liked = False
-        # 구현: 현재 사용자에 대한 좋아요 상태 조회
-        try:
-            liked = db_handler.get_like_status(name, current_user) if current_user else False
-        except Exception:
-            app.logger.exception("좋아요 상태 조회 중 예외 for %s", name)
-            liked = False
-
         return render_template('product-detail.html', name=name, data=data, seller_info=seller_info, liked=bool(liked))
     else:
         return make_response("상품을 찾을 수 없습니다.", 404)
@@ -499,10 +645,17 @@ def submit_item_update():
         
         if not original_key:
             return make_response("<h3>❌ 오류 발생: 수정할 상품 키가 누락되었습니다.</h3>", 400)
+
+        # 구현: 작성자 본인 상품인지 확인 (이 조회 결과는 update_item의 기존 데이터 조회에 그대로 쓰임)
+        db_handler = get_db()
+        existing = db_handler.get_item_byname(original_key)
+        if not existing or existing.get('author') != author_id:
+            return make_response("<h3>❌ 오류 발생: 수정 권한이 없는 상품입니다.</h3>", 403)
         
         # 구현: 이미지 파일이 있으면 저장하고 경로 생성
         image_file = request.files.get("photos")
         img_path = ""
+        thumb_path = None
         
         if image_file and image_file.filename:
             import time
@@ -515,9 +668,11 @@ def submit_item_update():
             os.makedirs(save_dir, exist_ok=True)
             img_path = f"uploads/{unique_filename}"
             image_file.save(os.path.join(save_dir, unique_filename))
+            thumb_path = make_thumbnail(save_dir, unique_filename)
 
-        # 구현: Firebase 상품 정보 업데이트 요청
-        get_db().update_item(original_key, data, img_path, author_id, new_key=key_name)
+        # 구현: Firebase 상품 정보 업데이트 요청 (바꾸려는 상품명이 이미 있거나 다른 요청과 계속 충돌하면 실패)
+        if not db_handler.update_item(original_key, data, img_path, author_id, new_key=key_name, thumb_path=thumb_path):
+            return make_response("<h3>❌ 오류 발생: 같은 이름의 상품이 이미 있거나 수정에 실패했습니다.</h3>", 409)
         
         return f"""
         <html><body style='font-family:sans-serif; text-align:center;'>
@@ -566,21 +721,13 @@ def purchase_item_api():
     item_name = data.get('item_name')
     buyer_id = session['id']
     
-    # 구현: 요청 JSON에서 item_name 추출 및 본인 구매 방지 검사
+    # 구현: 요청 JSON에서 item_name 추출
     if not item_name:
         return jsonify({"success": False, "message": "상품명이 누락되었습니다."}), 400
 
-    db_handler = get_db()
-    try:
-        item = db_handler.get_item_byname(item_name)
-        if item and item.get('author') == buyer_id:
-            return jsonify({"success": False, "message": "자신이 등록한 상품은 구매할 수 없습니다."}), 400
-    except Exception:
-        app.logger.exception("purchase_item_api: DB 조회 중 예외")
-        pass
-
     # 구현: DB의 purchase_item 호출 및 결과 반환
-    success, message = db_handler.purchase_item(item_name, buyer_id)
+    #       (본인 상품/거래 완료 검사는 purchase_item이 조건부 쓰기의 기준 값으로 함께 수행)
+    success, message = get_db().purchase_item(item_name, buyer_id)
     if success:
         return jsonify({"success": True, "message": message}), 200
     else:
@@ -588,7 +735,7 @@ def purchase_item_api():
     
     
 @app.route("/api/like_status")
-def like_status():
+async def like_status():
     """
     [API] 현재 사용자/상품의 좋아요 여부와 개수를 조회합니다.
     :method: GET
@@ -601,26 +748,22 @@ def like_status():
         return jsonify({"success": False, "message": "상품명이 필요합니다."}), 400
 
     user_id = session.get('id')
-    db_handler = get_db()
+    db_handler = get_async_db()
     
     # 구현: 비로그인 사용자는 logged_in=False로 응답
     if not user_id:
         return jsonify({"success": True, "liked": False, "logged_in": False}), 200
 
-    # 구현: DB에서 좋아요 상태와 개수 조회
-    try:
-        liked = db_handler.get_like_status(item_name, user_id)
-        like_count = db_handler.get_like_count(item_name)
-    except Exception:
-        app.logger.exception("like_status 조회 중 예외 for %s", item_name)
-        liked = False
-        like_count = 0
+    # 구현: DB에서 좋아요 상태와 개수 조회 (일괄 조회 API 사용)
+    info = (await build_like_info(db_handler, [item_name], user_id))[item_name]
+    liked = info['liked']
+    like_count = info['count']
         
     return jsonify({"success": True, "liked": liked, "logged_in": True, "like_count": like_count}), 200
 
 
 @app.route("/api/toggle_like", methods=['POST'])
-def toggle_like_api():
+async def toggle_like_api():
     """
     [API] 좋아요 상태를 토글하고 업데이트된 상태와 개수를 반환합니다.
     :method: POST
@@ -637,10 +780,13 @@ def toggle_like_api():
     if not item_name:
         return jsonify({"success": False, "message": "상품명이 필요합니다."}), 400
 
-    db_handler = get_db()
-    # 구현: 요청에서 item_name 추출 및 본인 상품 찜 금지 검사
+    db_handler = get_async_db()
+    # 구현: 상품과 찜 수를 동시에 읽어 요청 단위 작업에 기억시킴
+    #       (토글 후 찜 수 조회는 기억한 값과 increment로 처리되어 DB에 가지 않음,
+    #        찜 상태는 toggle_like가 조건부 쓰기의 기준 값으로 ETag와 함께 직접 읽음)
     try:
-        item = db_handler.get_item_byname(item_name)
+        item, _ = await asyncio.gather(db_handler.get_item_byname(item_name),
+                                       db_handler.get_like_count(item_name))
         if item and item.get('author') == session['id']:
             return jsonify({"success": False, "message": "자신이 등록한 상품은 찜할 수 없습니다."}), 400
     except Exception:
@@ -648,14 +794,14 @@ def toggle_like_api():
         pass
 
     # 구현: DB toggle_like 호출 및 최신 카운트 조회
-    success, liked = db_handler.toggle_like(item_name, session['id'])
+    success, liked = await db_handler.toggle_like(item_name, session['id'])
 
     if not success:
         return jsonify({"success": False, "message": "좋아요 처리에 실패했습니다."}), 500
 
     msg = "찜에 추가되었습니다" if liked else "찜에서 제거되었습니다."
     try:
-        latest_count = db_handler.get_like_count(item_name)
+        latest_count = await db_handler.get_like_count(item_name)
     except Exception:
         app.logger.exception("toggle_like_api: like count 조회 중 예외 for %s", item_name)
         latest_count = 0
@@ -751,60 +897,50 @@ def review_detail_by_key(review_key: str):
 
 
 @app.route("/review")
-def view_review():
+async def view_review():
     """
     전체 리뷰 목록을 조회하고 페이지네이션 및 정렬을 적용하여 렌더링합니다.
-    :query_param page: (int) 현재 페이지 번호 (기본값 0).
+    정렬과 페이지 구간은 DB의 정렬 인덱스 쿼리로 처리하여 현재 페이지의 리뷰만 전송받습니다.
+    :query_param page: (int) 현재 페이지 번호 (기본값 0, 표시용).
     :query_param sort: (str) 정렬 옵션 ('latest' 또는 'rating').
+    :query_param cursor: (str) 이전 페이지 경계 리뷰의 정렬 키 (없으면 첫 페이지).
+    :query_param dir: (str) 'next' 또는 'prev'.
     :return: (HTML) review.html.
     """
     # 구현: 정렬 옵션 적용 및 페이지네이션
     page = request.args.get("page", 0, type=int)
     per_page = 4
     sort_option = request.args.get("sort", "latest")
+    cursor = request.args.get("cursor") or None
+    direction = request.args.get("dir", "next")
+
+    # 구현: 현재 페이지와 전체 개수(review_count 카운터)를 동시에 조회
+    db_handler = get_async_db()
+    result, item_counts = await asyncio.gather(
+        db_handler.get_reviews_page(sort_option, cursor=cursor, direction=direction, per_page=per_page),
+        db_handler.get_review_count(),
+    )
+    data_list = result["items"]
 
-    data = get_db().get_reviews() or {}
-    data_list = list(data.items())
-    db_handler = get_db()
-
-    # 구현: 작성자 프로필 보강 (user_info 조회)
+    # 구현: 작성자 프로필 보강 (페이지의 작성자 공개 프로필을 일괄 조회)
     default_profile = "uploads/profile/default.png"
+    publics = await db_handler.get_user_publics([review.get("writer_id") for _, review in data_list])
     for _, review in data_list:
-        writer_id = review.get("writer_id")
-        if writer_id:
-            user_info = db_handler.get_user_info(writer_id)
-            if user_info and user_info.get("profile_img"):
-                review["profile_img"] = user_info.get("profile_img", "")
-            else:
-                review["profile_img"] = default_profile
-        else:
-            review["profile_img"] = default_profile
+        profile = publics.get(review.get("writer_id")) or {}
+        review["profile_img"] = profile.get("profile_img") or default_profile
 
-    def _parse_created(s: str) -> datetime:
-        try:
-            return datetime.strptime(s, "%Y-%m-%d %H:%M:%S")
-        except Exception:
-            return datetime.min
-
-    if sort_option == "latest":
-        data_list.sort(key=lambda x: _parse_created(x[1].get("created_at", "")), reverse=True)
-    elif sort_option == "rating":
-        data_list.sort(key=lambda x: float(x[1].get("rate", 0)), reverse=True)
-
-    item_counts = len(data)
     page_count = (item_counts + per_page - 1) // per_page if item_counts > 0 else 1
-
-    start_idx = per_page * page
-    end_idx = per_page * (page + 1)
-    datas = dict(data_list[start_idx:end_idx])
+    page = 0 if not cursor else min(max(page, 0), page_count - 1)
 
     return render_template(
         "review.html",
-        datas=datas.items(),
+        datas=data_list,
         page=page,
         page_count=page_count,
         total=item_counts,
         sort_option=sort_option,
+        next_cursor=result["next_cursor"],
+        prev_cursor=result["prev_cursor"],
     )
 
 
@@ -813,7 +949,7 @@ def view_review():
 # ==============================================================================
 
 @app.route('/mypage.html')
-def mypage():
+async def mypage():
     """
     마이페이지를 렌더링합니다.
     :query_param page_sales: (int) 판매 상품 페이지 번호 (기본값 1).
@@ -829,36 +965,42 @@ def mypage():
     sales_page = request.args.get("page_sales", 1, type=int)
     purchase_page = request.args.get("page_purchases", 1, type=int)
     per_page = 3
-    db_handler = get_db()
-
-    user_info = db_handler.get_user_info(user_id) or {'profile_img': ''}
-    all_items = db_handler.get_items() or {}
+    db_handler = get_async_db()
 
-    # 구현: 전체 아이템 조회 후 판매/구매 필터링
-    my_sales = {k: v for k, v in all_items.items() if v.get('author') == user_id}
-    my_purchases = {k: v for k, v in all_items.items() if v.get('buyer') == user_id}
+    # 구현: 사용자 정보와 판매/구매 인덱스(내 상품 키와 판매 상품 상태)를 동시에 조회
+    user_info, my_sales, my_purchases = await asyncio.gather(
+        db_handler.get_user_info(user_id),
+        db_handler.get_items_by_author(user_id),
+        db_handler.get_items_by_buyer(user_id),
+    )
+    user_info = user_info or {'profile_img': ''}
 
     # 구현: 각 목록에 페이지네이션 적용 및 통계 계산
-    sales_list = list(my_sales.items())
-    sales_total = len(sales_list)
+    sales_keys = list(my_sales.keys())
+    sales_total = len(sales_keys)
     sales_page_count = max((sales_total + per_page - 1) // per_page, 1)
 
     sales_start = (sales_page - 1) * per_page
     sales_end = sales_page * per_page
-    sales_items = sales_list[sales_start:sales_end]
+    sales_page_keys = sales_keys[sales_start:sales_end]
 
-    purchases_list = list(my_purchases.items())
-    purchase_total = len(purchases_list)
+    purchase_total = len(my_purchases)
     purchase_page_count = max((purchase_total + per_page - 1) // per_page, 1)
 
     purchase_start = (purchase_page - 1) * per_page
     purchase_end = purchase_page * per_page
-    purchase_items = purchases_list[purchase_start:purchase_end]
+    purchase_page_keys = my_purchases[purchase_start:purchase_end]
 
-    purchase_review_status = {k: db_handler.check_review_exists(k, user_id) for k, _ in my_purchases.items()}
+    # 구현: 현재 페이지에 표시할 상품 요약과 구매 상품의 리뷰 작성 여부를 동시에 조회
+    page_data, purchase_review_status = await asyncio.gather(
+        db_handler.get_item_summaries(sales_page_keys + purchase_page_keys),
+        db_handler.check_reviews_exist(purchase_page_keys, user_id),
+    )
+    sales_items = [(k, page_data[k]) for k in sales_page_keys if k in page_data]
+    purchase_items = [(k, page_data[k]) for k in purchase_page_keys if k in page_data]
 
-    available_count = sum(1 for item in my_sales.values() if item.get('status') != '거래 완료')
-    sold_count = sum(1 for item in my_sales.values() if item.get('status') == '거래 완료')
+    available_count = sum(1 for status in my_sales.values() if status != '거래 완료')
+    sold_count = sum(1 for status in my_sales.values() if status == '거래 완료')
 
     return render_template(
         'mypage.html',
@@ -883,7 +1025,7 @@ def mypage():
 # ==============================================================================
 
 @app.route('/product-wishlist.html')
-def product_wishlist():
+async def product_wishlist():
     """
     찜 목록 페이지를 렌더링하고, 현재 사용자가 찜한 상품 목록을 페이지네이션하여 보여줍니다.
     :return: (HTML) product-wishlist.html 또는 로그인 페이지로 리디렉션.
@@ -898,25 +1040,25 @@ def product_wishlist():
     page = request.args.get("page", 1, type=int)
     per_page = 4 
 
-    # 구현: 전체 상품 및 사용자가 찜한 상품 키 목록 조회
-    db_handler = get_db()
-    all_items = db_handler.get_items() or {}
-    liked_keys = db_handler.get_liked_items_by_user(user_id)
-
-    # 구현: 찜한 상품만 필터링하여 리스트 구성
-    liked_items = []
-    for key in liked_keys:
-        if key in all_items:
-            liked_items.append((key, all_items[key]))
+    # 구현: 사용자가 찜한 상품 키 목록 조회 (역인덱스)
+    db_handler = get_async_db()
+    liked_keys = await db_handler.get_liked_items_by_user(user_id)
 
     # 구현: 전체 항목 수 및 총 페이지 수 계산
-    total = len(liked_items)
+    total = len(liked_keys)
     page_count = max((total + per_page - 1) // per_page, 1)
 
-    # 구현: 현재 페이지에 해당하는 항목만 슬라이싱
+    # 구현: 현재 페이지에 해당하는 상품만 조회하여 리스트 구성
     start_idx = per_page * (page - 1)
     end_idx = per_page * page
-    page_items = liked_items[start_idx:end_idx]
+    page_keys = liked_keys[start_idx:end_idx]
+
+    # 구현: 현재 페이지 항목의 상품 요약과 찜 개수를 동시에 조회
+    page_data, like_info = await asyncio.gather(
+        db_handler.get_item_summaries(page_keys),
+        build_like_info(db_handler, page_keys, user_id),
+    )
+    page_items = [(key, page_data[key]) for key in page_keys if key in page_data]
 
     # 구현: 템플릿 렌더링 및 데이터 전달
     return render_template(
@@ -924,7 +1066,8 @@ def product_wishlist():
         datas=page_items,
         page=page,
         page_count=page_count,
-        total=total
+        total=total,
+        like_info=like_info
     )
 
 # ==============================================================================
@@ -968,6 +1111,29 @@ def format_time_ago(timestamp_str: str) -> str:
         return f"{years}년 전"
 
 
+async def build_like_info(db_handler: AsyncDBhandler, item_keys: list, user_id: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    여러 상품의 좋아요 여부와 개수를 일괄 조회하여 템플릿/응답용 dict로 구성합니다.
+    :param db_handler: (AsyncDBhandler) 비동기 데이터베이스 핸들러.
+    :param item_keys: (list) 상품 이름(key) 목록.
+    :param user_id: (str) 현재 사용자 ID (비로그인 시 None).
+    :return: (dict) 상품 이름 -> {'liked': bool, 'count': int}
+    """
+    # 구현: 개수/상태를 각각 한 번의 요청으로 동시에 조회하고, 예외 시 기본값으로 대체
+    try:
+        if user_id:
+            counts, statuses = await asyncio.gather(
+                db_handler.get_like_counts(item_keys),
+                db_handler.get_like_statuses(item_keys, user_id),
+            )
+        else:
+            counts, statuses = await db_handler.get_like_counts(item_keys), {}
+    except Exception:
+        app.logger.exception("like_info 일괄 조회 중 예외 for %s", item_keys)
+        counts, statuses = {}, {}
+    return {k: {'liked': bool(statuses.get(k)), 'count': int(counts.get(k, 0))} for k in item_keys}
+
+
 @app.template_filter('nl2br')
 def nl2br_filter(s: str) -> Markup:
     """
@@ -0,0 +1,666 @@
+import asyncio
+import functools
+import json
+import logging
+import threading
+import time
+from typing import Optional, Dict, Any
+from urllib.parse import urlencode, quote
+
+import httpx
+
+from database import (DBhandler, ITEM_COUNT_TOTAL, LIKE_LOCK_STRIPES, _as_count, _firebase_key_order, _item_summary,
+                      _key_list, _page_from_rows, _page_query, _safe_key)
+from metrics import instrumented, observe_db_request
+from singleflight import AsyncSingleFlight
+from transport import RETRY_STATUSES, TransportConfig
+from unit_of_work import current_unit_of_work
+
+logger = logging.getLogger(__name__)
+
+# 모듈 요약: httpx 비동기 클라이언트 기반의 Firebase REST 핸들러(AsyncDBhandler)입니다.
+# 모든 HTTP I/O는 전용 이벤트 루프 스레드 하나에서 keep-alive 연결 풀을 공유하며 처리되고,
+# 호출하는 쪽(Flask async 뷰의 요청별 루프 등)은 그 결과를 await합니다.
+# 자주 쓰는 읽기와 찜 토글은 비동기로 직접 구현하고, 나머지 메서드는 DBhandler를 스레드에서 실행합니다.
+
+
+class _AsyncResponse:
+    """pyrebase PyreResponse.val()과 같은 형태의 값을 돌려주는 응답."""
+
+    def __init__(self, value):
+        self._value = value
+
+    def val(self):
+        return self._value
+
+
+class _AsyncQuery:
+    """pyrebase Database와 같은 쿼리 빌더 API. 호출마다 새 객체를 반환하므로 공유해도 안전합니다."""
+
+    def __init__(self, db, path="", params=None):
+        self._db = db
+        self._path = path
+        self._params = params or {}
+
+    def _with(self, **params):
+        return _AsyncQuery(self._db, self._path, dict(self._params, **params))
+
+    def child(self, *args):
+        parts = [self._path] if self._path else []
+        parts += [str(arg) for arg in args]
+        return _AsyncQuery(self._db, "/".join(parts), self._params)
+
+    def order_by_key(self):
+        return self._with(orderBy="$key")
+
+    def order_by_value(self):
+        return self._with(orderBy="$value")
+
+    def order_by_child(self, order):
+        return self._with(orderBy=order)
+
+    def start_at(self, start):
+        return self._with(startAt=start)
+
+    def end_at(self, end):
+        return self._with(endAt=end)
+
+    def equal_to(self, equal):
+        return self._with(equalTo=equal)
+
+    def limit_to_first(self, limit_first):
+        return self._with(limitToFirst=limit_first)
+
+    def limit_to_last(self, limit_last):
+        return self._with(limitToLast=limit_last)
+
+    def shallow(self):
+        return self._with(shallow=True)
+
+    async def get(self):
+        payload = await self._db._request("GET", self._path, self._params)
+        return _AsyncResponse(_to_val(payload, self._params))
+
+    async def update(self, data):
+        return await self._db._request("PATCH", self._path, body=data)
+
+    async def set(self, data):
+        return await self._db._request("PUT", self._path, body=data)
+
+    async def remove(self):
+        return await self._db._request("DELETE", self._path)
+
+
+def _to_val(payload, params):
+    """REST 응답을 pyrebase의 val()과 같은 형태(shallow면 키 목록, 정렬 쿼리면 정렬된 dict)로 바꿉니다."""
+    if not isinstance(payload, dict) or not params:
+        return payload
+    if params.get("shallow"):
+        return payload.keys()
+    order = params.get("orderBy")
+    if order == "$key":
+        items = sorted(payload.items(), key=lambda kv: kv[0])
+    elif order == "$value":
+        items = sorted(payload.items(), key=lambda kv: kv[1])
+    elif order:
+        items = sorted(payload.items(), key=lambda kv: (isinstance(kv[1], dict) and order in kv[1],
+                                                        kv[1].get(order, "") if isinstance(kv[1], dict) else ""))
+    else:
+        return payload
+    return dict(items)
+
+
+def _on_io_loop(method):
+    """코루틴 메서드를 핸들러 전용 이벤트 루프에서 실행하고, 호출한 루프에서 결과를 await하게 합니다."""
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        coro = method(self, *args, **kwargs)
+        if asyncio.get_running_loop() is self._loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self._loop))
+
+    return wrapper
+
+
+def _mirrored(*nodes):
+    """DBhandler의 스트림 미러가 nodes 중 하나라도 갖고 있으면 I/O 없이 동기 메서드(로컬 조회)로 응답합니다."""
+
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            if self._sync.replica_serves(*nodes):
+                return getattr(self._sync, method.__name__)(*args, **kwargs)
+            return await method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@instrumented(exclude=("close", "transport_stats"))
+class AsyncDBhandler:
+    """DBhandler와 같은 메서드를 코루틴으로 제공하는 비동기 핸들러.
+
+    URL/인증 헤더는 DBhandler의 pyrebase 설정을 그대로 사용합니다.
+    비동기로 직접 구현하지 않은 메서드는 __getattr__에서 DBhandler 메서드를 스레드로 실행합니다.
+    """
+
+    is_async = True
+
+    def __init__(self, sync_handler: DBhandler, transport: Optional[TransportConfig] = None):
+        self._sync = sync_handler
+        self.config = transport or TransportConfig()
+        self.db = _AsyncQuery(self) if sync_handler.db else None
+        self._counters = {"requests": 0, "failures": 0, "timeouts": 0, "retries": 0}
+        self._flights = AsyncSingleFlight() if self.config.singleflight else None
+        self._like_locks = [asyncio.Lock() for _ in range(LIKE_LOCK_STRIPES)]
+
+        # 구현: 전용 이벤트 루프 스레드와 그 루프에 묶인 httpx 클라이언트(keep-alive 풀) 생성
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="db-io", daemon=True)
+        self._thread.start()
+        self._client = asyncio.run_coroutine_threadsafe(self._make_client(), self._loop).result()
+
+    async def _make_client(self):
+        return httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=self.config.pool_size,
+                                max_keepalive_connections=self.config.pool_size),
+            timeout=httpx.Timeout(self.config.read_timeout, connect=self.config.connect_timeout),
+            # 구현: 재시도는 _send가 담당 (GET만, 백오프/카운터 포함) - 연결 단계 재시도를 겹치지 않도록 0
+            transport=httpx.AsyncHTTPTransport(retries=0),
+        )
+
+    def __getattr__(self, name):
+        # 구현: 비동기 구현이 없는 메서드는 DBhandler 메서드를 스레드에서 실행하는 코루틴으로 제공
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attr = getattr(self._sync, name)
+        if not callable(attr):
+            return attr
+
+        async def run_in_thread(*args, **kwargs):
+            return await asyncio.to_thread(attr, *args, **kwargs)
+
+        return run_in_thread
+
+    def close(self):
+        """HTTP 클라이언트를 닫고 전용 이벤트 루프를 멈춥니다."""
+        asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+    def transport_stats(self) -> Dict[str, Any]:
+        """비동기 전송 계층의 요청/실패/재시도 횟수와 합쳐진 GET 수를 반환합니다."""
+        stats = dict(self._counters, pool_size=self.config.pool_size)
+        if self._flights is not None:
+            stats.update(self._flights.stats())
+        return stats
+
+    # ==========================================================
+    # 전송 (HTTP)
+    # ==========================================================
+
+    def _url(self, path, params=None):
+        # 구현: pyrebase build_request_url과 같은 규칙으로 쿼리 파라미터 인코딩 (문자열은 따옴표, bool은 true/false)
+        query = {}
+        for key, value in (params or {}).items():
+            if isinstance(value, bool):
+                query[key] = "true" if value else "false"
+            elif isinstance(value, str):
+                query[key] = '"' + value + '"'
+            else:
+                query[key] = value
+        url = "{0}{1}.json".format(self._sync.db.database_url, quote(path, safe="/~"))
+        return url + ("?" + urlencode(query) if query else "")
+
+    async def _request(self, method, path, params=None, body=None):
+        """
+        REST 요청 한 번을 보내고 JSON 응답을 반환합니다. GET은 일시적 오류 시 백오프 후 재시도합니다.
+        같은 URL로 진행 중인 GET이 있으면 그 응답 본문을 함께 사용합니다. (JSON은 호출마다 따로 파싱)
+        """
+        if self._sync.store is not None:
+            # 구현: 로컬 SQLite 저장소는 HTTP 대신 스레드에서 직접 호출 (응답 형태는 REST와 같음)
+            return await asyncio.to_thread(self._sync.store.request, method, path, params, body)
+        url = self._url(path, params)
+        headers = self._sync.db.build_headers()
+        content = json.dumps(body).encode("utf-8") if method in ("PUT", "PATCH", "POST") else None
+        if method == "GET" and self._flights is not None:
+            res = await self._flights.do((url, headers.get("Authorization")),
+                                         lambda: self._send(method, url, headers, content))
+        else:
+            res = await self._send(method, url, headers, content)
+        return json.loads(res.content)
+
+    async def _get_revalidated(self, path):
+        """DBhandler._get_revalidated와 같이 DBhandler의 ETag 캐시를 공유하며 If-None-Match로 재검증합니다."""
+        if self._sync.store is not None:
+            return (await self.db.child(path).get()).val()
+        cache = self._sync.etag_cache
+        generation, missing, etag, cached = cache.lookup(path)
+        if missing:
+            return None
+        url = self._url(path)
+        headers = dict(self._sync.db.build_headers(), **{"X-Firebase-ETag": "true"})
+        if etag:
+            headers["If-None-Match"] = etag
+        send = lambda: self._send("GET", url, headers, None)
+        if self._flights is not None:
+            res = await self._flights.do((url, headers.get("Authorization"), "etag", etag), send)
+        else:
+            res = await send()
+        if res.status_code == 304 and etag:
+            return cache.not_modified(cached)
+        value = json.loads(res.content)
+        cache.store(path, res.headers.get("ETag"), value, generation)
+        return value
+
+    async def _send(self, method, url, headers, content, accept=(304,)):
+        """
+        요청을 보내고 본문까지 읽은 응답을 반환합니다. (재시도 포함)
+        :param accept: (tuple) 오류로 보지 않고 그대로 돌려줄 상태 코드 (기본: 304)
+        """
+        try:
+            attempts = 1 + (self.config.read_retries if method == "GET" else 0)
+            started = time.perf_counter()
+            for attempt in range(attempts):
+                self._counters["requests"] += 1
+                try:
+                    res = await self._client.request(method, url, headers=headers, content=content)
+                except httpx.TimeoutException:
+                    self._counters["timeouts"] += 1
+                    if attempt + 1 >= attempts:
+                        self._counters["failures"] += 1
+                        raise
+                except httpx.TransportError:
+                    if attempt + 1 >= attempts:
+                        self._counters["failures"] += 1
+                        raise
+                else:
+                    if res.status_code not in RETRY_STATUSES or attempt + 1 >= attempts:
+                        if res.status_code not in accept:
+                            if res.status_code >= 400:
+                                self._counters["failures"] += 1
+                            res.raise_for_status()
+                        observe_db_request(len(res.content), time.perf_counter() - started, method, url=url)
+                        return res
+                self._counters["retries"] += 1
+                await asyncio.sleep(self.config.retry_backoff * (2 ** attempt))
+        finally:
+            # 구현: PooledSession과 같이 쓰기가 끝나면 진행 중인 GET을 떼어 내, 이후 읽기가 쓰기 전 응답에 합쳐지지 않게 함
+            if method != "GET" and self._flights is not None:
+                self._flights.invalidate()
+
+    async def _get_with_etag(self, path):
+        """DBhandler._get_with_etag와 같이 경로 하나의 값을 ETag와 함께 조회합니다. (조건부 쓰기의 기준 값)"""
+        if self._sync.store is not None:
+            return await asyncio.to_thread(self._sync._get_with_etag, path)
+        headers = dict(self._sync.db.build_headers(), **{"X-Firebase-ETag": "true"})
+        res = await self._send("GET", self._url(path), headers, None)
+        return res.headers.get("ETag"), json.loads(res.content)
+
+    async def _set_if_match(self, path, value, etag):
+        """
+        DBhandler._set_if_match와 같이 경로의 ETag가 etag와 같을 때만 value로 덮어씁니다. (value가 None이면 삭제)
+        :return: (tuple) (성공 여부, 최신 ETag, 최신 값)
+        """
+        if self._sync.store is not None:
+            return await asyncio.to_thread(self._sync._set_if_match, path, value, etag)
+        self._sync.etag_cache.invalidate([path])
+        headers = dict(self._sync.db.build_headers(), **{"if-match": etag})
+        if value is None:
+            res = await self._send("DELETE", self._url(path), headers, None, accept=(412,))
+        else:
+            res = await self._send("PUT", self._url(path), headers, json.dumps(value).encode("utf-8"), accept=(412,))
+        # 구현: 412(ETag 불일치)면 서버가 돌려준 현재 값과 ETag로 다시 시도할 수 있도록 반환
+        if res.status_code == 412:
+            return False, res.headers.get("ETag"), json.loads(res.content)
+        if self._sync.replica is not None:
+            self._sync.replica.apply_update({path: value})
+        uow = current_unit_of_work()
+        if uow is not None:
+            uow.record_write({path: value})
+        return True, None, value
+
+    async def _update(self, updates, changed=()):
+        """DBhandler._update와 같이 다중 경로 update를 보내고 미러와 요청 단위 작업에 반영합니다."""
+        self._sync.etag_cache.invalidate(list(updates) + list(changed))
+        await self.db.update(self._sync._with_change_entry(updates, changed))
+        if self._sync.replica is not None:
+            self._sync.replica.apply_update(updates)
+        uow = current_unit_of_work()
+        if uow is not None:
+            uow.record_write(updates)
+
+    async def _gather_map(self, fn, items):
+        return await asyncio.gather(*(fn(item) for item in items))
+
+    async def _get(self, path, fetch=None):
+        """DBhandler._get과 같이 요청 단위 작업 안에서는 같은 경로를 한 번만 읽습니다."""
+        uow = current_unit_of_work()
+        if uow is not None:
+            hit, value = uow.lookup(path)
+            if hit:
+                return value
+        value = await fetch() if fetch else (await self.db.child(path).get()).val()
+        if uow is not None:
+            uow.remember(path, value)
+        return value
+
+    @_on_io_loop
+    async def get_child_keys(self, path):
+        if not self.db:
+            logger.error("get_child_keys called but DB is not initialized")
+            return []
+        if self._sync.replica_ready(path.split("/", 1)[0]):
+            return self._sync.get_child_keys(path)
+        try:
+            return _key_list((await self.db.child(path).shallow().get()).val())
+        except Exception:
+            logger.exception("get_child_keys failed for %s", path)
+            return []
+
+    async def count_children(self, path):
+        return len(await self.get_child_keys(path))
+
+    # ==========================================================
+    # 사용자
+    # ==========================================================
+
+    @_on_io_loop
+    async def get_user_info(self, user_id):
+        if not self.db:
+            logger.error("get_user_info called but DB is not initialized")
+            return None
+        try:
+            val = await self._get(f"user/{_safe_key(user_id)}")
+            if isinstance(val, dict):
+                return val
+        except Exception:
+            logger.exception("get_user_info lookup failed for %s", user_id)
+        return None
+
+    @_mirrored("user_public")
+    @_on_io_loop
+    async def get_user_publics(self, user_ids):
+        publics = {}
+        if not self.db:
+            logger.error("get_user_publics called but DB is not initialized")
+            return publics
+
+        async def fetch(user_id):
+            try:
+                return (await self.db.child("user_public").child(_safe_key(user_id)).get()).val()
+            except Exception:
+                logger.exception("get_user_publics failed for %s", user_id)
+                return None
+
+        ids = list(dict.fromkeys(u for u in user_ids or [] if u))
+        for user_id, val in zip(ids, await self._gather_map(fetch, ids)):
+            if isinstance(val, dict):
+                publics[user_id] = val
+        return publics
+
+    # ==========================================================
+    # 상품
+    # ==========================================================
+
+    @_mirrored("item")
+    @_on_io_loop
+    async def get_item_byname(self, name):
+        if not self.db:
+            logger.error("get_item_byname called but DB is not initialized")
+            return None
+        if not name:
+            return None
+        path = f"item/{name}"
+        try:
+            return await self._get(path, lambda: self._get_revalidated(path))
+        except Exception:
+            logger.exception("get_item_byname failed for %s", name)
+        return None
+
+    @_mirrored("item")
+    @_on_io_loop
+    async def get_items_by_keys(self, keys):
+        items = {}
+        if not self.db:
+            logger.error("get_items_by_keys called but DB is not initialized")
+            return items
+
+        async def fetch(key):
+            try:
+                return (await self.db.child("item").child(key).get()).val()
+            except Exception:
+                logger.exception("get_items_by_keys failed for %s", key)
+                return None
+
+        unique_keys = list(dict.fromkeys(keys or []))
+        for key, val in zip(unique_keys, await self._gather_map(fetch, unique_keys)):
+            if isinstance(val, dict):
+                items[key] = val
+        return items
+
+    @_mirrored("item_summary", "item")
+    @_on_io_loop
+    async def get_item_summaries(self, keys):
+        summaries = {}
+        if not self.db:
+            logger.error("get_item_summaries called but DB is not initialized")
+            return summaries
+
+        async def fetch(key):
+            try:
+                return (await self.db.child("item_summary").child(key).get()).val()
+            except Exception:
+                logger.exception("get_item_summaries failed for %s", key)
+                return None
+
+        # 구현: DBhandler.get_item_summaries와 같이 요약이 없는 상품은 item/<key>에서 만듦
+        unique_keys = list(dict.fromkeys(k for k in keys or [] if k))
+        values = await self._gather_map(fetch, unique_keys)
+        missing = [key for key, val in zip(unique_keys, values) if not isinstance(val, dict)]
+        fallback = await self.get_items_by_keys(missing) if missing else {}
+        for key, val in zip(unique_keys, values):
+            if isinstance(val, dict):
+                summaries[key] = val
+            elif key in fallback:
+                summaries[key] = _item_summary(fallback[key])
+        return summaries
+
+    @_on_io_loop
+    async def get_item_count(self, category=None):
+        if not self.db:
+            logger.error("get_item_count called but DB is not initialized")
+            return 0
+        key = _safe_key(category) if category else ITEM_COUNT_TOTAL
+        try:
+            count = await self._get(f"item_counts/{key}")
+            if count is None and not category:
+                return await self.count_children("item")
+            return _as_count(count)
+        except Exception:
+            logger.exception("get_item_count failed for %s", category)
+            return 0
+
+    async def _query_page(self, node, field, cursor=None, direction="next", per_page=4, lower=None, upper=None):
+        try:
+            res = await _page_query(self.db, node, field, cursor, direction, per_page, lower, upper).get()
+            rows = res.val()
+        except Exception:
+            logger.exception("_query_page failed for %s / %s / %s", node, field, cursor)
+            return {"items": [], "next_cursor": None, "prev_cursor": None}
+        return _page_from_rows(rows, field, cursor, direction, per_page)
+
+    @_on_io_loop
+    async def get_items_page(self, category=None, cursor=None, direction="next", per_page=4):
+        if not self.db:
+            logger.error("get_items_page called but DB is not initialized")
+            return {"items": [], "next_cursor": None, "prev_cursor": None}
+        if category:
+            return await self._query_page("item_summary", "category_key", cursor, direction, per_page,
+                                          lower=f"{category}|", upper=f"{category}|\uf8ff")
+        return await self._query_page("item_summary", "created_key", cursor, direction, per_page)
+
+    @_on_io_loop
+    async def get_items_by_author(self, user_id):
+        if not self.db:
+            logger.error("get_items_by_author called but DB is not initialized")
+            return {}
+        try:
+            index = (await self.db.child("items_by_author").child(user_id).get()).val()
+            if not isinstance(index, dict):
+                return {}
+            return {k: index[k] for k in sorted(index, key=_firebase_key_order)}
+        except Exception:
+            logger.exception("get_items_by_author failed for %s", user_id)
+            return {}
+
+    @_on_io_loop
+    async def get_items_by_buyer(self, user_id):
+        if not self.db:
+            logger.error("get_items_by_buyer called but DB is not initialized")
+            return []
+        return await self.get_child_keys(f"items_by_buyer/{user_id}")
+
+    # ==========================================================
+    # 리뷰
+    # ==========================================================
+
+    @_on_io_loop
+    async def get_reviews_page(self, sort="latest", cursor=None, direction="next", per_page=4):
+        if not self.db:
+            logger.error("get_reviews_page called but DB is not initialized")
+            return {"items": [], "next_cursor": None, "prev_cursor": None}
+        field = "rating_key" if sort == "rating" else "latest_key"
+        return await self._query_page("review", field, cursor, direction, per_page)
+
+    @_on_io_loop
+    async def get_review_count(self):
+        if not self.db:
+            logger.error("get_review_count called but DB is not initialized")
+            return 0
+        try:
+            count = await self._get("review_count")
+            if count is None:
+                return await self.count_children("review")
+            return _as_count(count)
+        except Exception:
+            logger.exception("get_review_count failed")
+            return 0
+
+    @_mirrored("review")
+    @_on_io_loop
+    async def get_review_by_key(self, review_key):
+        if not self.db:
+            logger.error("get_review_by_key called but DB is not initialized")
+            return None
+        try:
+            return await self._get(f"review/{review_key}")
+        except Exception:
+            logger.exception("get_review_by_key failed for %s", review_key)
+            return None
+
+    async def _get_children_for_keys(self, node, item_keys):
+        keys = list(dict.fromkeys(k for k in item_keys or [] if k))
+        values = await self._gather_map(lambda key: self._get(f"{node}/{key}"), keys)
+        return {key: val for key, val in zip(keys, values) if val is not None}
+
+    @_on_io_loop
+    async def check_reviews_exist(self, item_names, user_id):
+        statuses = {k: False for k in item_names or []}
+        if not self.db:
+            logger.error("check_reviews_exist called but DB is not initialized")
+            return statuses
+        try:
+            found = await self._get_children_for_keys(f"reviews_by_writer/{user_id}", item_names)
+            for item_name, exists in found.items():
+                statuses[item_name] = bool(exists)
+        except Exception:
+            logger.exception("check_reviews_exist failed for %s", user_id)
+        return statuses
+
+    # ==========================================================
+    # 좋아요
+    # ==========================================================
+
+    @_mirrored("likes")
+    @_on_io_loop
+    async def get_like_status(self, item_name, user_id):
+        if not self.db:
+            logger.error("get_like_status called but DB is not initialized")
+            return False
+        try:
+            return bool(await self._get(f"likes/{item_name}/{user_id}"))
+        except Exception:
+            logger.exception("get_like_status Error for %s / %s", item_name, user_id)
+            return False
+
+    @_mirrored("like_count", "likes")
+    @_on_io_loop
+    async def get_like_count(self, item_name):
+        if not self.db:
+            logger.error("get_like_count called but DB is not initialized")
+            return 0
+        try:
+            return _as_count(await self._get(f"like_count/{item_name}"))
+        except Exception:
+            logger.exception("get_like_count Error for %s", item_name)
+            return 0
+
+    @_mirrored("like_count", "likes")
+    @_on_io_loop
+    async def get_like_counts(self, item_keys):
+        counts = {k: 0 for k in item_keys or []}
+        if not self.db:
+            logger.error("get_like_counts called but DB is not initialized")
+            return counts
+        try:
+            for item_name, count in (await self._get_children_for_keys("like_count", item_keys)).items():
+                counts[item_name] = _as_count(count)
+        except Exception:
+            logger.exception("get_like_counts Error for %s", item_keys)
+        return counts
+
+    @_mirrored("likes")
+    @_on_io_loop
+    async def get_like_statuses(self, item_keys, user_id):
+        statuses = {k: False for k in item_keys or []}
+        if not self.db:
+            logger.error("get_like_statuses called but DB is not initialized")
+            return statuses
+        if not user_id:
+            return statuses
+        # 구현: DBhandler와 같이 요청 한 번으로 결정 (단건 조회 또는 user_likes/<user_id> shallow 조회)
+        if len(statuses) == 1:
+            item_name = next(iter(statuses))
+            statuses[item_name] = await self.get_like_status(item_name, user_id)
+            return statuses
+        for item_name in await self.get_child_keys(f"user_likes/{user_id}"):
+            if item_name in statuses:
+                statuses[item_name] = True
+        return statuses
+
+    @_on_io_loop
+    async def get_liked_items_by_user(self, user_id):
+        if not self.db:
+            logger.error("get_liked_items_by_user called but DB is not initialized")
+            return []
+        return await self.get_child_keys(f"user_likes/{user_id}")
+
+    @_on_io_loop
+    async def toggle_like(self, item_name, user_id):
+        if not self.db:
+            logger.error("toggle_like called but DB is not initialized")
+            return False, False
+        # 구현: DBhandler._write_like와 같이 서버의 현재 찜 여부를 반전해 찜 여부/역인덱스/카운터를 한 번에 기록
+        #       (같은 사용자/상품의 요청은 이 루프 안에서 잠금으로 순서대로 처리)
+        path = f"likes/{item_name}/{user_id}"
+        try:
+            async with self._like_locks[hash(path) % LIKE_LOCK_STRIPES]:
+                liked = not await self._get(path)
+                await self._update(self._sync._like_updates(item_name, user_id, liked), changed=[path])
+            return True, liked
+        except Exception:
+            logger.exception("toggle_like Error for %s / %s", item_name, user_id)
+            return False, False
@@ -0,0 +1,193 @@
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from database import DBhandler
+from firebase_standin import StandinServer
+from transport import TransportConfig
+
+# 모듈 요약: 같은 상품에 여러 구매자가 동시에 구매를 요청하는 경합 벤치마크입니다.
+# 상품마다 구매자 스레드와 판매자의 상품 수정 스레드를 동시에 출발시키고, 성공한 구매자가 정확히 한 명인지(이중 판매 없음),
+# 상품의 buyer/구매 인덱스가 그 구매자와 일치하는지, 수정이 구매(buyer, 거래 완료)를 덮어쓰지 않았는지 확인합니다.
+# 문제가 있으면 종료 코드 1을 반환합니다.
+# 사용법: python backend/bench_contention.py [--items 20] [--buyers 16] [--editors 1] [--latency 0.005] [--naive]
+#        (기본은 로컬 Firebase 대역 서버, --firebase-config로 실제 DB 지정 가능 - 테스트용 DB에서만 실행)
+
+logger = logging.getLogger(__name__)
+
+BENCH_PREFIX = "bench_contention"
+
+
+def naive_purchase(db: DBhandler, name: str, buyer_id: str) -> Tuple[bool, str]:
+    """
+    비교용: 조건 없이 읽은 뒤 update하는 구매. (읽기와 쓰기 사이에 다른 구매가 끼어들면 이중 판매)
+    :return: (tuple) (성공 여부, 메시지)
+    """
+    current = db.db.child("item").child(name).get().val()
+    if not current or current.get("buyer"):
+        return False, "이미 거래 완료된 상품입니다."
+    db.db.update({f"item/{name}/buyer": buyer_id, f"item/{name}/status": "거래 완료",
+                  f"items_by_buyer/{buyer_id}/{name}": True})
+    return True, "구매가 완료되었습니다."
+
+
+def edit_form(name: str, editor: int) -> Dict[str, Any]:
+    """판매자가 보낸 수정 폼 값. (상품 목록에서 본 '판매중' 상태를 그대로 다시 보냄)"""
+    return {"title": f"{name} (수정 {editor})", "price": "2000", "status": "판매중", "category": "기타"}
+
+
+def naive_edit(db: DBhandler, name: str, editor: int) -> bool:
+    """
+    비교용: 읽은 값에 폼 값을 합쳐 조건 없이 덮어쓰는 수정. (읽기와 쓰기 사이의 구매가 사라짐)
+    :return: (bool) 성공 여부
+    """
+    current = db.db.child("item").child(name).get().val() or {}
+    db.db.child("item").child(name).set(dict(current, **edit_form(name, editor)))
+    return True
+
+
+def seed(db: DBhandler, items: int, buyers: int) -> List[str]:
+    """벤치마크용 상품을 등록하고 키 목록을 반환합니다. (이전 실행의 구매 인덱스도 정리)"""
+    keys = [f"{BENCH_PREFIX}_{i:04d}" for i in range(items)]
+    updates: Dict[str, Any] = {f"items_by_buyer/{BENCH_PREFIX}_buyer{b:02d}": None for b in range(buyers)}
+    for key in keys:
+        updates[f"item/{key}"] = {
+            "title": key, "price": "1000", "status": "판매중", "author": f"{BENCH_PREFIX}_seller",
+            "category": "기타", "created_at": "2025-01-01 00:00:00",
+        }
+    db.db.update(updates)
+    return keys
+
+
+def run_item(db: DBhandler, name: str, buyers: int, naive: bool, editors: int = 0) -> Dict[str, Any]:
+    """
+    한 상품에 구매자 buyers명과 판매자의 수정 요청 editors건을 동시에 출발시킵니다.
+    :return: (dict) winners(성공한 구매자 목록), latencies(초), messages(실패 메시지별 횟수), edits(성공한 수정 번호)
+    """
+    barrier = threading.Barrier(buyers + editors)
+    purchase = (lambda buyer: naive_purchase(db, name, buyer)) if naive else (lambda buyer: db.purchase_item(name, buyer))
+    seller = f"{BENCH_PREFIX}_seller"
+    edit = (lambda n: naive_edit(db, name, n)) if naive else (
+        lambda n: db.update_item(name, edit_form(name, n), "", seller))
+
+    def attempt(buyer: str):
+        barrier.wait()
+        start = time.perf_counter()
+        ok, message = purchase(buyer)
+        return buyer, ok, message, time.perf_counter() - start
+
+    def attempt_edit(editor: int):
+        barrier.wait()
+        return editor if edit(editor) else None
+
+    with ThreadPoolExecutor(max_workers=buyers + editors) as executor:
+        edit_futures = [executor.submit(attempt_edit, n) for n in range(editors)]
+        results = list(executor.map(attempt, [f"{BENCH_PREFIX}_buyer{b:02d}" for b in range(buyers)]))
+        edits = [n for n in (f.result() for f in edit_futures) if n is not None]
+
+    messages: Dict[str, int] = {}
+    for _, ok, message, _ in results:
+        if not ok:
+            messages[message] = messages.get(message, 0) + 1
+    return {
+        "winners": [buyer for buyer, ok, _, _ in results if ok],
+        "latencies": [elapsed for _, _, _, elapsed in results],
+        "messages": messages,
+        "edits": edits,
+    }
+
+
+def verify(db: DBhandler, name: str, winners: List[str], buyers: int, edits: List[int] = ()) -> List[str]:
+    """
+    상품의 최종 상태가 성공한 구매자 한 명과 일치하고, 성공한 수정이 구매를 지우지 않았는지 확인합니다.
+    :return: (list) 문제 설명 목록 (없으면 빈 목록)
+    """
+    problems = []
+    if len(winners) != 1:
+        problems.append(f"{name}: 구매 성공 {len(winners)}건 {winners}")
+    item = db.db.child("item").child(name).get().val() or {}
+    if winners and item.get("buyer") not in winners:
+        problems.append(f"{name}: buyer={item.get('buyer')}가 성공한 구매자가 아님")
+    if winners and item.get("status") != "거래 완료":
+        problems.append(f"{name}: 수정이 거래 완료 상태를 덮어씀 (status={item.get('status')})")
+    if edits and not str(item.get("title", "")).startswith(f"{name} (수정"):
+        problems.append(f"{name}: 성공한 수정 {edits}이 반영되지 않음 (title={item.get('title')})")
+    indexed = [f"{BENCH_PREFIX}_buyer{b:02d}" for b in range(buyers)
+               if db.db.child("items_by_buyer").child(f"{BENCH_PREFIX}_buyer{b:02d}").child(name).get().val()]
+    if len(indexed) != 1:
+        problems.append(f"{name}: 구매 인덱스에 {len(indexed)}명 {indexed}")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="동시 구매 경합(이중 판매) 벤치마크")
+    parser.add_argument("--items", type=int, default=20, help="경합시킬 상품 수")
+    parser.add_argument("--buyers", type=int, default=16, help="상품마다 동시에 구매하는 사용자 수")
+    parser.add_argument("--latency", type=float, default=0.005, help="대역 서버 응답 지연(초)")
+    parser.add_argument("--editors", type=int, default=1, help="상품마다 구매와 동시에 보내는 판매자의 수정 요청 수")
+    parser.add_argument("--naive", action="store_true", help="조건 없는 읽기 후 update 구매/수정으로 비교 실행")
+    parser.add_argument("--firebase-config", default=None, help="대역 서버 대신 사용할 Firebase 설정 파일")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    server = None
+    config_path = args.firebase_config
+    if not config_path:
+        server = StandinServer(latency=args.latency).start()
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump(server.config(), f)
+            config_path = f.name
+    try:
+        # 구현: 구매자 스레드 수만큼 연결을 유지해 연결 생성 비용이 경합 결과에 섞이지 않도록 함
+        db = DBhandler(config_path, transport=TransportConfig(pool_size=max(args.buyers, 10)))
+        if not db.db:
+            print("DB 초기화 실패", file=sys.stderr)
+            return 2
+        keys = seed(db, args.items, args.buyers)
+
+        started = time.perf_counter()
+        latencies: List[float] = []
+        messages: Dict[str, int] = {}
+        problems: List[str] = []
+        edited = 0
+        for key in keys:
+            result = run_item(db, key, args.buyers, args.naive, args.editors)
+            latencies.extend(result["latencies"])
+            for message, count in result["messages"].items():
+                messages[message] = messages.get(message, 0) + count
+            edited += len(result["edits"])
+            problems.extend(verify(db, key, result["winners"], args.buyers, result["edits"]))
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        mode = "naive" if args.naive else "etag"
+        print(f"mode={mode} items={args.items} buyers/item={args.buyers} attempts={len(latencies)} elapsed={elapsed:.2f}s")
+        print(f"purchase latency p50={statistics.median(latencies) * 1000:.1f}ms "
+              f"p95={latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f}ms max={latencies[-1] * 1000:.1f}ms")
+        for message, count in sorted(messages.items(), key=lambda kv: -kv[1]):
+            print(f"  rejected x{count}: {message}")
+        print(f"edits: {edited}/{args.items * args.editors} succeeded")
+        print(f"transport: {db.transport_stats().get('requests')} requests")
+        if problems:
+            print(f"CONFLICT: {len(problems)}건 (이중 판매 또는 수정이 구매를 덮어씀)")
+            for problem in problems:
+                print(f"  {problem}")
+            return 1
+        print("OK: 모든 상품이 정확히 한 명에게 판매되고 수정이 구매를 덮어쓰지 않음")
+        return 0
+    finally:
+        if server is not None:
+            server.stop()
+            os.unlink(config_path)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
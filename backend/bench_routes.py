@@ -0,0 +1,298 @@
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from database import DBhandler
+from firebase_standin import StandinServer
+from synthetic_data import BENCH_PASSWORD, SOLD_STATUS, scaled
+
+# 모듈 요약: 주요 라우트를 Flask 테스트 클라이언트로 호출하는 라우트 단위 벤치마크입니다.
+# 데이터셋 크기(--scales)마다 합성 데이터(synthetic_data.py)로 Firebase 대역 서버를 띄우고,
+# 라우트마다 p50/p99 지연, 요청 1건당 DB 왕복 수와 DB 응답 바이트를 측정합니다.
+# 왕복 수/바이트가 BUDGETS를 넘거나, 가장 큰 데이터셋의 바이트가 가장 작은 데이터셋의 GROWTH_LIMIT배를 넘으면
+# (전체 노드 조회처럼 데이터 크기에 비례하는 회귀) 종료 코드 1을 반환하므로 CI에서 그대로 실행할 수 있습니다.
+# 사용법: python backend/bench_routes.py [--scales 0.005,0.02] [--iterations 30] [--latency 0] [--routes product_list,mypage]
+#        (읽기 캐시는 기본으로 끄고 측정, --cache로 app 기본 설정의 CachedDBhandler를 사용)
+
+logger = logging.getLogger(__name__)
+
+# 라우트별 예산: 요청 1건당 최대 DB 왕복 수(requests)와 최대 DB 응답 바이트(bytes)
+BUDGETS: Dict[str, Dict[str, int]] = {
+    "product_list": {"requests": 12, "bytes": 6 * 1024},
+    "product_detail": {"requests": 4, "bytes": 4 * 1024},
+    "view_review": {"requests": 6, "bytes": 6 * 1024},
+    "mypage": {"requests": 14, "bytes": 8 * 1024},
+    "product_wishlist": {"requests": 16, "bytes": 8 * 1024},
+    "like_status": {"requests": 2, "bytes": 512},
+    "toggle_like": {"requests": 5, "bytes": 3 * 1024},
+    "purchase": {"requests": 3, "bytes": 4 * 1024},
+    "login": {"requests": 1, "bytes": 1024},
+}
+# 가장 큰 데이터셋과 가장 작은 데이터셋의 평균 DB 응답 바이트 비율 상한 (GROWTH_SLACK 바이트 이하의 차이는 무시)
+GROWTH_LIMIT = 2.0
+GROWTH_SLACK = 1024
+
+# 라우트 시나리오: (후보 목록, 난수) -> (HTTP 메서드, URL, 로그인 사용자 또는 None, 요청 인수)
+Scenario = Callable[[Dict[str, Any], random.Random], Tuple[str, str, Optional[str], Dict[str, Any]]]
+
+
+def _random_user(pool: Dict[str, Any], rng: random.Random) -> str:
+    return rng.choice(pool["users"])
+
+
+def _random_item(pool: Dict[str, Any], rng: random.Random) -> str:
+    return rng.choice(pool["items"])
+
+
+def _random_other_user(pool: Dict[str, Any], rng: random.Random, key: str) -> str:
+    user = _random_user(pool, rng)
+    while user == pool["authors"][key]:
+        user = _random_user(pool, rng)
+    return user
+
+
+def _product_list(pool, rng):
+    category = rng.choice((None, "전공서적", "전자기기"))
+    url = "/product-list.html" + (f"?category={category}" if category else "")
+    return "get", url, _random_user(pool, rng), {}
+
+
+def _product_detail(pool, rng):
+    return "get", f"/product-detail/{_random_item(pool, rng)}", _random_user(pool, rng), {}
+
+
+def _view_review(pool, rng):
+    return "get", f"/review?sort={rng.choice(('latest', 'rating'))}", _random_user(pool, rng), {}
+
+
+def _mypage(pool, rng):
+    return "get", "/mypage.html", _random_user(pool, rng), {}
+
+
+def _product_wishlist(pool, rng):
+    return "get", "/product-wishlist.html", _random_user(pool, rng), {}
+
+
+def _like_status(pool, rng):
+    return "get", f"/api/like_status?item_name={_random_item(pool, rng)}", _random_user(pool, rng), {}
+
+
+def _toggle_like(pool, rng):
+    key = _random_item(pool, rng)
+    return "post", "/api/toggle_like", _random_other_user(pool, rng, key), {"json": {"item_name": key}}
+
+
+def _purchase(pool, rng):
+    # 구현: 아직 팔리지 않은 상품을 하나씩 꺼내 판매자가 아닌 사용자가 구매 (반복마다 다른 상품)
+    key = pool["unsold"].pop()
+    return "post", "/api/purchase", _random_other_user(pool, rng, key), {"json": {"item_name": key}}
+
+
+def _login(pool, rng):
+    return "post", "/api/login_confirm", None, {"data": {"id": _random_user(pool, rng), "pw": BENCH_PASSWORD}}
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "product_list": _product_list,
+    "product_detail": _product_detail,
+    "view_review": _view_review,
+    "mypage": _mypage,
+    "product_wishlist": _product_wishlist,
+    "like_status": _like_status,
+    "toggle_like": _toggle_like,
+    "purchase": _purchase,
+    "login": _login,
+}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """정렬된 값 목록의 백분위수(nearest-rank)를 반환합니다."""
+    return values[max(math.ceil(len(values) * pct / 100) - 1, 0)]
+
+
+def load_app(config_path: str, cache: bool):
+    """
+    대역 서버 설정으로 app 모듈을 불러옵니다. (app은 import 시 DB 핸들러를 만들기 때문에 환경 변수를 먼저 설정)
+    :param config_path: (str) 대역 서버의 Firebase 설정 파일
+    :param cache: (bool) 읽기 캐시(CachedDBhandler) 사용 여부
+    :return: (module) app 모듈
+    """
+    os.environ["FIREBASE_CONFIG"] = config_path
+    os.environ["DB_CACHE"] = "1" if cache else "0"
+    os.environ["DB_REPLICA"] = "0"
+    import app as app_module
+    # 구현: app이 INFO로 설정한 로그 레벨을 되돌려 측정 출력이 요청 로그에 묻히지 않게 함
+    logging.getLogger().setLevel(logging.WARNING)
+    app_module.app.logger.setLevel(logging.WARNING)
+    return app_module
+
+
+def use_handler(app_module, config_path: str, cache: bool) -> DBhandler:
+    """app 모듈의 DB 핸들러를 새 대역 서버용 핸들러로 교체합니다."""
+    db = DBhandler(config_path)
+    if not db.db:
+        raise RuntimeError(f"DB 초기화 실패: {config_path}")
+    if cache:
+        from cache import CachedDBhandler
+        config = app_module.app.config
+        db = CachedDBhandler(db, config["DB_CACHE_TTLS"], config["DB_CACHE_MAX_ENTRIES"])
+    app_module.DB = db
+    app_module.ASYNC_DB = None
+    return db
+
+
+def make_pool(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    시나리오가 고를 사용자/상품 후보 목록을 만듭니다. (측정 중 쓰기가 일어나기 전에 호출)
+    :param data: (dict) 합성 데이터 트리
+    :return: (dict) users, items(키 목록), authors(상품 키 -> 판매자), unsold(미판매 상품 키 목록)
+    """
+    items = sorted(data["item"])
+    return {
+        "users": sorted(data["user"]),
+        "items": items,
+        "authors": {key: data["item"][key]["author"] for key in items},
+        "unsold": [key for key in items if data["item"][key].get("status") != SOLD_STATUS],
+    }
+
+
+def run_route(client, server: StandinServer, pool: Dict[str, Any], name: str, iterations: int, warmup: int,
+              rng: random.Random) -> Dict[str, Any]:
+    """
+    한 라우트를 반복 호출하고 측정값을 반환합니다.
+    :return: (dict) latencies(초, 정렬됨), requests/bytes(요청별 DB 왕복 수/응답 바이트), errors(예상 외 상태 코드)
+    """
+    scenario = SCENARIOS[name]
+    latencies: List[float] = []
+    requests: List[int] = []
+    nbytes: List[int] = []
+    errors: List[str] = []
+    for i in range(warmup + iterations):
+        method, url, user, kwargs = scenario(pool, rng)
+        with client.session_transaction() as sess:
+            sess.clear()
+            if user:
+                sess["id"] = user
+        server.stats.reset()
+        started = time.perf_counter()
+        response = getattr(client, method)(url, **kwargs)
+        elapsed = time.perf_counter() - started
+        stats = server.stats.reset()
+        if response.status_code != 200:
+            errors.append(f"{method.upper()} {url} -> {response.status_code}")
+        # 구현: 워밍업(대역 서버의 정렬 결과 생성, 연결 수립)은 측정에서 제외
+        if i < warmup:
+            continue
+        latencies.append(elapsed)
+        requests.append(stats["requests"])
+        nbytes.append(stats["bytes_out"])
+    latencies.sort()
+    return {"latencies": latencies, "requests": requests, "bytes": nbytes, "errors": errors}
+
+
+def check(results: Dict[float, Dict[str, Dict[str, Any]]]) -> List[str]:
+    """
+    예산과 데이터 크기에 따른 증가율을 확인합니다.
+    :param results: (dict) {scale: {route: run_route 결과}}
+    :return: (list) 위반 설명 목록 (없으면 빈 목록)
+    """
+    problems = []
+    for scale, routes in results.items():
+        for name, result in routes.items():
+            budget = BUDGETS[name]
+            if result["errors"]:
+                problems.append(f"scale={scale} {name}: 실패 응답 {len(result['errors'])}건 (예: {result['errors'][0]})")
+            if max(result["requests"]) > budget["requests"]:
+                problems.append(f"scale={scale} {name}: DB 왕복 {max(result['requests'])}회 > 예산 {budget['requests']}회")
+            if max(result["bytes"]) > budget["bytes"]:
+                problems.append(f"scale={scale} {name}: DB 응답 {max(result['bytes'])}B > 예산 {budget['bytes']}B")
+    if len(results) > 1:
+        smallest, largest = results[min(results)], results[max(results)]
+        for name in largest:
+            small = statistics.mean(smallest[name]["bytes"])
+            large = statistics.mean(largest[name]["bytes"])
+            if large - small > GROWTH_SLACK and large > small * GROWTH_LIMIT:
+                problems.append(f"{name}: 데이터셋 {min(results)} -> {max(results)}에서 DB 응답 "
+                                f"{small:.0f}B -> {large:.0f}B (x{large / max(small, 1):.1f} > x{GROWTH_LIMIT})")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="라우트 단위 지연/DB 왕복/응답 바이트 벤치마크")
+    parser.add_argument("--scales", default="0.005,0.02", help="쉼표로 구분한 데이터셋 배율 (synthetic_data.FULL_SCALE 기준)")
+    parser.add_argument("--iterations", type=int, default=30, help="라우트별 측정 횟수")
+    parser.add_argument("--warmup", type=int, default=2, help="라우트별 측정 전 호출 횟수")
+    parser.add_argument("--latency", type=float, default=0.0, help="대역 서버 응답 지연(초)")
+    parser.add_argument("--routes", default=",".join(SCENARIOS), help="쉼표로 구분한 측정할 라우트")
+    parser.add_argument("--seed", type=int, default=20240301, help="데이터셋과 요청 선택의 난수 시드")
+    parser.add_argument("--cache", action="store_true", help="읽기 캐시(CachedDBhandler)를 켜고 측정")
+    parser.add_argument("--out", default=None, help="측정 결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    scales = sorted(float(s) for s in args.scales.split(",") if s)
+    routes = [r for r in args.routes.split(",") if r]
+    unknown = [r for r in routes if r not in SCENARIOS]
+    if unknown or not scales:
+        parser.error(f"알 수 없는 라우트: {unknown} (가능: {', '.join(SCENARIOS)})" if unknown else "--scales가 비었습니다.")
+
+    app_module = None
+    results: Dict[float, Dict[str, Dict[str, Any]]] = {}
+    print(f"{'scale':>6} {'route':<17} {'p50 ms':>8} {'p99 ms':>8} {'db reqs':>8} {'db bytes':>9} {'max bytes':>9}")
+    for scale in scales:
+        data = scaled(scale, args.seed)
+        server = StandinServer(data, latency=args.latency).start()
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump(server.config(), f)
+            config_path = f.name
+        try:
+            if app_module is None:
+                app_module = load_app(config_path, args.cache)
+            use_handler(app_module, config_path, args.cache)
+            pool = make_pool(data)
+            client = app_module.app.test_client()
+            rng = random.Random(args.seed)
+            results[scale] = {}
+            for name in routes:
+                result = run_route(client, server, pool, name, args.iterations, args.warmup, rng)
+                results[scale][name] = result
+                latencies = result["latencies"]
+                print(f"{scale:>6g} {name:<17} {statistics.median(latencies) * 1000:>8.1f} "
+                      f"{percentile(latencies, 99) * 1000:>8.1f} {statistics.mean(result['requests']):>8.1f} "
+                      f"{statistics.mean(result['bytes']):>9.0f} {max(result['bytes']):>9}")
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+            return 2
+        finally:
+            server.stop()
+            os.unlink(config_path)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({str(scale): {name: {"p50_ms": statistics.median(r["latencies"]) * 1000,
+                                           "p99_ms": percentile(r["latencies"], 99) * 1000,
+                                           "max_requests": max(r["requests"]), "max_bytes": max(r["bytes"]),
+                                           "mean_bytes": statistics.mean(r["bytes"])}
+                                    for name, r in routes_result.items()}
+                       for scale, routes_result in results.items()}, f, indent=2)
+
+    problems = check(results)
+    if problems:
+        print(f"BUDGET EXCEEDED: {len(problems)}건")
+        for problem in problems:
+            print(f"  {problem}")
+        return 1
+    print("OK: 모든 라우트가 예산 안에 있음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,402 @@
+import copy
+import inspect
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+# 모듈 요약: DBhandler 읽기 결과를 프로세스 메모리에 캐시하는 read-through 래퍼입니다.
+# 네임스페이스별 TTL과 LRU 최대 크기를 가지며, 같은 래퍼를 통한 쓰기는
+# 태그 단위로 관련 항목만 무효화합니다. 정의되지 않은 메서드는 원본 핸들러로 위임합니다.
+# 원본이 AsyncDBhandler(is_async)이면 같은 메서드가 코루틴을 반환하며, 캐시 인스턴스를 공유할 수 있습니다.
+
+DEFAULT_TTLS = {
+    "items": 30.0,
+    "reviews": 60.0,
+    "users": 300.0,
+    "likes": 10.0,
+}
+
+ITEM_LIST = ("item_list",)
+REVIEW_LIST = ("review_list",)
+
+
+class TTLCache:
+    """네임스페이스별 TTL과 LRU 크기 제한을 가진 태그 기반 캐시 (스레드 안전)."""
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, max_entries: int = 1024):
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # 캐시 키 -> (만료 시각, 값, 태그)
+        self._tags = {}                 # 태그 -> 캐시 키 집합
+        self._generation = 0            # 무효화/비우기마다 증가 (진행 중이던 조회의 저장 여부 판단)
+        self._lock = threading.Lock()
+        self._stats = {ns: {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0} for ns in self.ttls}
+
+    def _count(self, namespace, field, n=1):
+        self._stats.setdefault(namespace, {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0})[field] += n
+
+    def _drop(self, key):
+        """항목 하나를 제거하고 태그 인덱스에서도 뺍니다. (lock 보유 상태에서 호출)"""
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def get(self, key):
+        """
+        캐시 값을 조회합니다. (key[0]이 네임스페이스)
+        :return: (tuple) (적중 여부, 값의 사본)
+        """
+        namespace = key[0]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    self._drop(key)
+                self._count(namespace, "misses")
+                return False, None
+            self._entries.move_to_end(key)
+            self._count(namespace, "hits")
+            value = entry[1]
+        return True, copy.deepcopy(value)
+
+    @property
+    def generation(self) -> int:
+        """현재 무효화 세대. 조회를 시작하기 전에 읽어 두었다가 set(..., generation=)에 넘깁니다."""
+        with self._lock:
+            return self._generation
+
+    def set(self, key, value, tags=(), generation=None):
+        """
+        값의 사본을 저장하고, 최대 크기를 넘으면 가장 오래 쓰이지 않은 항목부터 제거합니다.
+        :param generation: (int) 조회를 시작할 때의 세대. 그 뒤에 무효화가 있었으면 값이 그 쓰기보다
+                           오래되었을 수 있으므로 저장하지 않습니다. (None이면 검사하지 않음)
+        """
+        namespace = key[0]
+        ttl = self.ttls.get(namespace, 0)
+        if ttl <= 0:
+            return
+        stored = copy.deepcopy(value)
+        tags = frozenset(tags)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl, stored, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._count(oldest[0], "evictions")
+
+    def invalidate(self, *tags):
+        """주어진 태그가 붙은 항목을 모두 제거합니다."""
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._drop(key)
+                    self._count(key[0], "invalidations")
+
+    def clear(self):
+        """모든 항목을 제거합니다. (통계는 유지)"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._tags.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """네임스페이스별 적중/실패/제거/무효화 횟수와 현재 크기를 반환합니다."""
+        with self._lock:
+            namespaces = {ns: dict(counts) for ns, counts in self._stats.items()}
+            for counts in namespaces.values():
+                total = counts["hits"] + counts["misses"]
+                counts["hit_rate"] = round(counts["hits"] / total, 4) if total else 0.0
+            return {"size": len(self._entries), "max_entries": self.max_entries, "namespaces": namespaces}
+
+
+def _then(result, callback):
+    """결과가 awaitable이면 완료된 뒤에, 아니면 즉시 callback을 실행합니다."""
+    if inspect.isawaitable(result):
+        async def wait():
+            try:
+                return await result
+            finally:
+                callback()
+        return wait()
+    callback()
+    return result
+
+
+def _map_result(result, fn):
+    """결과가 awaitable이면 완료된 값에, 아니면 즉시 fn을 적용합니다."""
+    if inspect.isawaitable(result):
+        async def wait():
+            return fn(await result)
+        return wait()
+    return fn(result)
+
+
+class CachedDBhandler:
+    """DBhandler 읽기를 TTLCache로 감싸는 래퍼.
+
+    쓰기 메서드는 원본을 호출한 뒤 관련 태그를 무효화합니다.
+    - ("item", key): 상품 단건, 그 상품을 포함한 판매/구매 인덱스와 그 상품의 리뷰/리뷰 작성 여부
+      (키 변경 시 리뷰가 새 키로 옮겨지므로 작성자를 몰라도 상품 태그로 함께 무효화)
+    - ("likes", key): 좋아요 수/상태, 그 상품을 포함한 찜 목록
+    - ITEM_LIST / REVIEW_LIST: 목록 페이지, 카운터, 전체 조회
+    """
+
+    def __init__(self, handler, ttls: Optional[Dict[str, float]] = None, max_entries: int = 1024,
+                 cache: Optional[TTLCache] = None):
+        self._handler = handler
+        self.is_async = getattr(handler, "is_async", False)
+        self.cache = cache or TTLCache(ttls, max_entries)
+
+    def __getattr__(self, name):
+        # 구현: 래핑하지 않은 메서드는 원본으로 위임, 마이그레이션/백필은 실행 후 캐시 전체 비움
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attr = getattr(self._handler, name)
+        if callable(attr) and name.startswith(("migrate_", "backfill_")):
+            def run_and_clear(*args, **kwargs):
+                return self._write(lambda: attr(*args, **kwargs), clear=True)
+            return run_and_clear
+        return attr
+
+    @property
+    def handler(self):
+        """감싸고 있는 원본 핸들러."""
+        return self._handler
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """캐시 통계를 반환합니다."""
+        return self.cache.stats()
+
+    # ==========================================================
+    # 공통 헬퍼
+    # ==========================================================
+
+    def _ready(self, value):
+        """캐시 적중 값을 원본과 같은 형태(비동기 원본이면 코루틴)로 반환합니다."""
+        if not self.is_async:
+            return value
+
+        async def done():
+            return value
+        return done()
+
+    def _write(self, call, *tags, clear=False):
+        """원본 쓰기를 실행하고, 완료되면(실패해도) 태그를 무효화하거나 캐시를 비웁니다."""
+        def invalidate():
+            if clear:
+                self.cache.clear()
+            else:
+                self.cache.invalidate(*tags)
+        try:
+            result = call()
+        except Exception:
+            invalidate()
+            raise
+        return _then(result, invalidate)
+
+    def _cached(self, key, tags, loader, tags_for=None):
+        """
+        단일 값 read-through. None(조회 실패/없음)은 캐시하지 않습니다.
+        :param tags_for: (callable) 결과 값에서 추가 태그를 만드는 함수
+        """
+        generation = self.cache.generation
+        hit, value = self.cache.get(key)
+        if hit:
+            return self._ready(value)
+
+        def store(value):
+            if value is not None:
+                extra = tags_for(value) if tags_for else ()
+                self.cache.set(key, value, tuple(tags) + tuple(extra), generation)
+            return value
+        return _map_result(loader(), store)
+
+    def _cached_many(self, namespace, ids, key_for, tags_for, loader):
+        """
+        ID 목록 read-through. 캐시에 없는 ID만 모아 원본 일괄 조회(loader)를 한 번 호출합니다.
+        :return: (dict) ID -> 값 (loader 결과에 없는 ID는 제외)
+        """
+        generation = self.cache.generation
+        found, missing = {}, []
+        for id_ in dict.fromkeys(ids or []):
+            hit, value = self.cache.get((namespace,) + key_for(id_))
+            if hit:
+                found[id_] = value
+            else:
+                missing.append(id_)
+
+        def merge(loaded):
+            loaded = loaded or {}
+            for id_ in missing:
+                if id_ in loaded:
+                    found[id_] = loaded[id_]
+                    self.cache.set((namespace,) + key_for(id_), loaded[id_], tags_for(id_), generation)
+            return {id_: found[id_] for id_ in dict.fromkeys(ids or []) if id_ in found}
+
+        if not missing:
+            return self._ready(merge({}))
+        return _map_result(loader(missing), merge)
+
+    # ==========================================================
+    # 사용자
+    # ==========================================================
+
+    def get_user_info(self, user_id):
+        return self._cached(("users", "info", user_id), [("user", user_id)],
+                            lambda: self._handler.get_user_info(user_id))
+
+    def get_user_publics(self, user_ids):
+        return self._cached_many("users", [u for u in user_ids or [] if u],
+                                 lambda u: ("public", u), lambda u: [("user", u)],
+                                 self._handler.get_user_publics)
+
+    def insert_user(self, data, pw_hash):
+        return self._write(lambda: self._handler.insert_user(data, pw_hash),
+                           ("user", data.get("id")))
+
+    def update_user_profile_img(self, user_id, img_path):
+        return self._write(lambda: self._handler.update_user_profile_img(user_id, img_path),
+                           ("user", user_id))
+
+    def update_user_info(self, user_id, pw_hash, email, phone):
+        return self._write(lambda: self._handler.update_user_info(user_id, pw_hash, email, phone),
+                           ("user", user_id))
+
+    # ==========================================================
+    # 상품
+    # ==========================================================
+
+    def get_items(self):
+        return self._cached(("items", "all"), [ITEM_LIST], self._handler.get_items)
+
+    def get_item_byname(self, name):
+        return self._cached(("items", "item", name), [("item", name)],
+                            lambda: self._handler.get_item_byname(name))
+
+    def get_items_by_keys(self, keys):
+        return self._cached_many("items", keys, lambda k: ("item", k), lambda k: [("item", k)],
+                                 self._handler.get_items_by_keys)
+
+    def get_item_summaries(self, keys):
+        return self._cached_many("items", keys, lambda k: ("summary", k), lambda k: [("item", k)],
+                                 self._handler.get_item_summaries)
+
+    def get_item_count(self, category=None):
+        return self._cached(("items", "count", category), [ITEM_LIST],
+                            lambda: self._handler.get_item_count(category))
+
+    def get_items_page(self, category=None, cursor=None, direction="next", per_page=4):
+        return self._cached(("items", "page", category, cursor, direction, per_page), [ITEM_LIST],
+                            lambda: self._handler.get_items_page(category, cursor, direction, per_page))
+
+    def get_items_by_author(self, user_id):
+        return self._cached(("items", "author", user_id), [("author", user_id)],
+                            lambda: self._handler.get_items_by_author(user_id),
+                            lambda keys: [("item", k) for k in keys])
+
+    def get_items_by_buyer(self, user_id):
+        return self._cached(("items", "buyer", user_id), [("buyer", user_id)],
+                            lambda: self._handler.get_items_by_buyer(user_id),
+                            lambda keys: [("item", k) for k in keys])
+
+    def insert_item(self, name, data, img_path, author_id, trade_method, created_at, thumb_path=None):
+        return self._write(lambda: self._handler.insert_item(name, data, img_path, author_id, trade_method, created_at,
+                                                             thumb_path=thumb_path),
+                           ("item", name), ("author", author_id), ITEM_LIST)
+
+    def update_item(self, original_key, new_data, img_path, author_id, new_key=None, thumb_path=None):
+        return self._write(lambda: self._handler.update_item(original_key, new_data, img_path, author_id, new_key=new_key,
+                                                             thumb_path=thumb_path),
+                           ("item", original_key), ("item", new_key or original_key),
+                           ("likes", original_key), ("likes", new_key or original_key),
+                           ("author", author_id), ITEM_LIST, REVIEW_LIST)
+
+    def purchase_item(self, name, buyer_id):
+        return self._write(lambda: self._handler.purchase_item(name, buyer_id),
+                           ("item", name), ("buyer", buyer_id), ITEM_LIST)
+
+    def delete_item(self, item_name):
+        return self._write(lambda: self._handler.delete_item(item_name),
+                           ("item", item_name), ("likes", item_name), ITEM_LIST)
+
+    # ==========================================================
+    # 리뷰
+    # ==========================================================
+
+    def get_reviews(self):
+        return self._cached(("reviews", "all"), [REVIEW_LIST], self._handler.get_reviews)
+
+    def get_reviews_page(self, sort="latest", cursor=None, direction="next", per_page=4):
+        return self._cached(("reviews", "page", sort, cursor, direction, per_page), [REVIEW_LIST],
+                            lambda: self._handler.get_reviews_page(sort, cursor, direction, per_page))
+
+    def get_review_count(self):
+        return self._cached(("reviews", "count"), [REVIEW_LIST], self._handler.get_review_count)
+
+    def get_review_by_key(self, review_key):
+        return self._cached(("reviews", "review", review_key), [("review", review_key)],
+                            lambda: self._handler.get_review_by_key(review_key),
+                            lambda review: [("item", review.get("item_name"))])
+
+    def check_review_exists(self, item_name, user_id):
+        return self._cached(("reviews", "exists", item_name, user_id), [("writer", user_id), ("item", item_name)],
+                            lambda: self._handler.check_review_exists(item_name, user_id))
+
+    def check_reviews_exist(self, item_names, user_id):
+        return self._cached(("reviews", "exists_many", tuple(item_names or []), user_id),
+                            [("writer", user_id)] + [("item", k) for k in item_names or []],
+                            lambda: self._handler.check_reviews_exist(item_names, user_id))
+
+    def reg_review(self, item_name, data, img_path, writer_id, created_at):
+        return self._write(lambda: self._handler.reg_review(item_name, data, img_path, writer_id, created_at),
+                           ("review", f"{item_name}_{writer_id}"), ("writer", writer_id), REVIEW_LIST)
+
+    # ==========================================================
+    # 좋아요
+    # ==========================================================
+
+    def get_like_status(self, item_name, user_id):
+        return self._cached(("likes", "status", item_name, user_id), [("likes", item_name)],
+                            lambda: self._handler.get_like_status(item_name, user_id))
+
+    def get_like_count(self, item_name):
+        return self._cached(("likes", "count", item_name), [("likes", item_name)],
+                            lambda: self._handler.get_like_count(item_name))
+
+    def get_like_counts(self, item_keys):
+        return self._cached_many("likes", item_keys, lambda k: ("count", k), lambda k: [("likes", k)],
+                                 self._handler.get_like_counts)
+
+    def get_like_statuses(self, item_keys, user_id):
+        if not user_id:
+            return self._handler.get_like_statuses(item_keys, user_id)
+        return self._cached_many("likes", item_keys, lambda k: ("status", k, user_id), lambda k: [("likes", k)],
+                                 lambda keys: self._handler.get_like_statuses(keys, user_id))
+
+    def get_liked_items_by_user(self, user_id):
+        return self._cached(("likes", "user", user_id), [("user_likes", user_id)],
+                            lambda: self._handler.get_liked_items_by_user(user_id),
+                            lambda keys: [("likes", k) for k in keys])
+
+    def set_like_status(self, item_name, user_id, liked):
+        return self._write(lambda: self._handler.set_like_status(item_name, user_id, liked),
+                           ("likes", item_name), ("user_likes", user_id))
+
+    def toggle_like(self, item_name, user_id):
+        return self._write(lambda: self._handler.toggle_like(item_name, user_id),
+                           ("likes", item_name), ("user_likes", user_id))
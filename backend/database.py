@@ -1,29 +1,261 @@
 import pyrebase
+import contextlib
+import copy
 import json
 import hashlib
 import os
 import logging
+import threading
 from datetime import datetime
 from typing import Optional, Dict, Any
 
+from etag_cache import ETagCache
+from fanout import fan_map, gather
+from metrics import instrumented
+from replica import REPLICA_NODES, StreamReplica
+from snapshot import JournaledReplica, SnapshotStore
+from sqlite_store import SQLiteDatabase, SQLiteStore
+from transport import PooledSession, TransportConfig
+from unit_of_work import begin_batch, current_batch, current_unit_of_work, end_batch, merge_updates
+
 logger = logging.getLogger(__name__)
 
 
+def _firebase_key_order(key):
+    """
+    Firebase orderByKey 정렬 규칙에 맞춘 정렬 키.
+    32비트 정수로 해석되는 키가 먼저(숫자 순) 오고, 나머지는 문자열 사전 순입니다.
+    """
+    try:
+        n = int(key)
+        if str(n) == key and -2 ** 31 <= n < 2 ** 31:
+            return (0, n, "")
+    except (TypeError, ValueError):
+        pass
+    return (1, 0, str(key))
+
+
+ITEM_COUNT_TOTAL = "_total"
+# 변경 피드(changes/<key>)에 기록하는 노드: 스냅샷으로 재시작하는 복제본이 이 노드들의 변경분만 이어받습니다.
+CHANGE_FEED_NODES = ("item", "item_summary", "likes", "review", "like_count", "user_public")
+# 목록 화면(상품 목록/찜/마이페이지)이 쓰는 상품 필드: item_summary projection에 이 필드와 thumb_path만 저장합니다.
+ITEM_SUMMARY_FIELDS = ("title", "price", "status", "category", "region", "trade_method", "author", "img_path",
+                       "created_key", "category_key")
+# 구매의 ETag 조건부 쓰기가 다른 쓰기와 충돌했을 때 최신 값으로 다시 시도할 최대 횟수
+PURCHASE_RETRIES = 5
+# 같은 사용자/상품의 찜 요청을 프로세스 안에서 순서대로 처리하는 잠금 개수 (키 해시로 나눠 사용)
+LIKE_LOCK_STRIPES = 64
+# 상품 수정(키 변경 포함)의 ETag 조건부 쓰기가 구매 등과 충돌했을 때 다시 시도할 최대 횟수
+EDIT_RETRIES = 5
+# 키 변경 중에 기존 키로 새로 추가된 찜을 옮기는 최대 반복 횟수
+RENAME_LIKE_PASSES = 3
+
+
+def _safe_key(value):
+    """
+    Firebase 키에 쓸 수 없는 문자(. $ # [ ] /)를 '~XX'(16진수) 형태로 치환합니다.
+    REST URL 경로에서 다시 해석되지 않도록 퍼센트 인코딩 대신 '~'를 사용합니다.
+    """
+    out = str(value)
+    for ch in "~.$#[]/":
+        out = out.replace(ch, "~{:02X}".format(ord(ch)))
+    return out
+
+
+def valid_user_id(user_id):
+    """
+    회원가입에 쓸 수 있는 사용자 ID인지 확인합니다.
+    Firebase 키 금지 문자(. $ # [ ] /)나 제어 문자가 있으면 경로가 중첩되어 다른 사용자 레코드를 덮어쓸 수 있습니다.
+    """
+    if not isinstance(user_id, str) or not user_id.strip():
+        return False
+    return not any(ch in ".$#[]/" or ord(ch) < 32 or ord(ch) == 127 for ch in user_id)
+
+
+def _item_sort_fields(key, item_info):
+    """
+    상품 목록 서버 측 정렬/필터용 복합 키를 만듭니다.
+    created_key: '<created_at>|<key>' (전체 최신순), category_key: '<category>|<created_at>|<key>'
+    """
+    created_at = item_info.get("created_at") or ""
+    return {
+        "created_key": f"{created_at}|{key}",
+        "category_key": f"{item_info.get('category') or ''}|{created_at}|{key}",
+    }
+
+
+def _item_summary(item_info):
+    """
+    상품 레코드에서 목록 화면용 projection(item_summary)에 담을 필드만 추립니다. (desc 등 상세 필드 제외)
+    thumb_path는 썸네일이 없으면 원본 이미지 경로입니다.
+    """
+    summary = {field: item_info[field] for field in ITEM_SUMMARY_FIELDS if item_info.get(field) is not None}
+    summary["thumb_path"] = item_info.get("thumb_path") or item_info.get("img_path") or ""
+    return summary
+
+
+def _user_public_fields(user_info):
+    """사용자 레코드에서 공개 projection(user_public)에 담을 필드만 추립니다."""
+    return {"profile_img": (user_info or {}).get("profile_img") or ""}
+
+
+def _review_sort_fields(review_key, review_info):
+    """
+    리뷰 정렬용 필드를 만듭니다.
+    created_ts/rate_num: 숫자 값, latest_key/rating_key: 고유한 복합 정렬 키 (orderByChild + 커서용)
+    """
+    try:
+        created_ts = int(datetime.strptime(review_info.get("created_at") or "", "%Y-%m-%d %H:%M:%S").timestamp())
+    except (TypeError, ValueError):
+        created_ts = 0
+    try:
+        rate_num = float(review_info.get("rate") or 0)
+    except (TypeError, ValueError):
+        rate_num = 0.0
+    return {
+        "created_ts": created_ts,
+        "rate_num": rate_num,
+        "latest_key": f"{created_ts:012d}|{review_key}",
+        "rating_key": f"{rate_num:04.1f}|{created_ts:012d}|{review_key}",
+    }
+
+
+def _page_query(db, node, field, cursor, direction, per_page, lower=None, upper=None):
+    """
+    DBhandler._query_page의 서버 측 쿼리를 만듭니다. (한두 개 더 가져와 다음/이전 페이지 여부 판단)
+    db는 pyrebase Database 또는 같은 쿼리 빌더 API를 가진 객체(AsyncDBhandler)입니다.
+    """
+    extra = 2 if cursor else 1
+    query = db.child(node).order_by_child(field)
+    if direction == "prev" and cursor:
+        # 구현: cursor 이후 구간을 오름차순 앞쪽부터 조회
+        query = query.start_at(cursor)
+        if upper:
+            query = query.end_at(upper)
+        return query.limit_to_first(per_page + extra)
+    # 구현: cursor 이전 구간을 오름차순 뒤쪽부터 조회
+    if lower:
+        query = query.start_at(lower)
+    if cursor or upper:
+        query = query.end_at(cursor or upper)
+    return query.limit_to_last(per_page + extra)
+
+
+def _page_from_rows(rows, field, cursor, direction, per_page):
+    """
+    _page_query 결과를 내림차순 페이지와 다음/이전 커서로 정리합니다.
+    :return: (dict) items(내림차순 (key, 데이터) 목록), next_cursor, prev_cursor
+    """
+    page = {"items": [], "next_cursor": None, "prev_cursor": None}
+    rows = [(k, v) for k, v in (rows.items() if isinstance(rows, dict) else [])
+            if isinstance(v, dict) and v.get(field) and v.get(field) != cursor]
+    rows.sort(key=lambda kv: kv[1][field])
+
+    # 구현: 한 개 더 가져온 결과로 다음/이전 페이지 존재 여부를 판단하고 내림차순으로 정렬
+    if direction == "prev" and cursor:
+        has_newer = len(rows) > per_page
+        rows = rows[:per_page]
+        has_older = True
+    else:
+        has_older = len(rows) > per_page
+        rows = rows[-per_page:] if per_page else []
+        has_newer = bool(cursor)
+    rows.reverse()
+
+    page["items"] = rows
+    if rows and has_older:
+        page["next_cursor"] = rows[-1][1][field]
+    if rows and has_newer:
+        page["prev_cursor"] = rows[0][1][field]
+    return page
+
+
+def _key_list(value):
+    """shallow 조회 결과(키 목록 또는 dict)를 Firebase 키 순서로 정렬한 리스트로 바꿉니다. (없음/원시 값은 빈 목록)"""
+    if isinstance(value, dict):
+        value = value.keys()
+    elif value is None or isinstance(value, (str, bytes, int, float, bool)):
+        return []
+    return sorted(value, key=_firebase_key_order)
+
+
+def _as_count(value):
+    """카운터 노드 값을 정수로 변환합니다. (없거나 잘못된 값은 0, 음수는 카운터 어긋남이 드러나도록 그대로 반환)"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return 0
+    return int(value)
+
+
+class _ThreadLocalDatabase:
+    """
+    스레드마다 별도의 pyrebase Database 객체를 쓰도록 하는 프록시.
+    pyrebase Database는 child()/쿼리 호출 시 내부 경로 상태를 바꾸므로 스레드 간에 공유할 수 없습니다.
+    연결 풀(requests 세션)은 모든 스레드가 공유합니다.
+    """
+
+    def __init__(self, firebase, session):
+        self._firebase = firebase
+        self._session = session
+        self._local = threading.local()
+
+    def _database(self):
+        database = getattr(self._local, "database", None)
+        if database is None:
+            database = self._firebase.database()
+            database.requests = self._session
+            self._local.database = database
+        return database
+
+    def __getattr__(self, name):
+        return getattr(self._database(), name)
+
+
+@instrumented(exclude=("transport_stats", "enable_replica", "replica_ready", "replica_serves", "batch"))
 class DBhandler:
     """Firebase Realtime Database handler.
 
     Environment:
+      DB_BACKEND: 저장소 선택 - firebase(기본) 또는 sqlite (단일 노드 배포/개발용 로컬 저장소, sqlite_store.py)
+      DB_SQLITE_PATH: sqlite 저장소 파일 경로 (기본: ./backend/ewhamarket.sqlite3)
       FIREBASE_CONFIG: 파일 경로 (기본: ./backend/authentication/firebase_auth.json)
+      DB_POOL_SIZE, DB_CONNECT_TIMEOUT, DB_READ_TIMEOUT, DB_READ_RETRIES, DB_RETRY_BACKOFF: 전송 계층 설정 (transport.py)
+      DB_ETAG_CACHE_SIZE, DB_NEGATIVE_TTL: 상품 단건 조회의 ETag 재검증 캐시 설정 (etag_cache.py)
+      DB_CHANGE_FEED: 1이면 CHANGE_FEED_NODES를 바꾸는 update마다 changes/<key>에 변경 경로를 함께 기록
+                      (스냅샷 복제본을 쓰는 경우 모든 워커/도구에서 켜야 함)
+
+    enable_replica()를 호출하면 item/likes/review 노드를 스트림으로 미러링하고,
+    미러가 준비된 동안 해당 노드의 읽기는 로컬에서 처리합니다. (쓰기는 항상 Firebase로 전달)
+    snapshot_dir을 주면 미러를 디스크 스냅샷+저널로 보존하고, 재시작 시 변경 피드로 변경분만 받아옵니다.
+    요청 단위 작업(unit_of_work.UnitOfWork)이 있으면 단건 경로 읽기를 기억해 같은 요청에서 다시 읽지 않습니다.
+    공개 메서드 호출은 metrics.instrumented로 계측되어 호출한 Flask 엔드포인트별로 /metrics에 집계됩니다.
     """
 
     # ==========================================================
     # 1. DB 초기화 및 설정 (Initialization & Setup)
     # ==========================================================
 
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None, transport: Optional[TransportConfig] = None,
+                 change_feed: Optional[bool] = None, backend: Optional[str] = None, sqlite_path: Optional[str] = None):
         # 구현: Firebase 설정 파일 경로 결정 (인수 > 환경변수 > 기본경로)
         cfg_path = config_path or os.getenv("FIREBASE_CONFIG") or os.path.join("./backend", "authentication", "firebase_auth.json")
         self.db = None
+        self.session = None
+        self.store = None
+        self.replica = None
+        self.etag_cache = ETagCache()
+        self._like_locks = [threading.Lock() for _ in range(LIKE_LOCK_STRIPES)]
+        self.change_feed = change_feed if change_feed is not None else os.getenv("DB_CHANGE_FEED", "0") == "1"
+
+        # 구현: sqlite 저장소를 선택하면 같은 쿼리 빌더 API의 로컬 DB 레퍼런스 사용 (Firebase 설정 불필요)
+        if (backend or os.getenv("DB_BACKEND", "firebase")) == "sqlite":
+            db_path = sqlite_path or os.getenv("DB_SQLITE_PATH") or os.path.join("./backend", "ewhamarket.sqlite3")
+            try:
+                self.store = SQLiteStore(db_path)
+                self.db = SQLiteDatabase(self.store)
+                logger.info("Initialized SQLite DB handler using %s", db_path)
+            except Exception:
+                logger.exception("Failed to initialize SQLite DB handler from %s", db_path)
+            return
         
         # 구현: 설정 파일을 읽어 pyrebase 초기화 후 DB 레퍼런스 설정
         try:
@@ -35,40 +267,251 @@ class DBhandler:
                 config = json.load(f)
 
             firebase = pyrebase.initialize_app(config)
-            self.db = firebase.database()
+            # 구현: pyrebase 기본 세션을 타임아웃/재시도/keep-alive 풀이 설정된 세션으로 교체하고,
+            #       동시 조회(fan-out)를 위해 스레드별 Database 객체를 사용
+            self.session = PooledSession(transport)
+            self.db = _ThreadLocalDatabase(firebase, self.session)
             logger.info("Initialized Firebase DB handler using %s", cfg_path)
         except Exception:
             logger.exception("Failed to initialize Firebase DB handler from %s", cfg_path)
 
+    def transport_stats(self):
+        """
+        DB 전송 계층의 요청/재시도 횟수와 연결 풀 상태를 반환합니다. (복제본 사용 시 replica 항목 포함)
+        :return: (dict) 통계 (DB 미초기화 시 빈 dict)
+        """
+        if self.session:
+            stats = self.session.stats()
+        else:
+            stats = self.store.stats() if self.store else {}
+        stats["etag_cache"] = self.etag_cache.stats()
+        if self.replica is not None:
+            stats["replica"] = self.replica.stats()
+        return stats
+
+    def enable_replica(self, nodes=REPLICA_NODES, wait: Optional[float] = None, snapshot_dir: Optional[str] = None):
+        """
+        자주 읽는 노드의 스트림 구독을 열어 메모리 미러(StreamReplica)를 유지합니다.
+        :param nodes: (iterable) 미러링할 최상위 노드 (기본: item, likes, review)
+        :param wait: (float) 초기 스냅샷을 기다릴 최대 초 (None이면 백그라운드로 준비)
+        :param snapshot_dir: (str) 지정하면 디스크 스냅샷+저널을 쓰는 JournaledReplica 사용 (변경 피드 필요)
+        :return: (StreamReplica) 복제본 (DB 미초기화 시 None)
+        """
+        # 구현: DB 연결 확인
+        if not self.db:
+            logger.error("enable_replica called but DB is not initialized")
+            return None
+        if self.store is not None:
+            # 구현: 로컬 저장소는 읽기가 곧 로컬 조회이므로 미러가 필요 없음 (스트림도 지원하지 않음)
+            logger.info("Replica is not used with the SQLite backend")
+            return None
+        if self.replica is None:
+            if snapshot_dir:
+                if not self.change_feed:
+                    logger.warning("Snapshot replica enabled without DB_CHANGE_FEED; this process's writes are not logged")
+                retention_days = float(os.getenv("DB_CHANGE_FEED_RETENTION_DAYS", 7))
+                self.replica = JournaledReplica(self, nodes, SnapshotStore(snapshot_dir), retention_days).start(wait)
+            else:
+                self.replica = StreamReplica(self, nodes).start(wait)
+        return self.replica
+
+    def replica_ready(self, *nodes):
+        """주어진 노드들을 로컬 미러에서 읽을 수 있는지 여부."""
+        return self.replica is not None and self.replica.ready(*nodes)
+
+    def replica_serves(self, *nodes):
+        """주어진 노드 중 하나라도 로컬 미러에서 읽을 수 있는지 여부."""
+        return self.replica is not None and any(self.replica.ready(node) for node in nodes)
+
+    def _mirror(self, node, *parts):
+        """미러의 node/parts 값을 복사해 반환합니다. (호출 측 수정이 미러에 번지지 않도록)"""
+        return copy.deepcopy(self.replica.get(node, *parts))
+
+    def _change_entry(self, paths):
+        """
+        변경 피드 항목을 만듭니다. (CHANGE_FEED_NODES 아래 경로가 없으면 빈 dict)
+        :param paths: (iterable) 바뀐 경로 목록 ("노드/키/..." 형식)
+        :return: (dict) changes/<key> -> {t: 서버 시각, paths: 경로 목록}
+        """
+        paths = [path for path in paths if path.split("/", 1)[0] in CHANGE_FEED_NODES]
+        if not paths:
+            return {}
+        return {f"changes/{self.db.generate_key()}": {"t": {".sv": "timestamp"}, "paths": paths}}
+
+    def _with_change_entry(self, updates, changed=()):
+        """
+        변경 피드가 켜져 있으면 changes/<key> 항목을 더한 update 본문을, 아니면 updates를 그대로 반환합니다.
+        :param changed: (iterable) updates 밖에서(조건부 쓰기 등으로) 바뀐 경로 중 함께 기록할 경로
+        """
+        return {**updates, **self._change_entry(list(updates) + list(changed))} if self.change_feed else updates
+
+    def _get(self, path, fetch=None):
+        """
+        경로 하나의 값을 조회합니다. 요청 단위 작업 안에서는 같은 경로(또는 이미 읽은 상위 경로 아래)를 다시 읽지 않습니다.
+        :param path: (str) "노드/키/..." 형식 경로
+        :param fetch: (callable) 경로 단건 조회 대신 쓸 조회 함수 (선택)
+        :return: 값 (없으면 None)
+        """
+        uow = current_unit_of_work()
+        if uow is not None:
+            hit, value = uow.lookup(path)
+            if hit:
+                return value
+        value = fetch() if fetch else self.db.child(path).get().val()
+        if uow is not None:
+            uow.remember(path, value)
+        return value
+
+    def _get_revalidated(self, path):
+        """
+        경로 하나를 ETag 재검증으로 조회합니다.
+        보관한 사본이 있으면 If-None-Match로 보내 바뀌지 않았을 때 본문 없는 304로 사본을 쓰고,
+        없는 경로는 잠시 '없음'으로 기억해 다시 요청하지 않습니다.
+        (If-None-Match를 지원하지 않는 서버는 200과 본문을 그대로 돌려주므로 결과는 같음)
+        :param path: (str) "노드/키" 형식 경로
+        :return: 값 (없으면 None)
+        """
+        if self.store is not None:
+            # 구현: 로컬 저장소는 줄일 네트워크 왕복이 없으므로 바로 조회
+            return self.db.child(path).get().val()
+        generation, missing, etag, cached = self.etag_cache.lookup(path)
+        if missing:
+            return None
+        headers = dict(self.db.build_headers(), **{"X-Firebase-ETag": "true"})
+        if etag:
+            headers["If-None-Match"] = etag
+        resp = self.session.get(self.db.child(path).build_request_url(None), headers=headers)
+        if resp.status_code == 304 and etag:
+            return self.etag_cache.not_modified(cached)
+        resp.raise_for_status()
+        value = resp.json()
+        self.etag_cache.store(path, resp.headers.get("ETag"), value, generation)
+        return value
+
+    def _update(self, updates, changed=()):
+        """
+        루트에 다중 경로 update를 적용하고, 성공하면 미러와 요청 단위 작업에도 바로 반영합니다.
+        (스트림 이벤트가 도착하기 전에도, 같은 요청 안에서도 자신의 쓰기를 다시 조회하지 않고 읽을 수 있도록)
+        변경 피드가 켜져 있으면 같은 update에 changes/<key> 항목을 함께 기록합니다.
+        batch() 블록 안에서는 보내지 않고 모아 두었다가 블록이 끝날 때 한 번에 보냅니다.
+        :param changed: (iterable) 변경 피드에 함께 기록할, updates 밖에서(조건부 쓰기로) 바뀐 경로
+        """
+        pending = current_batch()
+        if pending is not None:
+            merge_updates(pending, updates)
+            if changed and self.change_feed:
+                merge_updates(pending, self._change_entry(changed))
+            return
+        self.etag_cache.invalidate(list(updates) + list(changed))
+        self.db.update(self._with_change_entry(updates, changed))
+        if self.replica is not None:
+            self.replica.apply_update(updates)
+        uow = current_unit_of_work()
+        if uow is not None:
+            uow.record_write(updates)
+
+    def _get_with_etag(self, path):
+        """
+        경로 하나의 값을 ETag와 함께 조회합니다. (조건부 쓰기의 기준 값)
+        :return: (tuple) (ETag, 값)
+        """
+        result = self.db.child(path).get_etag()
+        return result["ETag"], result["value"]
+
+    def _set_if_match(self, path, value, etag):
+        """
+        경로의 ETag가 etag와 같을 때만 value로 덮어씁니다. (value가 None이면 삭제)
+        Firebase의 조건부 쓰기는 단일 경로 PUT/DELETE만 지원하므로 다중 경로 update와 묶을 수 없습니다.
+        성공하면 미러와 요청 단위 작업에도 바로 반영합니다.
+        :return: (tuple) (성공 여부, 최신 ETag, 최신 값) - 실패 시 서버가 돌려준 현재 값으로 다시 시도할 수 있음
+        """
+        ref = self.db.child(path)
+        self.etag_cache.invalidate([path])
+        result = ref.conditional_remove(etag) if value is None else ref.conditional_set(value, etag)
+        # 구현: pyrebase는 412(ETag 불일치)일 때만 {"ETag", "value"}를 반환
+        if isinstance(result, dict) and set(result) == {"ETag", "value"}:
+            return False, result["ETag"], result["value"]
+        if self.replica is not None:
+            self.replica.apply_update({path: value})
+        uow = current_unit_of_work()
+        if uow is not None:
+            uow.record_write({path: value})
+        return True, None, value
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        블록 안의 쓰기를 모아 블록이 끝날 때 다중 경로 update 한 번으로 보냅니다. (원자적으로 함께 반영)
+        블록 안에서 예외가 나면 모은 쓰기는 보내지 않습니다. 전송 실패는 블록을 빠져나갈 때 예외로 전달됩니다.
+        """
+        if current_batch() is not None:
+            # 구현: 중첩된 batch는 바깥 batch에 합침
+            yield
+            return
+        pending, token = begin_batch()
+        try:
+            yield
+        finally:
+            end_batch(token)
+        if pending:
+            self._update(pending)
+
+    def get_child_keys(self, path):
+        """
+        경로 바로 아래의 자식 키 목록을 shallow 조회로 가져옵니다. (자식 값은 내려받지 않음)
+        :param path: (str) "노드/키/..." 형식 경로
+        :return: (list) 자식 키 목록 (Firebase 키 순서 정렬, 없거나 실패하면 빈 목록)
+        """
+        # 구현: DB 연결 확인
+        if not self.db:
+            logger.error("get_child_keys called but DB is not initialized")
+            return []
+        node, *parts = path.split("/")
+        # 구현: 스트림 미러에 있는 노드면 I/O 없이 미러의 키 사용
+        if self.replica_ready(node):
+            return _key_list(self.replica.get(node, *parts))
+        try:
+            return _key_list(self.db.child(path).shallow().get().val())
+        except Exception:
+            logger.exception("get_child_keys failed for %s", path)
+            return []
+
+    def count_children(self, path):
+        """
+        경로 바로 아래의 자식 수를 shallow 조회로 셉니다. (유지 중인 카운터가 없는 경우의 대체 수단)
+        :param path: (str) "노드/키/..." 형식 경로
+        :return: (int) 자식 수
+        """
+        return len(self.get_child_keys(path))
+
     # ==========================================================
     # 2. 사용자 인증 및 계정 관리 (User Auth & Management)
     # ==========================================================
 
+    def _user_exists(self, user_id):
+        """user/<id>/id 단건 조회로 사용자 레코드 존재 여부를 확인합니다. (조회 실패는 예외로 전달)"""
+        return self._get(f"user/{_safe_key(user_id)}/id") is not None
+
     def user_duplicate_check(self, id_string):
         """
         사용자 ID 중복 체크
         :param id_string: 체크할 사용자 ID
-        :return: (bool) 중복이면 False, 사용 가능하면 True
+        :return: (bool) 사용 가능하면 True, 중복이거나 쓸 수 없는 ID이거나 확인에 실패하면 False
         """
         # 구현: DB 연결 확인
         if not self.db:
             logger.error("user_duplicate_check called but DB is not initialized")
-            return True
-
-        # 구현: 사용자 노드 스냅샷을 가져와 id 중복 여부 검사
-        users = self.db.child("user").get()
-
-        if not users or not users.val():
-            return True
+            return False
+        if not valid_user_id(id_string):
+            return False
 
+        # 구현: user/<id>/id 단건 조회로 중복 여부 검사 (사용자 레코드는 id를 키로 저장)
+        # 조회 실패를 '사용 가능'으로 보면 기존 사용자를 덮어쓰는 가입을 허용하므로 '사용 불가'로 처리
         try:
-            for user in users.each() or []:
-                if (user.val() or {}).get('id') == id_string:
-                    return False 
+            return not self._user_exists(id_string)
         except Exception:
-            logger.exception("Error iterating users for duplicate check")
-
-        return True
+            logger.exception("Error reading user for duplicate check: %s", id_string)
+        return False
 
     def insert_user(self, data, pw_hash):
         """
@@ -86,20 +529,27 @@ class DBhandler:
             "profile_img": ""
         }
         
-        # 구현: DB 연결 확인 및 중복 여부 확인 후 push로 사용자 노드에 저장
+        # 구현: DB 연결 확인 및 ID 검사 (Firebase 키 금지 문자가 있는 ID는 거부)
         if not self.db:
             logger.error("insert_user called but DB is not initialized")
             return False
+        if not valid_user_id(user_info["id"]):
+            logger.warning("Rejected invalid user ID %r", user_info["id"])
+            return False
+        key = _safe_key(user_info["id"])
         try:
-            if self.user_duplicate_check(data.get('id')):
-                self.db.child("user").push(user_info)
-                logger.info("User %s inserted.", data.get('id'))
-                return True
-            else:
-                logger.warning("User ID %s already exists.", data.get('id'))
+            # 구현: user/<id>가 비어 있다는 ETag를 조건으로 생성 - 같은 ID의 동시 가입 중 하나만 성공
+            etag, existing = self._get_with_etag(f"user/{key}")
+            created = existing is None and self._set_if_match(f"user/{key}", user_info, etag)[0]
+            if not created:
+                logger.warning("User ID %s already exists.", user_info["id"])
                 return False
+            # 구현: 공개 프로필 projection(user_public)은 레코드 생성에 성공한 뒤에만 기록
+            self._update({f"user_public/{key}": _user_public_fields(user_info)})
+            logger.info("User %s inserted.", user_info["id"])
+            return True
         except Exception:
-            logger.exception("insert_user failed for %s", data.get('id'))
+            logger.exception("insert_user failed for %s", user_info["id"])
             return False
         
     def find_user(self, id_, pw_hash):
@@ -111,17 +561,13 @@ class DBhandler:
             logger.error("find_user called but DB is not initialized")
             return False
 
-        # 구현: 모든 사용자 스냅샷을 순회하여 id/pw 해시 일치 여부 검사
-        users = self.db.child("user").get()
-        if not users or not users.val():
-            return False
+        # 구현: user/<id> 단건 조회 후 pw 해시 일치 여부 검사
         try:
-            for user in users.each() or []:
-                value = user.val() or {}
-                if value.get('id') == id_ and value.get('pw') == pw_hash:
-                    return True
+            value = self._get(f"user/{_safe_key(id_)}")
+            if isinstance(value, dict) and value.get('pw') == pw_hash:
+                return True
         except Exception:
-            logger.exception("find_user iteration failed")
+            logger.exception("find_user lookup failed for %s", id_)
         return False
     
     def get_user_info(self, user_id):
@@ -135,19 +581,47 @@ class DBhandler:
             logger.error("get_user_info called but DB is not initialized")
             return None
 
-        # 구현: 사용자 스냅샷을 순회하여 user_id에 해당하는 레코드 반환
-        users = self.db.child("user").get()
-        if not users or not users.val():
-            return None
+        # 구현: user/<user_id> 단건 조회로 레코드 반환
         try:
-            for user in users.each() or []:
-                val = user.val() or {}
-                if val.get('id') == user_id:
-                    return val
+            val = self._get(f"user/{_safe_key(user_id)}")
+            if isinstance(val, dict):
+                return val
         except Exception:
-            logger.exception("get_user_info iteration failed")
+            logger.exception("get_user_info lookup failed for %s", user_id)
         return None
 
+    def get_user_publics(self, user_ids):
+        """
+        여러 사용자의 공개 프로필(user_public/<id>)을 일괄 조회합니다.
+        user_public에는 profile_img 등 공개 필드만 있어 전체 사용자 레코드보다 훨씬 작습니다.
+        :param user_ids: (list) 사용자 ID 목록 (중복 허용)
+        :return: (dict) 사용자 ID -> 공개 프로필 dict (없는 사용자는 제외)
+        """
+        publics = {}
+        # 구현: DB 연결 확인
+        if not self.db:
+            logger.error("get_user_publics called but DB is not initialized")
+            return publics
+        if self.replica_ready("user_public"):
+            for user_id in dict.fromkeys(u for u in user_ids or [] if u):
+                val = self._mirror("user_public", _safe_key(user_id))
+                if isinstance(val, dict):
+                    publics[user_id] = val
+            return publics
+        # 구현: 중복을 제거한 ID마다 user_public/<id> 단건 조회를 동시에 실행
+        def fetch(user_id):
+            try:
+                return self.db.child("user_public").child(_safe_key(user_id)).get().val()
+            except Exception:
+                logger.exception("get_user_publics failed for %s", user_id)
+                return None
+
+        ids = list(dict.fromkeys(u for u in user_ids or [] if u))
+        for user_id, val in zip(ids, fan_map(fetch, ids)):
+            if isinstance(val, dict):
+                publics[user_id] = val
+        return publics
+
     def update_user_profile_img(self, user_id, img_path):
         """
         사용자의 프로필 이미지 경로 업데이트
@@ -160,27 +634,19 @@ class DBhandler:
             logger.error("update_user_profile_img called but DB is not initialized")
             return False
 
-        users = self.db.child("user").get()
-        target_key = None
-
-        # 구현: 사용자 스냅샷을 순회하여 해당 user_id의 노드 키를 찾음
+        # 구현: 존재하는 사용자일 때만 user/<user_id>와 user_public/<user_id>의 profile_img를 함께 update
+        key = _safe_key(user_id)
         try:
-            for user in users.each() or []:
-                if (user.val() or {}).get('id') == user_id:
-                    target_key = user.key()
-                    break
-        except Exception:
-            logger.exception("update_user_profile_img: failed to iterate users")
-
-        # 구현: 발견 시 profile_img 필드를 update
-        if target_key:
-            try:
-                self.db.child("user").child(target_key).update({"profile_img": img_path})
-                return True
-            except Exception:
-                logger.exception("Failed to update profile image for %s", user_id)
+            if not self._user_exists(user_id):
                 return False
-        return False
+            self._update({
+                f"user/{key}/profile_img": img_path,
+                f"user_public/{key}/profile_img": img_path,
+            })
+            return True
+        except Exception:
+            logger.exception("Failed to update profile image for %s", user_id)
+            return False
     
     def update_user_info(self, user_id, pw_hash, email, phone):
         """
@@ -191,31 +657,21 @@ class DBhandler:
             logger.error("update_user_info called but DB is not initialized")
             return False
 
-        users = self.db.child("user").get()
-        target_key = None
-
-        # 구현: 사용자 스냅샷을 순회하여 노드 키를 찾아 pw/email/phone을 업데이트
+        # 구현: 존재하는 사용자일 때만 user/<user_id>의 pw/email/phone을 업데이트
+        update_data = {
+            "pw": pw_hash,
+            "email": email,
+            "phone": phone
+        }
         try:
-            for user in users.each() or []:
-                if (user.val() or {}).get('id') == user_id:
-                    target_key = user.key()
-                    break
-        except Exception:
-            logger.exception("update_user_info: failed to iterate users")
-
-        if target_key:
-            update_data = {
-                "pw": pw_hash,
-                "email": email,
-                "phone": phone
-            }
-            try:
-                self.db.child("user").child(target_key).update(update_data)
-                return True
-            except Exception:
-                logger.exception("Failed to update user info for %s", user_id)
+            if not self._user_exists(user_id):
                 return False
-        return False
+            key = _safe_key(user_id)
+            self._update({f"user/{key}/{field}": value for field, value in update_data.items()})
+            return True
+        except Exception:
+            logger.exception("Failed to update user info for %s", user_id)
+            return False
         
     # ==========================================================
     # 3. 상품 정보 관리 (Item Management)
@@ -229,6 +685,9 @@ class DBhandler:
         if not self.db:
             logger.error("get_items called but DB is not initialized")
             return None
+        # 구현: 스트림 미러가 준비되어 있으면 로컬 스냅샷 반환
+        if self.replica_ready("item"):
+            return self._mirror("item")
         # 구현: 'item' 노드의 전체 스냅샷을 반환
         try:
             items = self.db.child("item").get().val()
@@ -245,24 +704,91 @@ class DBhandler:
         if not self.db:
             logger.error("get_item_byname called but DB is not initialized")
             return None
-        items = self.db.child("item").get()
+        if self.replica_ready("item"):
+            return self._mirror("item", name)
 
-        if not items or not items.val():
+        if not name:
             return None
-
-        # 구현: item 스냅샷을 순회하며 키 비교로 대상 아이템 반환
+        # 구현: item/<name> 단건 조회 (ETag 재검증 캐시 사용, 같은 요청 안에서는 한 번만)
+        path = f"item/{name}"
         try:
-            for res in items.each() or []:
-                key_value = res.key()
-                if key_value == name:
-                    return res.val()
+            return self._get(path, lambda: self._get_revalidated(path))
         except Exception:
-            logger.exception("get_item_byname iteration failed for %s", name)
-        return None
+            logger.exception("get_item_byname failed for %s", name)
+            return None
 
-    def insert_item(self, name, data, img_path, author_id, trade_method, created_at):
+    def get_items_by_keys(self, keys):
+        """
+        주어진 상품 키들에 대해서만 item/<key>를 단건 조회합니다.
+        :param keys: (list) 상품 이름(key) 목록
+        :return: (dict) 상품 이름 -> 상품 데이터 (존재하는 상품만, 입력 순서 유지)
+        """
+        items = {}
+        # 구현: DB 연결 확인
+        if not self.db:
+            logger.error("get_items_by_keys called but DB is not initialized")
+            return items
+        if self.replica_ready("item"):
+            for key in dict.fromkeys(keys or []):
+                val = self._mirror("item", key)
+                if isinstance(val, dict):
+                    items[key] = val
+            return items
+        # 구현: 키마다 item/<key> 단건 조회를 동시에 실행 (삭제된 상품은 제외)
+        def fetch(key):
+            try:
+                return self.db.child("item").child(key).get().val()
+            except Exception:
+                logger.exception("get_items_by_keys failed for %s", key)
+                return None
+
+        unique_keys = list(dict.fromkeys(keys or []))
+        for key, val in zip(unique_keys, fan_map(fetch, unique_keys)):
+            if isinstance(val, dict):
+                items[key] = val
+        return items
+
+    def get_item_summaries(self, keys):
+        """
+        주어진 상품 키들의 목록용 요약(item_summary/<key>)을 조회합니다. (상세 설명 등은 포함하지 않음)
+        요약이 아직 없는 상품(item-summary 백필 전)은 item/<key>를 읽어 같은 형태로 만듭니다.
+        :param keys: (list) 상품 이름(key) 목록
+        :return: (dict) 상품 이름 -> 요약 데이터 (존재하는 상품만, 입력 순서 유지)
+        """
+        summaries = {}
+        # 구현: DB 연결 확인
+        if not self.db:
+            logger.error("get_item_summaries called but DB is not initialized")
+            return summaries
+        unique_keys = list(dict.fromkeys(k for k in keys or [] if k))
+        if self.replica_ready("item_summary"):
+            values = [self._mirror("item_summary", key) for key in unique_keys]
+        elif self.replica_ready("item"):
+            values = [_item_summary(item) if isinstance(item, dict) else None
+                      for item in (self.replica.get("item", key) for key in unique_keys)]
+        else:
+            # 구현: 키마다 item_summary/<key> 단건 조회를 동시에 실행
+            def fetch(key):
+                try:
+                    return self.db.child("item_summary").child(key).get().val()
+                except Exception:
+                    logger.exception("get_item_summaries failed for %s", key)
+                    return None
+            values = fan_map(fetch, unique_keys)
+
+        missing = [key for key, val in zip(unique_keys, values) if not isinstance(val, dict)]
+        fallback = self.get_items_by_keys(missing) if missing else {}
+        for key, val in zip(unique_keys, values):
+            if isinstance(val, dict):
+                summaries[key] = val
+            elif key in fallback:
+                summaries[key] = _item_summary(fallback[key])
+        return summaries
+
+    def insert_item(self, name, data, img_path, author_id, trade_method, created_at, thumb_path=None):
         """
         신규 상품 정보를 DB의 'item' 노드에 삽입
+        :param thumb_path: (str) 목록 화면용 썸네일 경로 (선택, 없으면 목록에서 원본 이미지 사용)
         """
         # 구현: 전달받은 필드로 item_info 구성
         item_info = {
@@ -277,61 +803,278 @@ class DBhandler:
             "trade_method": data.get("trade_method"),
             "created_at": created_at
         }
-        # 구현: item/<name>에 set하여 저장 (기존 키 덮어쓰기)
+        if thumb_path:
+            item_info["thumb_path"] = thumb_path
+        item_info.update(_item_sort_fields(name, item_info))
+        # 구현: item/<name>에 저장 (기존 키 덮어쓰기), 카테고리별 카운터와 목록용 projection도 같은 update로 반영
         if not self.db:
             logger.error("insert_item called but DB is not initialized")
             return False
         try:
-            self.db.child("item").child(name).set(item_info)
+            existing = self.db.child("item").child(name).get().val()
+            updates = {f"item/{name}": item_info}
+            updates.update(self._item_index_updates(name, existing if isinstance(existing, dict) else None, name, item_info))
+            self._update(updates)
             logger.info("Firebase Save Success: %s", item_info)
             return True
         except Exception:
             logger.exception("insert_item failed for %s", name)
             return False
 
+    def _item_index_updates(self, old_key, before, new_key, after):
+        """
+        상품 저장/삭제 전후 값을 비교하여 파생 데이터의 다중 경로 업데이트를 구성합니다.
+        - item_counts: 카테고리별/전체 상품 수 (서버 측 increment)
+        - items_by_author/<author>/<key>: 판매 상품 인덱스 (값: 상품 상태)
+        - items_by_buyer/<buyer>/<key>: 구매 상품 인덱스
+        - item_summary/<key>: 목록 화면용 projection
+        :param old_key: (str) 변경 전 상품 키
+        :param before: (dict) 변경 전 상품 데이터 (신규면 None)
+        :param new_key: (str) 변경 후 상품 키
+        :param after: (dict) 변경 후 상품 데이터 (삭제면 None)
+        :return: (dict) 다중 경로 업데이트
+        """
+        deltas = {}
+        for item, sign in ((before, -1), (after, 1)):
+            if item is None:
+                continue
+            deltas[ITEM_COUNT_TOTAL] = deltas.get(ITEM_COUNT_TOTAL, 0) + sign
+            if item.get("category"):
+                key = _safe_key(item["category"])
+                deltas[key] = deltas.get(key, 0) + sign
+        updates = {f"item_counts/{k}": {".sv": {"increment": n}} for k, n in deltas.items() if n}
+
+        # 구현: 변경 전 인덱스 항목을 지우고 변경 후 항목을 기록 (같은 경로면 나중 값이 남음)
+        if before is not None:
+            updates[f"item_summary/{old_key}"] = None
+            if before.get("author"):
+                updates[f"items_by_author/{before['author']}/{old_key}"] = None
+            if before.get("buyer"):
+                updates[f"items_by_buyer/{before['buyer']}/{old_key}"] = None
+        if after is not None:
+            updates[f"item_summary/{new_key}"] = _item_summary(after)
+            if after.get("author"):
+                updates[f"items_by_author/{after['author']}/{new_key}"] = after.get("status") or ""
+            if after.get("buyer"):
+                updates[f"items_by_buyer/{after['buyer']}/{new_key}"] = True
+        return updates
+
+    def _item_references(self, item_key, **extra):
+        """
+        상품 키를 참조하는 파생 데이터(찜, 찜 수, 리뷰)를 동시에 조회합니다. (키 변경/삭제 시 함께 옮기거나 지우기 위함)
+        :param item_key: (str) 상품 키
+        :param extra: 같은 fan-out으로 함께 실행할 인수 없는 조회 (예: item=lambda: ...)
+        :return: (dict) likers(찜한 사용자 ID 목록), like_count, reviews({리뷰 키: 리뷰}) 및 extra의 결과
+        """
+        def likers():
+            return self.get_child_keys(f"likes/{item_key}")
+
+        def reviews():
+            # 구현: 리뷰 키는 '<상품 키>_<작성자>'이므로 키 접두사 범위로 조회 후 item_name으로 확인
+            if self.replica_ready("review"):
+                rows = self.replica.get("review") or {}
+            else:
+                rows = self.db.child("review").order_by_key().start_at(f"{item_key}_").end_at(f"{item_key}_\uf8ff").get().val()
+            return {k: dict(v) for k, v in (rows or {}).items() if isinstance(v, dict) and v.get("item_name") == item_key}
+
+        return gather(likers=likers,
+                      like_count=lambda: self._get(f"like_count/{item_key}"),
+                      reviews=reviews,
+                      **extra)
+
+    def _rename_reference_updates(self, old_key, new_key):
+        """
+        상품 키 변경 시 찜(likes, user_likes, like_count)과 리뷰(review, reviews_by_writer)를
+        새 키로 옮기는 다중 경로 업데이트를 구성합니다. (리뷰 키는 '<상품 키>_<작성자>'이므로 리뷰도 새 키로 이동)
+        """
+        refs = self._item_references(old_key)
+        updates = self._move_likes_updates(old_key, new_key, refs["likers"])
+        for review_key, review in refs["reviews"].items():
+            writer_id = review.get("writer_id") or review_key[len(old_key) + 1:]
+            new_review_key = f"{new_key}_{writer_id}"
+            review["item_name"] = new_key
+            review.update(_review_sort_fields(new_review_key, review))
+            updates[f"review/{review_key}"] = None
+            updates[f"review/{new_review_key}"] = review
+            updates[f"reviews_by_writer/{writer_id}/{old_key}"] = None
+            updates[f"reviews_by_writer/{writer_id}/{new_key}"] = True
+        return updates
+
+    def _move_likes_updates(self, old_key, new_key, likers):
+        """
+        찜한 사용자 likers의 찜을 old_key에서 new_key로 옮기는 다중 경로 업데이트를 구성합니다.
+        likes/<old_key> 노드 전체가 아니라 사용자별 경로만 지우므로, 조회 이후 추가된 찜은 남아 다음 이동에서 옮겨집니다.
+        찜 수는 새 키에 옮긴 수만큼 increment합니다. (새 키는 비어 있는 키만 허용되므로 결과는 찜한 사용자 수와 같음)
+        """
+        updates = {f"like_count/{old_key}": None}
+        for user_id in likers:
+            updates[f"likes/{old_key}/{user_id}"] = None
+            updates[f"likes/{new_key}/{user_id}"] = True
+            updates[f"user_likes/{user_id}/{old_key}"] = None
+            updates[f"user_likes/{user_id}/{new_key}"] = True
+        if likers:
+            updates[f"like_count/{new_key}"] = {".sv": {"increment": len(likers)}}
+        return updates
+
+    def _apply_derived_updates(self, item_key, updates, changed=()):
+        """
+        조건부 쓰기로 상품 노드를 바꾼 뒤 파생 데이터(카운터, 인덱스, projection, 찜/리뷰 이동)를 한 번의 update로 반영합니다.
+        Firebase의 조건부 쓰기는 단일 경로 PUT/DELETE만 받으므로 상품 노드와 같은 요청에 묶을 수 없습니다.
+        상품 쓰기는 이미 확정되었으므로 실패해도 예외를 올리지 않고, 복구 방법과 함께 error로 기록합니다.
+        (increment가 섞여 있어 응답을 받지 못한 update를 다시 보내면 두 번 반영될 수 있으므로 재시도하지 않음)
+        :return: (bool) 반영 여부
+        """
+        try:
+            self._update(updates, changed=changed)
+            return True
+        except Exception:
+            logger.error("Derived data for item %s is out of sync with item/%s; repair with "
+                         "'python backend/migrate.py item-index item-summary owner-index like-counts user-likes "
+                         "review-index'", item_key, item_key, exc_info=True)
+            return False
+
+    def get_item_count(self, category=None):
+        """
+        카테고리별(또는 전체) 상품 수를 유지 중인 카운터에서 조회합니다.
+        :param category: (str) 카테고리 이름 (None이면 전체)
+        :return: (int) 상품 수
+        """
+        # 구현: DB 연결 확인
+        if not self.db:
+            logger.error("get_item_count called but DB is not initialized")
+            return 0
+        # 구현: item_counts/<category> 단건 조회
+        key = _safe_key(category) if category else ITEM_COUNT_TOTAL
+        try:
+            count = self._get(f"item_counts/{key}")
+            if count is None and not category:
+                # 구현: 전체 카운터가 아직 없으면(item-index 마이그레이션 전) 상품 키만 shallow 조회하여 계산
+                return self.count_children("item")
+            return _as_count(count)
+        except Exception:
+            logger.exception("get_item_count failed for %s", category)
+            return 0
+
+    def _query_page(self, node, field, cursor=None, direction="next", per_page=4, lower=None, upper=None):
+        """
+        node 아래 항목을 field 값 내림차순(최신/높은 순)으로 한 페이지만 서버 측 쿼리로 조회합니다.
+        field는 항목마다 고유한 정렬 키여야 하며, 다음/이전 페이지는 경계 항목의 field 값(cursor)으로 이어집니다.
+        :param node: (str) 조회할 노드 이름 (예: 'item', 'review')
+        :param field: (str) orderByChild 기준 필드 (.indexOn 필요)
+        :param cursor: (str) 기준 항목의 정렬 키 (None이면 첫 페이지)
+        :param direction: (str) 'next'면 cursor보다 작은 항목, 'prev'면 큰 항목
+        :param per_page: (int) 페이지당 항목 수
+        :param lower: (str) field 값의 하한 (접두 구간 필터용)
+        :param upper: (str) field 값의 상한 (접두 구간 필터용)
+        :return: (dict) items(내림차순 (key, 데이터) 목록), next_cursor, prev_cursor
+        """
+        try:
+            res = _page_query(self.db, node, field, cursor, direction, per_page, lower, upper).get()
+            rows = res.val() if res else None
+        except Exception:
+            logger.exception("_query_page failed for %s / %s / %s", node, field, cursor)
+            return {"items": [], "next_cursor": None, "prev_cursor": None}
+        return _page_from_rows(rows, field, cursor, direction, per_page)
+
+    def get_items_page(self, category=None, cursor=None, direction="next", per_page=4):
+        """
+        등록 최신순으로 상품 한 페이지를 서버 측 쿼리(orderByChild + 범위 + limit)로 조회합니다.
+        :param category: (str) 카테고리 이름 (None이면 전체)
+        :param cursor: (str) 기준 항목의 정렬 키 (None이면 첫 페이지)
+        :param direction: (str) 'next'면 cursor보다 오래된 항목, 'prev'면 더 최근 항목
+        :param per_page: (int) 페이지당 항목 수
+        :return: (dict) items(최신순 (key, 목록용 요약 데이터) 목록), next_cursor, prev_cursor
+        """
+        # 구현: DB 연결 확인
+        if not self.db:
+            logger.error("get_items_page called but DB is not initialized")
+            return {"items": [], "next_cursor": None, "prev_cursor": None}
+
+        # 구현: 목록용 projection(item_summary)에서 카테고리가 있으면 category_key의 접두 구간,
+        #       없으면 created_key 전체를 정렬 기준으로 사용
+        if category:
+            return self._query_page("item_summary", "category_key", cursor, direction, per_page,
+                                    lower=f"{category}|", upper=f"{category}|\uf8ff")
+        return self._query_page("item_summary", "created_key", cursor, direction, per_page)
+
+    def get_items_by_author(self, user_id):
+        """
+        사용자가 등록한 상품의 키와 상태를 판매 인덱스에서 조회합니다.
+        :param user_id: (str) 사용자 ID
+        :return: (dict) 상품 이름 -> 상품 상태 (키 순서 정렬)
+        """
+        # 구현: DB 연결 확인
+        if not self.db:
+            logger.error("get_items_by_author called but DB is not initialized")
+            return {}
+        # 구현: items_by_author/<user_id> 단건 조회
+        try:
+            index = self.db.child("items_by_author").child(user_id).get().val()
+            if not isinstance(index, dict):
+                return {}
+            return {k: index[k] for k in sorted(index, key=_firebase_key_order)}
+        except Exception:
+            logger.exception("get_items_by_author failed for %s", user_id)
+            return {}
+
+    def get_items_by_buyer(self, user_id):
+        """
+        사용자가 구매한 상품 키 목록을 구매 인덱스에서 조회합니다.
+        :param user_id: (str) 사용자 ID
+        :return: (list) 상품 이름 목록 (키 순서 정렬)
+        """
+        # 구현: DB 연결 확인
+        if not self.db:
+            logger.error("get_items_by_buyer called but DB is not initialized")
+            return []
+        # 구현: items_by_buyer/<user_id>를 shallow 조회하여 키만 반환
+        return self.get_child_keys(f"items_by_buyer/{user_id}")
+
     def purchase_item(self, name, buyer_id):
         """
         상품 구매 처리: 구매자 ID 등록 및 상태를 '거래 완료'로 변경
+        상품 노드를 ETag 조건부 쓰기로 바꾸므로 동시에 여러 구매자가 요청해도 한 명만 성공합니다.
+        (ETag가 바뀌었으면 서버가 돌려준 최신 값으로 다시 검사)
         """        
         # 구현: DB 연결 확인 및 상품 존재 여부 확인
         if not self.db:
             logger.error("purchase_item called but DB is not initialized")
             return False, "DB 초기화 실패"
+        path = f"item/{name}"
         try:
-            current = self.db.child("item").child(name).get().val()
-            if not current:
-                return False, "상품을 찾을 수 없습니다."
-
-            # 구현: 중복 구매(이미 거래 완료 또는 buyer 존재) 여부 검사
-            if str(current.get('status', '')).strip() == '거래 완료' or current.get('buyer'):
-                return False, "이미 거래 완료된 상품입니다."
-
-            # 구현: 구매자 ID와 상태 업데이트
-            update_data = {
-                "buyer": buyer_id,
-                "status": "거래 완료"
-            }
-            self.db.child("item").child(name).update(update_data)
-            return True, "구매가 완료되었습니다."
+            etag, current = self._get_with_etag(path)
+            for _ in range(PURCHASE_RETRIES):
+                if not isinstance(current, dict):
+                    return False, "상품을 찾을 수 없습니다."
+                if current.get('author') == buyer_id:
+                    return False, "자신이 등록한 상품은 구매할 수 없습니다."
+                # 구현: 중복 구매(이미 거래 완료 또는 buyer 존재) 여부 검사
+                if str(current.get('status', '')).strip() == '거래 완료' or current.get('buyer'):
+                    return False, "이미 거래 완료된 상품입니다."
+                sold = dict(current, buyer=buyer_id, status="거래 완료")
+                ok, etag, latest = self._set_if_match(path, sold, etag)
+                if ok:
+                    break
+                current = latest
+            else:
+                return False, "다른 요청과 충돌하여 구매하지 못했습니다. 다시 시도해 주세요."
         except Exception:
             logger.exception("purchase_item failed for %s", name)
             return False, "구매 처리에 실패했습니다."
+
+        # 구현: 판매/구매 인덱스는 구매가 확정된 뒤 한 번의 update로 반영 (실패해도 구매는 유효, error 기록 후 마이그레이션으로 복구)
+        self._apply_derived_updates(name, self._item_index_updates(name, current, name, sold), changed=[path])
+        return True, "구매가 완료되었습니다."
         
-    def update_item(self, original_key, new_data, img_path, author_id, new_key=None):
+    def _edited_item(self, existing_data, new_data, img_path, author_id, target_key, thumb_path=None):
         """
-        기존 상품 정보 업데이트
+        수정 폼 값과 현재 상품 값을 합쳐 저장할 상품 레코드를 만듭니다.
+        구매 이력(buyer)은 수정 폼에 없으므로 현재 값을 유지하고, 구매가 확정된 상품은 폼의 상태로 되돌리지 않습니다.
         """
-        # 구현: 기존 데이터 로드 (원본 키에서 읽기)
-        existing_data = None
-        if self.db:
-            try:
-                existing_data = self.db.child("item").child(original_key).get().val()
-            except Exception:
-                logger.exception("update_item: failed to read existing item %s", original_key)
-
+        existing_data = existing_data or {}
         # 구현: 전달된 필드와 이미지 경로 병합하여 item_info 구성
-        final_img_path = img_path if img_path else (existing_data.get("img_path", "") if existing_data else "")
-        existing_created_at = existing_data.get("created_at") if existing_data and existing_data.get("created_at") else datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        final_img_path = img_path if img_path else existing_data.get("img_path", "")
+        existing_created_at = existing_data.get("created_at") or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         item_info = {
             "title": new_data.get("title"),
@@ -345,25 +1088,100 @@ class DBhandler:
             "trade_method": new_data.get("trade_method"),
             "created_at": existing_created_at
         }
-        
-        # 구현: 키 변경 시 remove 후 set, 아니면 set으로 덮어쓰기
+        if existing_data.get("buyer"):
+            item_info["buyer"] = existing_data["buyer"]
+            item_info["status"] = existing_data.get("status") or "거래 완료"
+        # 구현: 새 이미지면 새 썸네일을, 아니면 기존 썸네일을 유지
+        final_thumb_path = thumb_path if img_path else existing_data.get("thumb_path")
+        if final_thumb_path:
+            item_info["thumb_path"] = final_thumb_path
+        item_info.update(_item_sort_fields(target_key, item_info))
+        return item_info
+
+    def update_item(self, original_key, new_data, img_path, author_id, new_key=None, thumb_path=None):
+        """
+        기존 상품 정보 업데이트
+        상품 노드를 ETag 조건부 쓰기로 바꾸므로, 수정 도중 구매가 끼어들면 서버가 돌려준 최신 값(구매자, 거래 완료)으로
+        다시 구성해 구매를 덮어쓰지 않습니다. 키를 바꿀 때 새 키에 이미 상품이 있으면 덮어쓰지 않고 실패합니다.
+        :param thumb_path: (str) 새 이미지의 썸네일 경로 (선택, 이미지를 바꾸지 않으면 기존 썸네일 유지)
+        :return: (bool) 성공 여부
+        """
         if not self.db:
             logger.error("update_item called but DB is not initialized")
             return False
-
+        target_key = new_key if new_key else original_key
+        path, target = f"item/{original_key}", f"item/{target_key}"
+        renamed = target_key != original_key
+        created = False
         try:
-            if new_key and new_key != original_key:
-                self.db.child("item").child(original_key).remove()
-                self.db.child("item").child(new_key).set(item_info)
-                logger.info("Firebase Item Updated (Key Change: %s -> %s)", original_key, new_key)
+            etag, existing_data = self._get_with_etag(path)
+            for _ in range(EDIT_RETRIES):
+                if not isinstance(existing_data, dict):
+                    logger.warning("update_item: item %s not found", original_key)
+                    break
+                item_info = self._edited_item(existing_data, new_data, img_path, author_id, target_key, thumb_path)
+                if not renamed:
+                    ok, etag, latest = self._set_if_match(path, item_info, etag)
+                else:
+                    # 구현: 새 키는 비어 있을 때만 생성(null ETag 조건)하고, 기존 키는 읽은 ETag 조건으로 삭제
+                    #       (생성 후 삭제 순서라 중간에 실패해도 상품이 사라지지 않음, 삭제가 충돌하면 새 키 값을 최신으로 다시 씀)
+                    if not created:
+                        new_etag, occupied = self._get_with_etag(target)
+                        if occupied is not None or not self._set_if_match(target, item_info, new_etag)[0]:
+                            logger.warning("update_item: refusing to rename %s onto existing item %s",
+                                           original_key, target_key)
+                            return False
+                        created = True
+                    else:
+                        self._update({target: item_info})
+                    ok, etag, latest = self._set_if_match(path, None, etag)
+                if ok:
+                    break
+                existing_data = latest
             else:
-                self.db.child("item").child(original_key).set(item_info)
-                logger.info("Firebase Item Updated (Key Maintained: %s)", original_key)
-            return True
+                logger.warning("update_item: item %s kept changing during the edit", original_key)
+                existing_data = None
+            if not isinstance(existing_data, dict):
+                if created:
+                    self._update({target: None})
+                return False
         except Exception:
             logger.exception("update_item failed for %s", original_key)
+            if created:
+                try:
+                    self._update({target: None})
+                except Exception:
+                    logger.exception("update_item: failed to roll back %s", target)
             return False
-    
+
+        # 구현: 상품 노드가 확정된 뒤 찜/리뷰 이동과 카운터/인덱스를 한 번의 update로 반영
+        updates = self._rename_reference_updates(original_key, target_key) if renamed else {}
+        updates.update(self._item_index_updates(original_key, existing_data, target_key, item_info))
+        self._apply_derived_updates(original_key, updates, changed=[path, target] if renamed else [path])
+        if renamed:
+            self._move_late_likes(original_key, target_key)
+            logger.info("Firebase Item Updated (Key Change: %s -> %s)", original_key, new_key)
+        else:
+            logger.info("Firebase Item Updated (Key Maintained: %s)", original_key)
+        return True
+
+    def _move_late_likes(self, old_key, new_key):
+        """
+        키 변경의 찜 조회 이후 기존 키로 추가된 찜을 새 키로 옮깁니다. (기존 키에 찜이 남지 않을 때까지 반복)
+        """
+        for _ in range(RENAME_LIKE_PASSES):
+            # 구현: 미러는 늦을 수 있어 이미 옮긴 찜을 다시 세지 않도록 서버를 직접 shallow 조회
+            try:
+                late = _key_list(self.db.child(f"likes/{old_key}").shallow().get().val())
+            except Exception:
+                logger.exception("update_item: failed to check late likes on %s", old_key)
+                return
+            if not late:
+                return
+            self._apply_derived_updates(old_key, self._move_likes_updates(old_key, new_key, late))
+        logger.error("Likes on renamed item %s are still arriving; repair with "
+                     "'python backend/migrate.py like-counts user-likes'", old_key)
+
     def delete_item(self, item_name):
         """
         특정 상품 정보를 DB에서 삭제하고 연관된 좋아요 정보도 삭제
@@ -372,10 +1190,24 @@ class DBhandler:
         if not self.db:
             logger.error("delete_item called but DB is not initialized")
             return False
-        # 구현: item/<item_name> 및 likes/<item_name> 노드 제거
+        # 구현: 상품과 참조(찜, 리뷰)를 동시에 조회해 카운터/역인덱스(user_likes, reviews_by_writer)까지 한 번의 update로 제거
+        #       (리뷰 본문은 작성자의 거래 기록이므로 남기고, 이 상품 키로 찾는 인덱스만 지움)
         try:
-            self.db.child("item").child(item_name).remove()
-            self.db.child("likes").child(item_name).remove()
+            refs = self._item_references(item_name, item=lambda: self._get(f"item/{item_name}"))
+            existing = refs["item"]
+            updates = {
+                f"item/{item_name}": None,
+                f"likes/{item_name}": None,
+                f"like_count/{item_name}": None,
+            }
+            for user_id in refs["likers"]:
+                updates[f"user_likes/{user_id}/{item_name}"] = None
+            for review in refs["reviews"].values():
+                if review.get("writer_id"):
+                    updates[f"reviews_by_writer/{review['writer_id']}/{item_name}"] = None
+            if isinstance(existing, dict):
+                updates.update(self._item_index_updates(item_name, existing, item_name, None))
+            self._update(updates)
             logger.info("Firebase Item %s deleted.", item_name)
             return True
         except Exception:
@@ -393,7 +1225,7 @@ class DBhandler:
         # 구현: review_key 생성 (item_name_writer_id)
         review_key = f"{item_name}_{writer_id}"
 
-        # 구현: 리뷰 정보 dict 구성 및 review/<review_key>에 set
+        # 구현: 리뷰 정보 dict 구성 (정렬용 숫자/복합 키 포함)
         review_info ={
             "title": data.get('reviewTitle'),
             "rate": data.get('rating'),
@@ -403,12 +1235,21 @@ class DBhandler:
             "writer_id": writer_id,
             "created_at": created_at
         }
+        review_info.update(_review_sort_fields(review_key, review_info))
 
         if not self.db:
             logger.error("reg_review called but DB is not initialized")
             return ""
+        # 구현: 리뷰 저장, 작성자별 리뷰 인덱스(reviews_by_writer), 신규 리뷰면 review_count까지 한 번의 update로 반영
         try:
-            self.db.child("review").child(review_key).set(review_info)
+            exists = self.db.child("reviews_by_writer").child(writer_id).child(item_name).get().val()
+            updates = {
+                f"review/{review_key}": review_info,
+                f"reviews_by_writer/{writer_id}/{item_name}": True,
+            }
+            if not exists:
+                updates["review_count"] = {".sv": {"increment": 1}}
+            self._update(updates)
             return review_key
         except Exception:
             logger.exception("reg_review failed for %s", review_key)
@@ -422,6 +1263,8 @@ class DBhandler:
         if not self.db:
             logger.error("get_reviews called but DB is not initialized")
             return None
+        if self.replica_ready("review"):
+            return self._mirror("review")
         # 구현: 'review' 노드 전체 스냅샷 반환
         try:
             reviews = self.db.child("review").get().val()
@@ -430,6 +1273,41 @@ class DBhandler:
             logger.exception("get_reviews failed")
             return None
     
+    def get_reviews_page(self, sort="latest", cursor=None, direction="next", per_page=4):
+        """
+        정렬 인덱스(latest_key / rating_key)를 이용해 리뷰 한 페이지만 서버 측 쿼리로 조회합니다.
+        :param sort: (str) 'latest'(최신순) 또는 'rating'(별점 높은 순, 동점은 최신순)
+        :param cursor: (str) 기준 리뷰의 정렬 키 (None이면 첫 페이지)
+        :param direction: (str) 'next' 또는 'prev'
+        :param per_page: (int) 페이지당 항목 수
+        :return: (dict) items((key, 데이터) 목록), next_cursor, prev_cursor
+        """
+        # 구현: DB 연결 확인
+        if not self.db:
+            logger.error("get_reviews_page called but DB is not initialized")
+            return {"items": [], "next_cursor": None, "prev_cursor": None}
+        field = "rating_key" if sort == "rating" else "latest_key"
+        return self._query_page("review", field, cursor, direction, per_page)
+
+    def get_review_count(self):
+        """
+        유지 중인 review_count 카운터에서 전체 리뷰 수를 조회합니다.
+        :return: (int) 리뷰 수
+        """
+        # 구현: DB 연결 확인
+        if not self.db:
+            logger.error("get_review_count called but DB is not initialized")
+            return 0
+        try:
+            count = self._get("review_count")
+            if count is None:
+                # 구현: 카운터가 아직 없으면(review-index 마이그레이션 전) 리뷰 키만 shallow 조회하여 계산
+                return self.count_children("review")
+            return _as_count(count)
+        except Exception:
+            logger.exception("get_review_count failed")
+            return 0
+    
     def get_review_by_key(self, review_key):
         """
         리뷰 키(review_key)로 직접 조회.
@@ -438,9 +1316,11 @@ class DBhandler:
         if not self.db:
             logger.error("get_review_by_key called but DB is not initialized")
             return None
+        if self.replica_ready("review"):
+            return self._mirror("review", review_key)
         # 구현: review/<review_key>로 직접 조회하여 반환
         try:
-            review_data = self.db.child("review").child(review_key).get().val()
+            review_data = self._get(f"review/{review_key}")
             return review_data
         except Exception:
             logger.exception("get_review_by_key failed for %s", review_key)
@@ -459,13 +1339,35 @@ class DBhandler:
             return False
         # 구현: review_key로 직접 조회하여 존재 여부 판단
         review_key = f"{item_name}_{user_id}"
+        if self.replica_ready("review"):
+            return self.replica.get("review", review_key) is not None
         try:
-            review_data = self.db.child("review").child(review_key).get().val()
+            review_data = self._get(f"review/{review_key}")
             return review_data is not None
         except Exception:
             logger.exception("check_review_exists failed for %s", review_key)
             return False
     
+    def check_reviews_exist(self, item_names, user_id):
+        """
+        여러 상품에 대해 사용자의 리뷰 작성 여부를 일괄 확인
+        :param item_names: (list) 상품 이름 목록
+        :param user_id: (str) 사용자 ID
+        :return: (dict) 상품 이름 -> 리뷰 존재 여부
+        """
+        statuses = {k: False for k in item_names or []}
+        # 구현: DB 연결 확인
+        if not self.db:
+            logger.error("check_reviews_exist called but DB is not initialized")
+            return statuses
+        # 구현: 작성자별 리뷰 인덱스 reviews_by_writer/<user_id>에서 요청한 키만 조회
+        try:
+            for item_name, exists in self._get_children_for_keys(f"reviews_by_writer/{user_id}", item_names).items():
+                statuses[item_name] = bool(exists)
+        except Exception:
+            logger.exception("check_reviews_exist failed for %s", user_id)
+        return statuses
+    
     # ==========================================================
     # 5. 찜 관리 (Wishlist Management)
     # ==========================================================
@@ -478,10 +1380,11 @@ class DBhandler:
         if not self.db:
             logger.error("get_like_status called but DB is not initialized")
             return False
+        if self.replica_ready("likes"):
+            return bool(self.replica.get("likes", item_name, user_id))
         # 구현: likes/<item_name>/<user_id> 노드 조회하여 상태 반환
         try:
-            res = self.db.child("likes").child(item_name).child(user_id).get()
-            return bool(res.val())
+            return bool(self._get(f"likes/{item_name}/{user_id}"))
         except Exception:
             logger.exception("get_like_status Error for %s / %s", item_name, user_id)
             return False
@@ -494,32 +1397,121 @@ class DBhandler:
         if not self.db:
             logger.error("get_like_count called but DB is not initialized")
             return 0
-        # 구현: likes/<item_name>의 child dict 길이로 좋아요 수 계산
+        # 구현: 스트림 미러가 준비되어 있으면 like_count 카운터, 없으면 likes/<item_name>의 자식 수로 계산
+        if self.replica_ready("like_count"):
+            return _as_count(self.replica.get("like_count", item_name))
+        if self.replica_ready("likes"):
+            return len(self.replica.get("likes", item_name) or {})
+        # 구현: 비정규화된 like_count/<item_name> 카운터 단건 조회
         try:
-            res = self.db.child("likes").child(item_name).get()
-            if not res or not res.val():
-                return 0
-            if isinstance(res.val(), dict):
-                return len(res.val())
-            return 0
+            return _as_count(self._get(f"like_count/{item_name}"))
         except Exception:
             logger.exception("get_like_count Error for %s", item_name)
             return 0
 
+    def _get_children_for_keys(self, node, item_keys):
+        """
+        node 아래에서 여러 키의 값을 키별 단건 조회로 동시에 가져옵니다.
+        (키의 최소~최대 범위 조회는 키가 흩어져 있으면 그 사이의 자식을 모두 받아 노드 크기에 비례해 커짐)
+        :param node: (str) 조회할 노드 경로 (예: 'like_count', 'reviews_by_writer/<id>')
+        :param item_keys: (list) 상품 이름(key) 목록
+        :return: (dict) 키 -> 값 (요청한 키 중 존재하는 것만 포함)
+        """
+        keys = list(dict.fromkeys(k for k in item_keys or [] if k))
+        values = fan_map(lambda key: self._get(f"{node}/{key}"), keys)
+        return {key: val for key, val in zip(keys, values) if val is not None}
+
+    def get_like_counts(self, item_keys):
+        """
+        여러 상품의 찜 개수를 동시에 조회해 반환합니다.
+        :param item_keys: (list) 상품 이름(key) 목록
+        :return: (dict) 상품 이름 -> 찜 개수 (찜이 없으면 0)
+        """
+        counts = {k: 0 for k in item_keys or []}
+        # 구현: DB 연결 확인
+        if not self.db:
+            logger.error("get_like_counts called but DB is not initialized")
+            return counts
+        if self.replica_ready("like_count"):
+            return {k: _as_count(self.replica.get("like_count", k)) for k in counts}
+        if self.replica_ready("likes"):
+            return {k: len(self.replica.get("likes", k) or {}) for k in counts}
+        # 구현: like_count 카운터를 키별로 조회하여 상품별 찜 개수 구성
+        try:
+            for item_name, count in self._get_children_for_keys("like_count", item_keys).items():
+                counts[item_name] = _as_count(count)
+        except Exception:
+            logger.exception("get_like_counts Error for %s", item_keys)
+        return counts
+
+    def get_like_statuses(self, item_keys, user_id):
+        """
+        여러 상품에 대해 특정 사용자의 찜 여부를 한 번의 요청으로 반환합니다.
+        :param item_keys: (list) 상품 이름(key) 목록
+        :param user_id: (str) 사용자 ID
+        :return: (dict) 상품 이름 -> 찜 여부
+        """
+        statuses = {k: False for k in item_keys or []}
+        # 구현: DB 연결 확인 (비로그인 사용자는 모두 False)
+        if not self.db:
+            logger.error("get_like_statuses called but DB is not initialized")
+            return statuses
+        if not user_id:
+            return statuses
+        if self.replica_ready("likes"):
+            return {k: bool(self.replica.get("likes", k, user_id)) for k in statuses}
+        # 구현: 요청 한 번으로 결정 - 상품 하나면 likes/<item_name>/<user_id> 단건 조회,
+        # 여러 개면 역인덱스 user_likes/<user_id>를 shallow 조회해 요청한 키와 교집합 (카탈로그 크기와 무관)
+        if len(statuses) == 1:
+            item_name = next(iter(statuses))
+            statuses[item_name] = self.get_like_status(item_name, user_id)
+            return statuses
+        for item_name in self.get_child_keys(f"user_likes/{user_id}"):
+            if item_name in statuses:
+                statuses[item_name] = True
+        return statuses
+
+    def _like_updates(self, item_name, user_id, liked):
+        """
+        찜 여부를 바꾸는 다중 경로 업데이트를 구성합니다.
+        찜 여부(likes), 사용자별 역인덱스(user_likes), like_count 카운터(서버 측 increment)가 하나의 요청으로
+        함께 반영되므로, 셋 중 일부만 기록된 상태가 남지 않습니다.
+        """
+        return {
+            f"likes/{item_name}/{user_id}": True if liked else None,
+            f"user_likes/{user_id}/{item_name}": True if liked else None,
+            f"like_count/{item_name}": {".sv": {"increment": 1 if liked else -1}},
+        }
+
+    def _write_like(self, item_name, user_id, decide):
+        """
+        서버의 현재 찜 여부를 읽어 원하는 값을 정하고, 바뀔 때만 찜 여부/역인덱스/카운터를 한 번의 다중 경로 update로 기록합니다.
+        다른 사용자의 동시 찜은 서버 측 increment로 모두 반영됩니다. 같은 사용자가 같은 상품에 보낸 요청(연속 클릭)은
+        프로세스 안에서 잠금으로 순서대로 처리합니다. 다른 워커에 동시에 도착한 요청은 둘 다 같은 값을 읽으면
+        카운터가 한 번 더 바뀔 수 있습니다. (migrate.py like-counts로 likes 기준 재계산)
+        :param decide: (callable) 현재 찜 여부 -> 원하는 찜 여부
+        :return: (bool) 최종 찜 여부 (기록에 실패하면 예외 - 이때는 아무 경로도 바뀌지 않음)
+        """
+        # 구현: 복제본은 늦을 수 있으므로 찜 여부는 서버에서 직접 읽음
+        path = f"likes/{item_name}/{user_id}"
+        with self._like_locks[hash(path) % LIKE_LOCK_STRIPES]:
+            current = bool(self._get(path))
+            liked = bool(decide(current))
+            if liked != current:
+                self._update(self._like_updates(item_name, user_id, liked), changed=[path])
+        return liked
+
     def set_like_status(self, item_name, user_id, liked):
         """
-        찜 상태를 설정하거나 제거합니다.
+        찜 상태를 설정하거나 제거합니다. (상태가 바뀔 때만 카운터 반영)
         """
         # 구현: DB 연결 확인
         if not self.db:
             logger.error("set_like_status called but DB is not initialized")
             return False
-        # 구현: liked=True면 set, False면 remove 수행
+        # 구현: 현재 상태와 같으면 쓰기 생략, 다르면 찜 여부/역인덱스/카운터를 한 번에 반영
         try:
-            if liked:
-                self.db.child("likes").child(item_name).child(user_id).set(True)
-            else:
-                self.db.child("likes").child(item_name).child(user_id).remove()
+            self._write_like(item_name, user_id, lambda current: bool(liked))
             return True
         except Exception:
             logger.exception("set_like_status Error for %s / %s", item_name, user_id)
@@ -529,33 +1521,340 @@ class DBhandler:
         """
         현재 찜 상태를 읽고 반대로 변경한 뒤 반환
         """
-        # 구현: 현재 상태를 읽고 반전한 뒤 set_like_status 호출
-        current = self.get_like_status(item_name, user_id)
-        new_status = not current
-        success = self.set_like_status(item_name, user_id, new_status)
-        return success, new_status
+        # 구현: DB 연결 확인
+        if not self.db:
+            logger.error("toggle_like called but DB is not initialized")
+            return False, False
+        # 구현: 서버의 현재 상태를 반전해 찜 여부/역인덱스/카운터를 한 번에 기록
+        try:
+            return True, self._write_like(item_name, user_id, lambda current: not current)
+        except Exception:
+            logger.exception("toggle_like Error for %s / %s", item_name, user_id)
+            return False, False
 
     def get_liked_items_by_user(self, user_id):
         """
         이 사용자가 찜을 누른 상품 이름 목록을 반환.
         """
-        liked_items = []
-        # 구현: 전체 likes 스냅샷을 가져와서
+        # 구현: 역인덱스 user_likes/<user_id>를 shallow 조회하여 상품 키 목록만 반환
+        return self.get_child_keys(f"user_likes/{user_id}")
+
+    # ==========================================================
+    # 6. 데이터 마이그레이션 (Migration)
+    # ==========================================================
+
+    def _apply_updates(self, updates, chunk_size=500):
+        """
+        다중 경로(multi-path) 업데이트를 chunk 단위로 나누어 루트에 적용합니다.
+        :param updates: (dict) "노드/키/필드" 형식 경로 -> 값 (None이면 삭제)
+        :param chunk_size: (int) 요청 하나에 담을 최대 경로 수
+        :return: (int) 적용된 경로 수
+        """
+        # 구현: 경로 목록을 chunk로 나누어 루트 update 요청
+        paths = list(updates.items())
+        for start in range(0, len(paths), chunk_size):
+            self._update(dict(paths[start:start + chunk_size]))
+        return len(paths)
+
+    def migrate_users_to_id_keys(self):
+        """
+        push 키로 저장된 기존 사용자 레코드를 user/<id> 형태로 옮깁니다. (1회성, 재실행 안전)
+        Firebase 키에 쓸 수 없는 문자가 있는 ID는 _safe_key로 인코딩한 키로 옮깁니다.
+        :return: (int) 이동한 사용자 수, 실패 시 -1
+        """
+        # 구현: DB 연결 확인
         if not self.db:
-             logger.error("get_liked_items_by_user called but DB is not initialized")
-             return liked_items
-             
-        # 구현: 각 아이템의 likes 자식에 user_id가 있는지 검사하여 리스트 반환
+            logger.error("migrate_users_to_id_keys called but DB is not initialized")
+            return -1
+
+        # 구현: user 노드 전체를 한 번만 읽어 id와 키가 다른 레코드를 수집
         try:
-            snapshot = self.db.child("likes").get()
-            if not snapshot or not snapshot.val():
-                return []
+            users = self.db.child("user").get().val() or {}
+        except Exception:
+            logger.exception("migrate_users_to_id_keys: failed to read users")
+            return -1
+
+        updates = {}
+        moved = 0
+        for key, val in users.items():
+            user_id = (val or {}).get('id') if isinstance(val, dict) else None
+            if not user_id:
+                continue
+            target = _safe_key(user_id)
+            if key == target:
+                continue
+            # 구현: 이미 user/<id>가 있으면 기존 push 레코드만 제거
+            if target not in users:
+                updates[f"user/{target}"] = val
+                moved += 1
+            updates[f"user/{key}"] = None
+
+        # 구현: 이동(set)과 삭제(remove)를 다중 경로 업데이트로 함께 적용
+        try:
+            self._apply_updates(updates)
+        except Exception:
+            logger.exception("migrate_users_to_id_keys: failed to apply updates")
+            return -1
+        logger.info("Migrated %d user records to id keys.", moved)
+        return moved
+
+    def backfill_user_public(self):
+        """
+        user 노드를 기준으로 공개 프로필 projection(user_public)을 다시 만듭니다. (재실행 안전)
+        :return: (int) 기록한 사용자 수, 실패 시 -1
+        """
+        # 구현: DB 연결 확인
+        if not self.db:
+            logger.error("backfill_user_public called but DB is not initialized")
+            return -1
+
+        # 구현: user 노드를 한 번 읽어 projection 노드 전체를 새로 구성
+        try:
+            users = self.db.child("user").get().val() or {}
+        except Exception:
+            logger.exception("backfill_user_public: failed to read users")
+            return -1
+
+        publics = {key: _user_public_fields(val) for key, val in users.items() if isinstance(val, dict)}
+        try:
+            self.db.child("user_public").set(publics)
+            if self.change_feed:
+                self.db.update(self._change_entry(["user_public"]))
+        except Exception:
+            logger.exception("backfill_user_public: failed to write projection")
+            return -1
+        logger.info("Backfilled public profiles for %d users.", len(publics))
+        return len(publics)
 
-            for item_node in snapshot.each() or []:
-                item_name = item_node.key()
-                item_likes = item_node.val()
-                if isinstance(item_likes, dict) and user_id in item_likes:
-                    liked_items.append(item_name)
+    def backfill_like_counts(self):
+        """
+        likes 노드를 기준으로 like_count/<item> 카운터를 다시 계산합니다. (재실행 안전)
+        :return: (int) 기록한 카운터 수, 실패 시 -1
+        """
+        # 구현: DB 연결 확인
+        if not self.db:
+            logger.error("backfill_like_counts called but DB is not initialized")
+            return -1
+
+        # 구현: likes와 기존 카운터를 한 번씩 읽어 실제 찜 수로 덮어쓰고, 찜이 없는 카운터는 제거
+        try:
+            likes = self.db.child("likes").get().val() or {}
+            existing = self.db.child("like_count").get().val() or {}
+        except Exception:
+            logger.exception("backfill_like_counts: failed to read likes")
+            return -1
+
+        updates = {f"like_count/{key}": None for key in existing if key not in likes}
+        for key, likers in likes.items():
+            updates[f"like_count/{key}"] = len(likers) if isinstance(likers, dict) else 0
+
+        try:
+            self._apply_updates(updates)
+        except Exception:
+            logger.exception("backfill_like_counts: failed to apply updates")
+            return -1
+        logger.info("Backfilled %d like counters.", len(likes))
+        return len(likes)
+
+    def backfill_user_likes(self):
+        """
+        likes 노드를 기준으로 역인덱스 user_likes/<user_id>/<item>을 다시 만듭니다. (재실행 안전)
+        :return: (int) 기록한 찜 수, 실패 시 -1
+        """
+        # 구현: DB 연결 확인
+        if not self.db:
+            logger.error("backfill_user_likes called but DB is not initialized")
+            return -1
+
+        # 구현: likes와 기존 역인덱스를 한 번씩 읽어 누락 항목은 추가, 남은 항목은 제거
+        try:
+            likes = self.db.child("likes").get().val() or {}
+            existing = self.db.child("user_likes").get().val() or {}
+        except Exception:
+            logger.exception("backfill_user_likes: failed to read likes")
+            return -1
+
+        updates = {}
+        for user_id, items in existing.items():
+            for item_name in (items or {}):
+                updates[f"user_likes/{user_id}/{item_name}"] = None
+        count = 0
+        for item_name, likers in likes.items():
+            for user_id in (likers if isinstance(likers, dict) else {}):
+                updates[f"user_likes/{user_id}/{item_name}"] = True
+                count += 1
+
+        try:
+            self._apply_updates(updates)
+        except Exception:
+            logger.exception("backfill_user_likes: failed to apply updates")
+            return -1
+        logger.info("Backfilled %d user like index entries.", count)
+        return count
+
+    def backfill_item_index(self):
+        """
+        기존 상품에 정렬 키(created_key, category_key)를 채우고 item_counts 카운터를 다시 계산합니다. (재실행 안전)
+        :return: (int) 처리한 상품 수, 실패 시 -1
+        """
+        # 구현: DB 연결 확인
+        if not self.db:
+            logger.error("backfill_item_index called but DB is not initialized")
+            return -1
+
+        # 구현: item 노드를 한 번 읽어 필드 단위 업데이트와 카운터 값을 구성
+        try:
+            items = self.db.child("item").get().val() or {}
+        except Exception:
+            logger.exception("backfill_item_index: failed to read items")
+            return -1
+
+        updates = {}
+        counts = {ITEM_COUNT_TOTAL: 0}
+        for key, item in items.items():
+            if not isinstance(item, dict):
+                continue
+            for field, value in _item_sort_fields(key, item).items():
+                if item.get(field) != value:
+                    updates[f"item/{key}/{field}"] = value
+            counts[ITEM_COUNT_TOTAL] += 1
+            if item.get("category"):
+                cat_key = _safe_key(item["category"])
+                counts[cat_key] = counts.get(cat_key, 0) + 1
+
+        try:
+            self._apply_updates(updates)
+            self.db.child("item_counts").set(counts)
+        except Exception:
+            logger.exception("backfill_item_index: failed to apply updates")
+            return -1
+        logger.info("Backfilled sort keys for %d items.", counts[ITEM_COUNT_TOTAL])
+        return counts[ITEM_COUNT_TOTAL]
+
+    def backfill_item_summary(self):
+        """
+        item 노드에서 목록용 projection(item_summary)을 다시 만듭니다. (정렬 키가 없는 상품도 계산해 채움, 재실행 안전)
+        :return: (int) 기록한 상품 수, 실패 시 -1
+        """
+        # 구현: DB 연결 확인
+        if not self.db:
+            logger.error("backfill_item_summary called but DB is not initialized")
+            return -1
+
+        try:
+            items = self.db.child("item").get().val() or {}
+        except Exception:
+            logger.exception("backfill_item_summary: failed to read items")
+            return -1
+
+        summaries = {}
+        for key, item in items.items():
+            if isinstance(item, dict):
+                summaries[key] = _item_summary(dict(item, **_item_sort_fields(key, item)))
+
+        # 구현: 노드 전체를 교체하여 삭제된 상품의 요약도 함께 정리
+        try:
+            self.db.child("item_summary").set(summaries or None)
+            if self.change_feed:
+                self.db.update(self._change_entry(["item_summary"]))
+        except Exception:
+            logger.exception("backfill_item_summary: failed to write summaries")
+            return -1
+        logger.info("Backfilled item summaries for %d items.", len(summaries))
+        return len(summaries)
+
+    def backfill_owner_index(self):
+        """
+        item 노드를 기준으로 판매/구매 인덱스(items_by_author, items_by_buyer)를 다시 만듭니다. (재실행 안전)
+        :return: (int) 처리한 상품 수, 실패 시 -1
+        """
+        # 구현: DB 연결 확인
+        if not self.db:
+            logger.error("backfill_owner_index called but DB is not initialized")
+            return -1
+
+        # 구현: item 노드를 한 번 읽어 두 인덱스 노드 전체를 새로 구성
+        try:
+            items = self.db.child("item").get().val() or {}
+        except Exception:
+            logger.exception("backfill_owner_index: failed to read items")
+            return -1
+
+        by_author, by_buyer = {}, {}
+        for key, item in items.items():
+            if not isinstance(item, dict):
+                continue
+            if item.get("author"):
+                by_author.setdefault(item["author"], {})[key] = item.get("status") or ""
+            if item.get("buyer"):
+                by_buyer.setdefault(item["buyer"], {})[key] = True
+
+        try:
+            self.db.child("items_by_author").set(by_author)
+            self.db.child("items_by_buyer").set(by_buyer)
+        except Exception:
+            logger.exception("backfill_owner_index: failed to write indexes")
+            return -1
+        logger.info("Backfilled owner indexes for %d items.", len(items))
+        return len(items)
+
+    def backfill_review_index(self):
+        """
+        review 노드를 기준으로 작성자별 리뷰 인덱스(reviews_by_writer), 정렬 키, review_count를 다시 만듭니다. (재실행 안전)
+        :return: (int) 처리한 리뷰 수, 실패 시 -1
+        """
+        # 구현: DB 연결 확인
+        if not self.db:
+            logger.error("backfill_review_index called but DB is not initialized")
+            return -1
+
+        # 구현: review 노드를 한 번 읽어 인덱스 노드, 정렬 필드, 카운터를 새로 구성
+        try:
+            reviews = self.db.child("review").get().val() or {}
+        except Exception:
+            logger.exception("backfill_review_index: failed to read reviews")
+            return -1
+
+        by_writer = {}
+        updates = {}
+        for key, review in reviews.items():
+            if not isinstance(review, dict):
+                continue
+            if review.get("writer_id") and review.get("item_name"):
+                by_writer.setdefault(review["writer_id"], {})[review["item_name"]] = True
+            for field, value in _review_sort_fields(key, review).items():
+                if review.get(field) != value:
+                    updates[f"review/{key}/{field}"] = value
+        updates["review_count"] = len(reviews)
+
+        try:
+            self._apply_updates(updates)
+            self.db.child("reviews_by_writer").set(by_writer)
+        except Exception:
+            logger.exception("backfill_review_index: failed to write index")
+            return -1
+        logger.info("Backfilled review index for %d reviews.", len(reviews))
+        return len(reviews)
+
+    def prune_changes(self, max_age_days=7):
+        """
+        보존 기간이 지난 변경 피드 항목(changes/<key>)을 삭제합니다.
+        (스냅샷이 이 기간보다 오래된 복제본은 변경분 대신 전체 노드를 다시 받습니다)
+        :param max_age_days: (float) 보존 일수
+        :return: (int) 삭제한 항목 수, 실패 시 -1
+        """
+        # 구현: DB 연결 확인
+        if not self.db:
+            logger.error("prune_changes called but DB is not initialized")
+            return -1
+
+        # 구현: 서버 시각(t) 인덱스로 기준 시각 이전 항목만 조회해 다중 경로 삭제
+        cutoff = int((datetime.now().timestamp() - max_age_days * 86400) * 1000)
+        try:
+            expired = self.db.child("changes").order_by_child("t").end_at(cutoff).get().val() or {}
+            self._apply_updates({f"changes/{key}": None for key in expired})
         except Exception:
-            logger.exception("get_liked_items_by_user Error for %s", user_id)
-        return liked_items
\ No newline at end of file
+            logger.exception("prune_changes failed")
+            return -1
+        logger.info("Pruned %d change feed entries.", len(expired))
+        return len(expired)
@@ -0,0 +1,93 @@
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from paths import _split
+
+# 모듈 요약: 경로별 값과 ETag를 보관해 다음 조회를 If-None-Match로 재검증하는 캐시입니다.
+# 값이 바뀌지 않았으면 서버는 본문 없는 304를 돌려주고 보관한 사본을 씁니다. (항상 재검증하므로 오래된 값을 주지 않음)
+# 없는 경로는 짧은 시간(negative_ttl) 동안 '없음'으로 기억해 같은 키를 반복 조회하지 않습니다.
+# 이 프로세스의 쓰기는 invalidate()로 관련 경로를 지우며, DBhandler와 AsyncDBhandler가 같은 인스턴스를 공유합니다.
+
+
+class ETagCache:
+    """
+    경로 -> (ETag, 값) LRU 캐시와 없는 경로의 짧은 negative 캐시. (스레드 안전)
+
+    Environment:
+      DB_ETAG_CACHE_SIZE: 보관할 최대 경로 수 (기본: 2048)
+      DB_NEGATIVE_TTL: 없는 경로를 기억할 초 (기본: 5, 0이면 기억하지 않음)
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, negative_ttl: Optional[float] = None):
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv("DB_ETAG_CACHE_SIZE", 2048))
+        self.negative_ttl = negative_ttl if negative_ttl is not None else float(os.getenv("DB_NEGATIVE_TTL", 5))
+        self._entries = OrderedDict()   # 경로 tuple -> (ETag, 값)
+        self._missing = {}              # 경로 tuple -> 만료 시각
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._stats = {"not_modified": 0, "fetched": 0, "negative_hits": 0}
+
+    def lookup(self, path: str) -> Tuple[int, bool, Optional[str], Any]:
+        """
+        보관 중인 값을 조회합니다.
+        :return: (tuple) (세대, '없음'으로 기억 중인지 여부, ETag, 값) - 보관하지 않은 경로는 ETag가 None
+        """
+        key = tuple(_split(path))
+        with self._lock:
+            expires = self._missing.get(key)
+            if expires is not None:
+                if expires > time.monotonic():
+                    self._stats["negative_hits"] += 1
+                    return self._generation, True, None, None
+                del self._missing[key]
+            entry = self._entries.get(key)
+            if entry is None:
+                return self._generation, False, None, None
+            self._entries.move_to_end(key)
+            return self._generation, False, entry[0], entry[1]
+
+    def not_modified(self, value: Any) -> Any:
+        """304 응답에 대해 보관한 값의 사본을 반환합니다."""
+        with self._lock:
+            self._stats["not_modified"] += 1
+        return copy.deepcopy(value)
+
+    def store(self, path: str, etag: Optional[str], value: Any, generation: int) -> None:
+        """
+        새로 받은 값을 보관합니다. 조회를 시작한 뒤(generation 이후) 이 프로세스에서 쓰기가 있었으면
+        응답이 그 쓰기보다 오래되었을 수 있으므로 보관하지 않습니다.
+        """
+        key = tuple(_split(path))
+        stored = copy.deepcopy(value)
+        with self._lock:
+            self._stats["fetched"] += 1
+            if generation != self._generation:
+                return
+            self._entries.pop(key, None)
+            if value is None:
+                if self.negative_ttl > 0:
+                    self._missing[key] = time.monotonic() + self.negative_ttl
+                return
+            self._missing.pop(key, None)
+            if etag:
+                self._entries[key] = (etag, stored)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+    def invalidate(self, paths: Iterable[str]) -> None:
+        """쓴 경로와 그 상위/하위 경로의 보관 값과 '없음' 기록을 지웁니다."""
+        with self._lock:
+            self._generation += 1
+            for path in paths:
+                parts = tuple(_split(path))
+                for table in (self._entries, self._missing):
+                    for key in [k for k in table if k[:len(parts)] == parts or parts[:len(k)] == k]:
+                        del table[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries), missing=len(self._missing))
@@ -0,0 +1,409 @@
+import argparse
+import bisect
+import copy
+import hashlib
+import json
+import logging
+import queue
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from query_engine import _AFTER, PUSH_CHARS, _etag, _key_order, _sort_key, _value_order, apply_query
+
+# 모듈 요약: Firebase Realtime Database REST API 중 pyrebase가 사용하는 부분을
+# 로컬에서 흉내 내는 HTTP 서버입니다. (개발/벤치마크 전용, 인증 없음)
+# 지원: GET/PUT/PATCH/POST/DELETE, orderBy/equalTo/startAt/endAt/limitTo*,
+#       shallow, ETag(X-Firebase-ETag, if-match, If-None-Match), 서버 값(.sv), SSE 스트림
+
+logger = logging.getLogger(__name__)
+
+
+def _split(path: str, decode: bool = True) -> List[str]:
+    """'/a/b/' 형태의 경로를 ['a', 'b']로 분해합니다. (URL 경로는 디코딩, 본문 키는 그대로)"""
+    if decode:
+        path = unquote(path)
+    return [p for p in path.strip("/").split("/") if p]
+
+
+class Tree:
+    """
+    JSON 트리 저장소. 모든 연산은 하나의 잠금 아래에서 수행되어
+    다중 경로 업데이트와 조건부 쓰기가 원자적으로 적용됩니다.
+    """
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        self.root: Dict[str, Any] = data or {}
+        self.lock = threading.RLock()
+        self.listeners: List[Tuple[List[str], "queue.Queue"]] = []
+        # (경로, orderBy) -> (정렬 키 목록, 자식 키 목록): 큰 노드의 정렬 쿼리를 매번 전체 정렬하지 않도록 쓰기 전까지 재사용
+        self._orders: Dict[Tuple[Tuple[str, ...], str], Tuple[List[Any], List[str]]] = {}
+
+    # -- 기본 경로 연산 --------------------------------------------------
+
+    def get(self, parts: List[str]) -> Any:
+        node: Any = self.root
+        for p in parts:
+            if not isinstance(node, dict) or p not in node:
+                return None
+            node = node[p]
+        return node
+
+    def _resolve_sv(self, parts: List[str], value: Any) -> Any:
+        """서버 값({'.sv': 'timestamp'} / {'.sv': {'increment': n}})을 실제 값으로 치환합니다."""
+        if isinstance(value, dict):
+            sv = value.get(".sv")
+            if sv == "timestamp":
+                return int(time.time() * 1000)
+            if isinstance(sv, dict) and "increment" in sv:
+                current = self.get(parts)
+                base = current if isinstance(current, (int, float)) and not isinstance(current, bool) else 0
+                return base + sv["increment"]
+            return {k: self._resolve_sv(parts + [k], v) for k, v in value.items()}
+        return value
+
+    def _prune(self, value: Any) -> Any:
+        """None 값과 빈 객체를 제거합니다. (Firebase는 빈 노드를 저장하지 않음)"""
+        if isinstance(value, dict):
+            out = {}
+            for k, v in value.items():
+                v = self._prune(v)
+                if v is not None:
+                    out[k] = v
+            return out or None
+        return value
+
+    def query(self, parts: List[str], params: Dict[str, str]) -> Any:
+        """
+        경로 값에 쿼리를 적용한 결과를 반환합니다. (잠금 안에서 호출, 결과는 트리와 값을 공유하므로 복사해서 사용)
+        정렬 쿼리는 경로/정렬 기준별 정렬 결과를 보관했다가 범위와 개수 제한만 이분 탐색으로 적용합니다.
+        """
+        value = self.get(parts)
+        order_by = params.get("orderBy")
+        if params.get("shallow") == "true" or order_by is None or not isinstance(value, dict):
+            return apply_query(value, params)
+        order_by = json.loads(order_by)
+        cached = self._orders.get((tuple(parts), order_by))
+        if cached is None:
+            ordered = sorted((_sort_key(order_by, k, v), k) for k, v in value.items())
+            cached = ([sk for sk, _ in ordered], [k for _, k in ordered])
+            self._orders[(tuple(parts), order_by)] = cached
+        sort_keys, keys = cached
+
+        def bound(raw):
+            b = json.loads(raw)
+            return _key_order(b) if order_by == "$key" else _value_order(b)
+
+        lo, hi = 0, len(keys)
+        if "equalTo" in params:
+            target = bound(params["equalTo"])
+            lo, hi = bisect.bisect_left(sort_keys, (target,)), bisect.bisect_left(sort_keys, (target, _AFTER))
+        if "startAt" in params:
+            lo = max(lo, bisect.bisect_left(sort_keys, (bound(params["startAt"]),)))
+        if "endAt" in params:
+            hi = min(hi, bisect.bisect_left(sort_keys, (bound(params["endAt"]), _AFTER)))
+        selected = keys[lo:hi] if lo < hi else []
+        if "limitToFirst" in params:
+            selected = selected[:int(params["limitToFirst"])]
+        if "limitToLast" in params:
+            n = int(params["limitToLast"])
+            selected = selected[-n:] if n else []
+        return {k: value[k] for k in selected}
+
+    def _set(self, parts: List[str], value: Any) -> None:
+        # 구현: 쓰는 경로의 상위/하위 경로에 보관한 정렬 결과는 버림
+        for path, order_by in [k for k in self._orders if tuple(parts[:len(k[0])]) == k[0] or k[0][:len(parts)] == tuple(parts)]:
+            del self._orders[(path, order_by)]
+        value = self._prune(copy.deepcopy(value))
+        if not parts:
+            self.root = value if isinstance(value, dict) else {}
+            return
+        node = self.root
+        trail = []
+        for p in parts[:-1]:
+            trail.append((node, p))
+            if not isinstance(node.get(p), dict):
+                if value is None:
+                    return
+                node[p] = {}
+            node = node[p]
+        if value is None:
+            node.pop(parts[-1], None)
+            # 구현: 비어버린 상위 노드 정리
+            for parent, key in reversed(trail):
+                if parent.get(key) == {}:
+                    parent.pop(key, None)
+                else:
+                    break
+        else:
+            node[parts[-1]] = value
+
+    # -- 공개 연산 (잠금 + 이벤트 발행) ------------------------------------
+
+    def put(self, parts: List[str], value: Any, if_match: Optional[str] = None) -> Tuple[bool, Any]:
+        with self.lock:
+            current = self.get(parts)
+            if if_match is not None and if_match != _etag(current):
+                return False, current
+            value = self._resolve_sv(parts, value)
+            self._set(parts, value)
+            self._notify("put", parts, self._prune(copy.deepcopy(value)))
+            return True, value
+
+    def patch(self, parts: List[str], value: Dict[str, Any]) -> Dict[str, Any]:
+        with self.lock:
+            resolved = {}
+            for rel, v in value.items():
+                sub = parts + _split(rel, decode=False)
+                resolved[rel] = self._resolve_sv(sub, v)
+            for rel, v in resolved.items():
+                self._set(parts + _split(rel, decode=False), v)
+            self._notify("patch", parts, resolved)
+            return resolved
+
+    def _notify(self, event: str, parts: List[str], data: Any) -> None:
+        for base, q in list(self.listeners):
+            if parts[:len(base)] == base:
+                rel = "/" + "/".join(parts[len(base):])
+                q.put((event, rel, data))
+            elif base[:len(parts)] != parts:
+                continue
+            elif event == "patch":
+                # 구현: 상위 경로의 다중 경로 patch는 구독 경로 아래에 닿는 항목만 경로별 put으로 전달
+                for rel, value in data.items():
+                    sub = parts + _split(rel, decode=False)
+                    if sub[:len(base)] == base:
+                        q.put(("put", "/" + "/".join(sub[len(base):]), copy.deepcopy(value)))
+                    elif base[:len(sub)] == sub:
+                        q.put(("put", "/", copy.deepcopy(self.get(base))))
+            else:
+                # 구현: 상위 경로가 통째로 바뀌면 구독 경로의 새 값을 put으로 전달
+                q.put(("put", "/", copy.deepcopy(self.get(base))))
+
+    def subscribe(self, parts: List[str], params: Optional[Dict[str, str]] = None) -> "queue.Queue":
+        """
+        경로의 변경 이벤트 큐를 등록합니다. 첫 이벤트는 현재 값 전체(put "/")입니다.
+        쿼리(params)가 있으면 첫 스냅샷에만 적용합니다. (이후 이벤트는 쿼리와 무관하게 모두 전달)
+        """
+        q: "queue.Queue" = queue.Queue()
+        with self.lock:
+            self.listeners.append((parts, q))
+            snapshot = copy.deepcopy(self.get(parts))
+            if params:
+                snapshot = apply_query(snapshot, params) or None
+            q.put(("put", "/", snapshot))
+        return q
+
+    def unsubscribe(self, q: "queue.Queue") -> None:
+        with self.lock:
+            self.listeners = [(b, x) for b, x in self.listeners if x is not q]
+
+
+class Stats:
+    """요청 수와 응답 바이트를 집계합니다. (벤치마크용)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.bytes_out = 0
+
+    def add(self, nbytes: int) -> None:
+        with self.lock:
+            self.requests += 1
+            self.bytes_out += nbytes
+
+    def reset(self) -> Dict[str, int]:
+        with self.lock:
+            snap = {"requests": self.requests, "bytes_out": self.bytes_out}
+            self.requests = 0
+            self.bytes_out = 0
+            return snap
+
+
+def make_handler(tree: Tree, stats: Stats, latency: float = 0.0):
+    """Tree를 서비스하는 요청 핸들러 클래스를 만듭니다. (latency: 응답마다 추가할 지연 초)"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            # 헤더와 본문을 따로 쓰므로 Nagle + delayed ACK로 keep-alive 응답이 40ms씩 지연되지 않게 함
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def log_message(self, fmt, *args):  # noqa: N802 - BaseHTTPRequestHandler API
+            logger.debug(fmt, *args)
+
+        def _parts(self) -> Tuple[List[str], Dict[str, str]]:
+            url = urlsplit(self.path)
+            path = url.path
+            if path.endswith(".json"):
+                path = path[:-5]
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            params.pop("auth", None)
+            return _split(path), params
+
+        def _body(self) -> Any:
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b"null"
+            return json.loads(raw.decode("utf-8") or "null")
+
+        def _send(self, code: int, payload: Any, etag: Optional[str] = None) -> None:
+            raw = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            stats.add(len(raw))
+            if latency:
+                time.sleep(latency)
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(raw)))
+            if etag is not None:
+                self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def do_GET(self):  # noqa: N802
+            parts, params = self._parts()
+            if "text/event-stream" in (self.headers.get("Accept") or ""):
+                return self._stream(parts, params)
+            # 구현: 쿼리를 먼저 적용해 결과만 복사 (큰 노드 전체를 매번 복사하지 않음)
+            try:
+                with tree.lock:
+                    value = copy.deepcopy(tree.query(parts, params))
+            except (ValueError, TypeError) as e:
+                return self._send(400, {"error": str(e)})
+            etag = _etag(value) if self.headers.get("X-Firebase-ETag") == "true" else None
+            # 구현: If-None-Match가 현재 ETag와 같으면 본문 없는 304로 응답
+            if_none_match = self.headers.get("If-None-Match")
+            if if_none_match is not None and not params and if_none_match == _etag(value):
+                stats.add(0)
+                if latency:
+                    time.sleep(latency)
+                self.send_response(304)
+                self.send_header("ETag", if_none_match)
+                self.end_headers()
+                return
+            self._send(200, value, etag)
+
+        def do_PUT(self):  # noqa: N802
+            parts, _ = self._parts()
+            ok, value = tree.put(parts, self._body(), self.headers.get("if-match"))
+            if not ok:
+                return self._send(412, value, _etag(value))
+            self._send(200, value)
+
+        def do_PATCH(self):  # noqa: N802
+            parts, _ = self._parts()
+            body = self._body()
+            if not isinstance(body, dict):
+                return self._send(400, {"error": "Invalid data; couldn't parse JSON object."})
+            self._send(200, tree.patch(parts, body))
+
+        def do_POST(self):  # noqa: N802
+            parts, _ = self._parts()
+            now = int(time.time() * 1000)
+            key = "".join(PUSH_CHARS[(now >> (6 * i)) % 64] for i in reversed(range(8)))
+            key += hashlib.md5(f"{now}{time.perf_counter_ns()}".encode()).hexdigest()[:12]
+            tree.put(parts + [key], self._body())
+            self._send(200, {"name": key})
+
+        def do_DELETE(self):  # noqa: N802
+            parts, _ = self._parts()
+            ok, value = tree.put(parts, None, self.headers.get("if-match"))
+            if not ok:
+                return self._send(412, value, _etag(value))
+            self._send(200, None)
+
+        def _stream(self, parts: List[str], params: Dict[str, str]) -> None:
+            q = tree.subscribe(parts, params)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            try:
+                while True:
+                    try:
+                        event, rel, data = q.get(timeout=30)
+                        msg = f"event: {event}\ndata: {json.dumps({'path': rel, 'data': data}, ensure_ascii=False)}\n\n"
+                    except queue.Empty:
+                        msg = "event: keep-alive\ndata: null\n\n"
+                    # 구현: Firebase와 같이 chunked 인코딩으로 이벤트마다 한 chunk씩 전송
+                    raw = msg.encode("utf-8")
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(raw), raw))
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError, OSError):
+                pass
+            finally:
+                tree.unsubscribe(q)
+                self.close_connection = True
+
+    return Handler
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    # 구현: 동시 연결이 몰리는 벤치마크에서 accept 대기열이 넘쳐 SYN 재전송(약 1초)이 생기지 않도록 늘림
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class StandinServer:
+    """
+    백그라운드 스레드에서 동작하는 Firebase REST 대역 서버.
+    :param data: (dict) 초기 데이터 트리
+    :param host: (str) 바인드 주소
+    :param port: (int) 포트 (0이면 임의 포트)
+    :param latency: (float) 응답마다 추가할 지연 초 (네트워크 왕복 흉내)
+    """
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0):
+        self.tree = Tree(data)
+        self.stats = Stats()
+        self.httpd = _HTTPServer((host, port), make_handler(self.tree, self.stats, latency))
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def config(self) -> Dict[str, str]:
+        """DBhandler/pyrebase에 전달할 설정 dict를 반환합니다."""
+        return {
+            "apiKey": "standin",
+            "authDomain": "standin.local",
+            "databaseURL": self.url,
+            "storageBucket": "standin.local",
+        }
+
+    def start(self) -> "StandinServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Firebase Realtime Database REST 로컬 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--data", default=None, help="초기 데이터 JSON 파일")
+    args = parser.parse_args()
+
+    data = None
+    if args.data:
+        with open(args.data, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    server = StandinServer(data, args.host, args.port)
+    print(f"Firebase stand-in listening on {server.url}")
+    server.httpd.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
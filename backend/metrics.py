@@ -0,0 +1,357 @@
+import bisect
+import contextvars
+import functools
+import inspect
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+logger = logging.getLogger(__name__)
+
+# 모듈 요약: 요청 단위 DB 계측과 Prometheus 텍스트 형식(/metrics) 출력을 담당합니다.
+# app.py가 요청 시작 시 begin_request()로 Flask 엔드포인트를 contextvar에 설정하면,
+# @instrumented 클래스(DBhandler/AsyncDBhandler)의 메서드 호출 지연과 전송 계층의 DB 왕복/응답 바이트가
+# 그 엔드포인트와 가장 바깥 DB 메서드(operation)로 집계됩니다. (fan-out 스레드와 async 루프에도 전파)
+# 외부 의존성 없이 카운터/히스토그램만 구현하며, METRICS=0이면 메트릭을 기록하지 않습니다.
+# 같은 계측 지점에서 느린 호출 로그도 남깁니다: DB_SLOW_CALL_SAMPLE 비율로 고른 호출이 DB_SLOW_CALL_MS를 넘으면
+# 메서드, 엔드포인트, 호출 위치(파일:줄)와 왕복별 경로/쿼리/응답 크기/시간을 경고 로그로 남기고,
+# 최상위 노드 전체를 DB_FULL_READ_BYTES 이상 받은 읽기(child("user").get() 등)는 표본과 관계없이 표시합니다.
+
+ENABLED = os.getenv("METRICS", "1") != "0"
+SLOW_CALL_MS = float(os.getenv("DB_SLOW_CALL_MS", 500))  # 0 이하이면 느린 호출 로그 끔
+SLOW_CALL_SAMPLE = float(os.getenv("DB_SLOW_CALL_SAMPLE", 0.1))
+SLOW_CALL_MAX_TRIPS = 5  # 로그 한 줄에 남길 최대 왕복 수 (느린 순)
+FULL_READ_BYTES = int(os.getenv("DB_FULL_READ_BYTES", 256 * 1024))  # 0이면 전체 노드 읽기 검사 끔
+FULL_READ_LOG_INTERVAL = 60.0  # 같은 노드/메서드의 전체 노드 읽기 경고 최소 간격(초)
+ACTIVE = ENABLED or SLOW_CALL_MS > 0 or FULL_READ_BYTES > 0
+# 호출 위치를 찾을 때 건너뛸 DB 계층 모듈
+DB_LAYER_FILES = frozenset({"database.py", "async_database.py", "cache.py", "metrics.py", "fanout.py"})
+PREFIX = "ewhamarket"
+NO_ENDPOINT = "none"
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_endpoint: contextvars.ContextVar = contextvars.ContextVar("metrics_endpoint", default=NO_ENDPOINT)
+_operation: contextvars.ContextVar = contextvars.ContextVar("metrics_db_operation", default=None)
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.total = 0.0
+        self.count = 0
+
+
+class Registry:
+    """카운터와 히스토그램을 (이름, 레이블) 단위로 모아 Prometheus 텍스트 형식으로 출력합니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._meta: Dict[str, Tuple[str, str, Optional[Tuple[float, ...]]]] = {}
+        self._values: Dict[str, Dict[Labels, Any]] = {}
+
+    def describe(self, name: str, kind: str, help_text: str, buckets: Optional[Tuple[float, ...]] = None) -> None:
+        """
+        메트릭을 등록합니다.
+        :param kind: (str) 'counter' 또는 'histogram'
+        :param buckets: (tuple) 히스토그램 버킷 상한 (오름차순)
+        """
+        with self._lock:
+            self._meta[name] = (kind, help_text, buckets)
+            self._values.setdefault(name, {})
+
+    def inc(self, name: str, labels: Labels, amount: float = 1) -> None:
+        with self._lock:
+            series = self._values[name]
+            series[labels] = series.get(labels, 0) + amount
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        buckets = self._meta[name][2]
+        with self._lock:
+            hist = self._values[name].get(labels)
+            if hist is None:
+                hist = self._values[name][labels] = _Histogram(len(buckets))
+            # 구현: value 이하 상한을 가진 첫 버킷에만 기록하고, 출력 시 누적
+            index = bisect.bisect_left(buckets, value)
+            if index < len(buckets):
+                hist.counts[index] += 1
+            hist.total += value
+            hist.count += 1
+
+    def reset(self) -> None:
+        """기록한 값을 모두 지웁니다. (등록은 유지)"""
+        with self._lock:
+            for name in self._values:
+                self._values[name] = {}
+
+    def snapshot(self) -> Dict[str, Dict[Labels, Any]]:
+        """
+        현재 값을 반환합니다. (벤치마크/진단용)
+        :return: (dict) 이름 -> {레이블: 카운터 값 또는 {'count', 'sum'}}
+        """
+        with self._lock:
+            return {name: {labels: ({"count": v.count, "sum": v.total} if isinstance(v, _Histogram) else v)
+                           for labels, v in series.items()}
+                    for name, series in self._values.items()}
+
+    def render(self, extra: Iterable[Tuple[str, str, str, List[Tuple[Labels, float]]]] = ()) -> str:
+        """
+        Prometheus 텍스트 형식(0.0.4)으로 출력합니다.
+        :param extra: (iterable) 수집 시점에 계산한 (이름, 'counter'/'gauge', 설명, [(레이블, 값)]) 목록 (예: 캐시 통계)
+        :return: (str) 응답 본문
+        """
+        lines: List[str] = []
+        with self._lock:
+            for name, (kind, help_text, buckets) in self._meta.items():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                for labels, value in sorted(self._values[name].items()):
+                    if kind != "histogram":
+                        lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(buckets, value.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_labels(labels + (('le', _number(bound)),))} {cumulative}")
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {value.count}")
+                    lines.append(f"{name}_sum{_labels(labels)} {_number(value.total)}")
+                    lines.append(f"{name}_count{_labels(labels)} {value.count}")
+        for name, kind, help_text, samples in extra:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            lines += [f"{name}{_labels(labels)} {_number(value)}" for labels, value in samples]
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if isinstance(value, float) and not value.is_integer():
+        return repr(value)
+    return str(int(value))
+
+
+REGISTRY = Registry()
+HTTP_SECONDS = f"{PREFIX}_http_request_duration_seconds"
+HTTP_REQUESTS = f"{PREFIX}_http_requests_total"
+DB_CALL_SECONDS = f"{PREFIX}_db_call_duration_seconds"
+DB_REQUESTS = f"{PREFIX}_db_requests_total"
+DB_RESPONSE_BYTES = f"{PREFIX}_db_response_bytes"
+DB_FULL_READS = f"{PREFIX}_db_full_node_reads_total"
+REGISTRY.describe(HTTP_SECONDS, "histogram", "Flask 요청 처리 시간(초), 엔드포인트별", LATENCY_BUCKETS)
+REGISTRY.describe(HTTP_REQUESTS, "counter", "Flask 요청 수, 엔드포인트/상태 코드별")
+REGISTRY.describe(DB_CALL_SECONDS, "histogram", "DB 핸들러 메서드 호출 시간(초), 엔드포인트/메서드별 (_count가 호출 수)",
+                  LATENCY_BUCKETS)
+REGISTRY.describe(DB_REQUESTS, "counter", "DB 왕복(REST 요청/SQLite 연산) 수, 엔드포인트/메서드별")
+REGISTRY.describe(DB_RESPONSE_BYTES, "histogram", "DB REST 응답 본문 크기(바이트), 엔드포인트/메서드별", SIZE_BUCKETS)
+REGISTRY.describe(DB_FULL_READS, "counter", f"최상위 노드 전체를 DB_FULL_READ_BYTES({FULL_READ_BYTES}B) 이상 받은 읽기 수")
+
+_full_read_lock = threading.Lock()
+_full_read_logged: Dict[Tuple[str, str], float] = {}
+
+
+# ==========================================================
+# 요청 단위 귀속 (Attribution)
+# ==========================================================
+
+def begin_request(endpoint: Optional[str]) -> contextvars.Token:
+    """현재 컨텍스트의 DB 호출을 endpoint로 귀속시키고, 종료 시 넘길 토큰을 반환합니다."""
+    return _endpoint.set(endpoint or NO_ENDPOINT)
+
+
+def end_request(token: contextvars.Token) -> None:
+    """begin_request() 이전 상태로 되돌립니다."""
+    try:
+        _endpoint.reset(token)
+    except ValueError:
+        _endpoint.set(NO_ENDPOINT)
+
+
+def observe_request(endpoint: Optional[str], status: int, seconds: float) -> None:
+    """Flask 요청 하나의 처리 시간과 상태 코드를 기록합니다."""
+    if not ENABLED:
+        return
+    endpoint = endpoint or NO_ENDPOINT
+    REGISTRY.observe(HTTP_SECONDS, (("endpoint", endpoint),), seconds)
+    REGISTRY.inc(HTTP_REQUESTS, (("endpoint", endpoint), ("status", str(status))))
+
+
+def observe_db_request(nbytes: Optional[int] = None, seconds: float = 0.0, method: str = "GET",
+                       url: Optional[str] = None, path: Optional[str] = None, params: Optional[Dict[str, Any]] = None) -> None:
+    """
+    전송 계층의 DB 왕복 하나를 현재 엔드포인트/DB 메서드로 기록합니다.
+    느린 호출 로그가 표본으로 고른 호출이면 왕복 내역을 함께 남기고, 큰 전체 노드 읽기는 항상 검사합니다.
+    :param nbytes: (int) 응답 본문 바이트 (HTTP가 아니어서 알 수 없으면 None)
+    :param seconds: (float) 왕복 시간(초)
+    :param method: (str) HTTP 메서드 (SQLite는 같은 의미의 메서드 이름)
+    :param url: (str) REST 요청 URL (HTTP 전송)
+    :param path: (str) DB 경로 (url 대신, SQLite 저장소)
+    :param params: (dict) 쿼리 파라미터 (path와 함께)
+    """
+    call = _operation.get()
+    if ENABLED:
+        labels = (("endpoint", _endpoint.get()), ("operation", call.name if call else NO_ENDPOINT))
+        REGISTRY.inc(DB_REQUESTS, labels)
+        if nbytes is not None:
+            REGISTRY.observe(DB_RESPONSE_BYTES, labels, nbytes)
+    # 구현: 경로 해석은 기록하거나 검사할 때만 수행 (대부분의 왕복은 카운터만 증가)
+    if call is not None and call.trips is not None:
+        call.trips.append((method, url, path, params, nbytes, seconds))
+    if FULL_READ_BYTES > 0 and nbytes is not None and nbytes >= FULL_READ_BYTES and method == "GET":
+        target, query = _target(url, path, params)
+        if "/" not in target and not query:
+            _flag_full_read(call, target, nbytes, seconds)
+
+
+# ==========================================================
+# 느린 호출 로그 (Slow-call log)
+# ==========================================================
+
+class _Call:
+    """가장 바깥 DB 메서드 호출 하나. (호출 위치와, 표본이면 왕복 내역)"""
+    __slots__ = ("name", "site", "trips")
+
+    def __init__(self, name: str, site: str, sampled: bool):
+        self.name = name
+        self.site = site
+        self.trips: Optional[List[tuple]] = [] if sampled else None
+
+
+def _call_site(frame) -> str:
+    """DB 계층(핸들러/캐시/계측) 밖의 첫 호출 프레임을 '파일:줄 (함수)'로 반환합니다."""
+    depth = 0
+    while frame is not None and os.path.basename(frame.f_code.co_filename) in DB_LAYER_FILES and depth < 8:
+        frame = frame.f_back
+        depth += 1
+    if frame is None:
+        return "?"
+    return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno} ({frame.f_code.co_name})"
+
+
+def _target(url: Optional[str], path: Optional[str], params: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+    """
+    왕복 대상을 (DB 경로, 쿼리 문자열)로 바꿉니다. (인증 토큰은 제외)
+    :return: (tuple) ('item/abc', 'orderBy="created_at"&limitToLast=5')
+    """
+    if url is not None:
+        parts = urlsplit(url)
+        path = unquote(parts.path).strip("/")
+        if path.endswith(".json"):
+            path = path[:-len(".json")]
+        query = [(k, v) for k, v in parse_qsl(parts.query) if k != "auth"]
+    else:
+        path = (path or "").strip("/")
+        query = sorted((params or {}).items())
+    return path, "&".join(f"{k}={v}" for k, v in query)
+
+
+def _describe_trip(trip: tuple) -> str:
+    method, url, path, params, nbytes, seconds = trip
+    target, query = _target(url, path, params)
+    size = "?" if nbytes is None else f"{nbytes}B"
+    return f"{method} /{target}{'?' + query if query else ''} {seconds * 1000:.1f}ms {size}"
+
+
+def _finish_call(call: _Call, seconds: float) -> None:
+    """가장 바깥 호출이 끝나면 호출 시간을 기록하고, 표본 호출이 임계값을 넘었으면 로그를 남깁니다."""
+    endpoint = _endpoint.get()
+    if ENABLED:
+        REGISTRY.observe(DB_CALL_SECONDS, (("endpoint", endpoint), ("operation", call.name)), seconds)
+    if call.trips is None or seconds * 1000 < SLOW_CALL_MS:
+        return
+    trips = sorted(list(call.trips), key=lambda t: -t[5])
+    total = sum(t[4] or 0 for t in trips)
+    logger.warning("slow DB call: %s %.1fms endpoint=%s at %s, %d round trips, %dB: %s",
+                   call.name, seconds * 1000, endpoint, call.site, len(trips), total,
+                   "; ".join(_describe_trip(t) for t in trips[:SLOW_CALL_MAX_TRIPS]) or "no round trips")
+
+
+def _flag_full_read(call: Optional[_Call], node: str, nbytes: int, seconds: float) -> None:
+    """최상위 노드 전체를 FULL_READ_BYTES 이상 받은 읽기를 집계하고, 노드/메서드마다 일정 간격으로 경고합니다."""
+    name = call.name if call else NO_ENDPOINT
+    endpoint = _endpoint.get()
+    if ENABLED:
+        REGISTRY.inc(DB_FULL_READS, (("endpoint", endpoint), ("operation", name), ("node", node or "/")))
+    now = time.monotonic()
+    with _full_read_lock:
+        if now - _full_read_logged.get((node, name), -FULL_READ_LOG_INTERVAL) < FULL_READ_LOG_INTERVAL:
+            return
+        _full_read_logged[(node, name)] = now
+    logger.warning("full-node DB read: /%s %dB %.1fms by %s endpoint=%s at %s",
+                   node, nbytes, seconds * 1000, name, endpoint, call.site if call else "?")
+
+
+def _start_call(name: str, frame) -> _Call:
+    sampled = SLOW_CALL_MS > 0 and (SLOW_CALL_SAMPLE >= 1 or random.random() < SLOW_CALL_SAMPLE)
+    return _Call(name, _call_site(frame), sampled)
+
+
+async def _timed(call: _Call, coro):
+    token = _operation.set(call)
+    started = time.perf_counter()
+    try:
+        return await coro
+    finally:
+        _operation.reset(token)
+        _finish_call(call, time.perf_counter() - started)
+
+
+def _wrap(name: str, method: Callable) -> Callable:
+    # 구현: 가장 바깥 호출만 기록 (메서드 안에서 다시 부른 공개 메서드는 바깥 메서드의 비용에 포함)
+    if inspect.iscoroutinefunction(method):
+        # 구현: 코루틴을 만드는 시점에 호출 위치를 잡도록 동기 함수에서 계측 코루틴을 반환
+        #       (코루틴 본문은 gather/이벤트 루프에서 실행되어 그때는 호출한 코드의 프레임이 없음)
+        @functools.wraps(method)
+        def async_wrapper(*args, **kwargs):
+            if not ACTIVE or _operation.get() is not None:
+                return method(*args, **kwargs)
+            return _timed(_start_call(name, sys._getframe(1)), method(*args, **kwargs))
+
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        if not ACTIVE or _operation.get() is not None:
+            return method(*args, **kwargs)
+        call = _start_call(name, sys._getframe(1))
+        token = _operation.set(call)
+        started = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _operation.reset(token)
+            _finish_call(call, time.perf_counter() - started)
+
+    return wrapper
+
+
+def instrumented(exclude: Iterable[str] = ()):
+    """
+    클래스의 공개 메서드(이름이 '_'로 시작하지 않는 함수)를 호출 시간 계측 래퍼로 감싸는 클래스 데코레이터.
+    :param exclude: (iterable) 계측하지 않을 메서드 이름 (통계/설정 메서드 등)
+    """
+    excluded = set(exclude)
+
+    def decorator(cls):
+        for name, attr in list(vars(cls).items()):
+            if name.startswith("_") or name in excluded or not inspect.isfunction(attr):
+                continue
+            setattr(cls, name, _wrap(name, attr))
+        return cls
+
+    return decorator
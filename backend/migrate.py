@@ -0,0 +1,170 @@
+import argparse
+import logging
+import os
+import sys
+
+from database import DBhandler
+
+# 모듈 요약: DB 구조 변경에 따른 1회성 마이그레이션/백필 도구입니다.
+# 사용법: python backend/migrate.py <작업명> (프로젝트 루트에서 실행)
+
+logging.basicConfig(level=logging.INFO)
+
+
+def migrate_users(db: DBhandler) -> int:
+    """
+    push 키 기반 사용자 레코드를 user/<id> 키로 이동합니다.
+    :param db: (DBhandler) 데이터베이스 핸들러
+    :return: (int) 종료 코드
+    """
+    moved = db.migrate_users_to_id_keys()
+    if moved < 0:
+        return 1
+    print(f"users: {moved}건 이동 완료")
+    return 0
+
+
+def backfill_user_public(db: DBhandler) -> int:
+    """
+    사용자 공개 프로필 projection(user_public)을 재구성합니다. (users 작업 이후 실행)
+    :param db: (DBhandler) 데이터베이스 핸들러
+    :return: (int) 종료 코드
+    """
+    count = db.backfill_user_public()
+    if count < 0:
+        return 1
+    print(f"user-public: {count}명 공개 프로필 기록")
+    return 0
+
+
+def backfill_like_counts(db: DBhandler) -> int:
+    """
+    likes 노드를 기준으로 like_count 카운터를 재계산합니다.
+    :param db: (DBhandler) 데이터베이스 핸들러
+    :return: (int) 종료 코드
+    """
+    count = db.backfill_like_counts()
+    if count < 0:
+        return 1
+    print(f"like-counts: {count}개 상품 카운터 기록")
+    return 0
+
+
+def backfill_user_likes(db: DBhandler) -> int:
+    """
+    likes 노드를 기준으로 사용자별 찜 역인덱스(user_likes)를 재구성합니다.
+    :param db: (DBhandler) 데이터베이스 핸들러
+    :return: (int) 종료 코드
+    """
+    count = db.backfill_user_likes()
+    if count < 0:
+        return 1
+    print(f"user-likes: {count}건 역인덱스 기록")
+    return 0
+
+
+def backfill_item_index(db: DBhandler) -> int:
+    """
+    상품 목록 정렬 키(created_key, category_key)와 카테고리별 상품 카운터를 채웁니다.
+    :param db: (DBhandler) 데이터베이스 핸들러
+    :return: (int) 종료 코드
+    """
+    count = db.backfill_item_index()
+    if count < 0:
+        return 1
+    print(f"item-index: {count}개 상품 정렬 키/카운터 기록")
+    return 0
+
+
+def backfill_item_summary(db: DBhandler) -> int:
+    """
+    상품 목록/찜/마이페이지용 projection(item_summary)을 재구성합니다.
+    :param db: (DBhandler) 데이터베이스 핸들러
+    :return: (int) 종료 코드
+    """
+    count = db.backfill_item_summary()
+    if count < 0:
+        return 1
+    print(f"item-summary: {count}개 상품 요약 기록")
+    return 0
+
+
+def backfill_owner_index(db: DBhandler) -> int:
+    """
+    판매/구매 상품 인덱스(items_by_author, items_by_buyer)를 재구성합니다.
+    :param db: (DBhandler) 데이터베이스 핸들러
+    :return: (int) 종료 코드
+    """
+    count = db.backfill_owner_index()
+    if count < 0:
+        return 1
+    print(f"owner-index: {count}개 상품 인덱스 기록")
+    return 0
+
+
+def backfill_review_index(db: DBhandler) -> int:
+    """
+    작성자별 리뷰 인덱스(reviews_by_writer), 리뷰 정렬 키, 리뷰 수 카운터를 재구성합니다.
+    :param db: (DBhandler) 데이터베이스 핸들러
+    :return: (int) 종료 코드
+    """
+    count = db.backfill_review_index()
+    if count < 0:
+        return 1
+    print(f"review-index: {count}개 리뷰 인덱스 기록")
+    return 0
+
+
+def prune_changes(db: DBhandler) -> int:
+    """
+    보존 기간(DB_CHANGE_FEED_RETENTION_DAYS, 기본 7일)이 지난 변경 피드 항목을 삭제합니다.
+    :param db: (DBhandler) 데이터베이스 핸들러
+    :return: (int) 종료 코드
+    """
+    count = db.prune_changes(float(os.getenv("DB_CHANGE_FEED_RETENTION_DAYS", 7)))
+    if count < 0:
+        return 1
+    print(f"prune-changes: {count}건 삭제")
+    return 0
+
+
+TASKS = {
+    "users": migrate_users,
+    "user-public": backfill_user_public,
+    "like-counts": backfill_like_counts,
+    "user-likes": backfill_user_likes,
+    "item-index": backfill_item_index,
+    "item-summary": backfill_item_summary,
+    "owner-index": backfill_owner_index,
+    "review-index": backfill_review_index,
+    "prune-changes": prune_changes,
+}
+
+
+def main(argv=None) -> int:
+    """
+    명령행 인수로 지정된 마이그레이션 작업을 순서대로 실행합니다.
+    :param argv: (list) 명령행 인수 (기본: sys.argv[1:])
+    :return: (int) 종료 코드
+    """
+    parser = argparse.ArgumentParser(description="EwhaMarket DB 마이그레이션 도구")
+    parser.add_argument("tasks", nargs="+", choices=sorted(TASKS) + ["all"], help="실행할 작업")
+    parser.add_argument("--config", default=None, help="Firebase 설정 파일 경로 (기본: FIREBASE_CONFIG)")
+    args = parser.parse_args(argv)
+
+    db = DBhandler(args.config)
+    if not db.db:
+        print("DB 초기화 실패", file=sys.stderr)
+        return 1
+
+    # 구현: 'all'이면 등록된 순서대로 모든 작업 실행
+    tasks = list(TASKS) if "all" in args.tasks else args.tasks
+    for name in tasks:
+        code = TASKS[name](db)
+        if code != 0:
+            return code
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
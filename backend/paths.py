@@ -0,0 +1,32 @@
+# 모듈 요약: Firebase 경로('a/b/c')를 나누고, 경로 단위로 값을 반영한 새 트리를 만드는 도우미입니다.
+# 복제본(replica), 스냅샷(snapshot), ETag 캐시, 요청 단위 작업(unit_of_work)이 함께 사용하므로
+# 외부 패키지에 의존하지 않습니다.
+
+
+def _split(path: str):
+    return [p for p in (path or "").strip("/").split("/") if p]
+
+
+def _prune(value):
+    """None 값과 빈 객체를 제거합니다. (Firebase는 빈 노드를 저장하지 않음)"""
+    if isinstance(value, dict):
+        out = {}
+        for k, v in value.items():
+            v = _prune(v)
+            if v is not None:
+                out[k] = v
+        return out or None
+    return value
+
+
+def _assign(root, parts, value):
+    """root의 parts 경로에 value를 넣은 새 트리를 반환합니다. (경로 위의 dict만 복사)"""
+    if not parts:
+        return _prune(value)
+    node = dict(root) if isinstance(root, dict) else {}
+    child = _assign(node.get(parts[0]), parts[1:], value)
+    if child is None:
+        node.pop(parts[0], None)
+    else:
+        node[parts[0]] = child
+    return node or None
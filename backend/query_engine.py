@@ -0,0 +1,108 @@
+import hashlib
+import json
+from typing import Any, Dict, Tuple
+
+# 모듈 요약: Firebase Realtime Database의 키/값 정렬 순서, 쿼리(orderBy/startAt/endAt/equalTo/limitTo*/shallow)와
+# ETag 계산 규칙입니다. Firebase 대역 서버(firebase_standin)와 SQLite 저장소(sqlite_store)가 같은 규칙을 쓰도록
+# 두 모듈이 이 구현을 함께 가져다 씁니다.
+
+NULL_ETAG = "null_etag"
+PUSH_CHARS = "-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz"
+
+
+def _etag(value: Any) -> str:
+    """값의 ETag를 계산합니다. (존재하지 않는 값은 NULL_ETAG)"""
+    if value is None:
+        return NULL_ETAG
+    raw = json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.md5(raw).hexdigest()
+
+
+def _key_order(key: str) -> Tuple[int, Any]:
+    """Firebase 키 정렬 규칙: 32비트 정수 키가 먼저(숫자 순), 나머지는 사전 순."""
+    try:
+        n = int(key)
+        if str(n) == key and -2 ** 31 <= n < 2 ** 31:
+            return (0, n)
+    except (TypeError, ValueError):
+        pass
+    return (1, key)
+
+
+def _value_order(value: Any) -> Tuple[int, Any]:
+    """Firebase 값 정렬 규칙: null < false < true < 숫자 < 문자열 < 객체."""
+    if value is None:
+        return (0, 0)
+    if value is False:
+        return (1, 0)
+    if value is True:
+        return (2, 0)
+    if isinstance(value, (int, float)):
+        return (3, value)
+    if isinstance(value, str):
+        return (4, value)
+    return (5, 0)
+
+
+# 같은 정렬 값 안의 모든 키 순서보다 뒤에 오는 값 (_key_order는 (0, n) 또는 (1, str))
+_AFTER = (2,)
+
+
+def _sort_key(order_by: str, key: str, value: Any) -> Tuple[Any, Any]:
+    """orderBy 기준의 (정렬 값, 키 순서) 정렬 키. (같은 정렬 값이면 키 순)"""
+    if order_by == "$key":
+        return _key_order(key), ()
+    if order_by == "$value":
+        return _value_order(value), _key_order(key)
+    child = value
+    for p in order_by.split("/"):
+        child = child.get(p) if isinstance(child, dict) else None
+    return _value_order(child), _key_order(key)
+
+
+def apply_query(value: Any, params: Dict[str, str]) -> Any:
+    """
+    orderBy/startAt/endAt/equalTo/limitToFirst/limitToLast/shallow 쿼리를 값에 적용합니다.
+    :param value: 조회 경로의 값
+    :param params: (dict) 쿼리 파라미터 (JSON 인코딩된 문자열)
+    """
+    if params.get("shallow") == "true":
+        if isinstance(value, dict):
+            return {k: True for k in value}
+        return value
+    order_by = params.get("orderBy")
+    if order_by is None or not isinstance(value, dict):
+        return value
+    order_by = json.loads(order_by)
+
+    def sort_key(item):
+        k, v = item
+        if order_by == "$key":
+            return (_key_order(k), "")
+        if order_by == "$value":
+            return (_value_order(v), _key_order(k))
+        child = v
+        for p in order_by.split("/"):
+            child = child.get(p) if isinstance(child, dict) else None
+        return (_value_order(child), _key_order(k))
+
+    def bound(raw):
+        b = json.loads(raw)
+        return _key_order(b) if order_by == "$key" else _value_order(b)
+
+    items = sorted(value.items(), key=sort_key)
+    if "equalTo" in params:
+        target = bound(params["equalTo"])
+        items = [it for it in items if sort_key(it)[0] == target]
+    if "startAt" in params:
+        lo = bound(params["startAt"])
+        items = [it for it in items if sort_key(it)[0] >= lo]
+    if "endAt" in params:
+        hi = bound(params["endAt"])
+        items = [it for it in items if sort_key(it)[0] <= hi]
+    if "limitToFirst" in params:
+        items = items[:int(params["limitToFirst"])]
+    if "limitToLast" in params:
+        n = int(params["limitToLast"])
+        items = items[-n:] if n else []
+    return dict(items)
@@ -0,0 +1,226 @@
+import copy
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+import requests
+
+from paths import _assign, _split
+
+logger = logging.getLogger(__name__)
+
+# 모듈 요약: Firebase 이벤트 스트림(SSE)으로 자주 읽는 노드를 메모리에 미러링하는 복제본입니다.
+# 연결 직후의 put 이벤트로 전체 스냅샷을 받고, 이후 put/patch 이벤트를 경로 단위로 반영합니다.
+# 갱신은 경로 복사(path copying)로 이루어지므로 이미 반환된 스냅샷은 바뀌지 않습니다.
+
+REPLICA_NODES = ("item", "likes", "review")
+
+
+def _lines(resp):
+    """
+    스트림 응답을 줄 단위로 반환합니다.
+    chunk 크기를 지정하지 않아 도착한 chunk를 바로 처리하고(iter_lines 기본값은 512바이트가 찰 때까지 대기),
+    JSON 문자열 안의 U+2028 등에서 끊지 않도록 줄바꿈 문자로만 나눕니다.
+    큰 스냅샷 한 줄이 여러 chunk로 오더라도 조각을 모아 한 번만 합칩니다.
+    """
+    pending = []
+    for chunk in resp.iter_content(chunk_size=None, decode_unicode=True):
+        if "\n" not in chunk:
+            pending.append(chunk)
+            continue
+        head, *lines = chunk.split("\n")
+        pending.append(head)
+        lines.insert(0, "".join(pending))
+        pending = [lines.pop()]
+        for line in lines:
+            yield line.rstrip("\r")
+
+
+def _events(lines):
+    """SSE 줄 목록을 (이벤트 이름, 데이터) 쌍으로 묶습니다. (keep-alive 등 데이터가 null인 이벤트도 그대로 전달)"""
+    event, data_lines = None, []
+    for line in lines:
+        if line:
+            field, _, value = line.partition(":")
+            value = value[1:] if value.startswith(" ") else value
+            if field == "event":
+                event = value
+            elif field == "data":
+                data_lines.append(value)
+            continue
+        # 구현: 빈 줄에서 이벤트 하나가 끝남
+        if event:
+            yield event, json.loads("\n".join(data_lines)) if data_lines else None
+        event, data_lines = None, []
+
+
+class StreamReplica:
+    """
+    노드별 SSE 스트림을 백그라운드 스레드로 유지하며 메모리 미러를 갱신합니다.
+    연결이 끊기면 미러를 '준비 안 됨'으로 표시하고 백오프 후 재연결합니다. (재연결 시 전체 스냅샷 재수신)
+    :param handler: (DBhandler) URL/인증 헤더 생성에 사용할 핸들러
+    :param nodes: (iterable) 미러링할 최상위 노드 이름
+    """
+
+    def __init__(self, handler, nodes: Iterable[str] = REPLICA_NODES, read_timeout: float = 90.0):
+        self._handler = handler
+        self.nodes = tuple(nodes)
+        self.read_timeout = read_timeout
+        self._data: Dict[str, Any] = {}
+        self._ready = {node: threading.Event() for node in self.nodes}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._threads = []
+        self._responses = {}
+        self._backoff = {}
+        self._session = requests.Session()
+        self.events = {node: 0 for node in self.nodes}
+
+    # ==========================================================
+    # 수명 주기
+    # ==========================================================
+
+    def start(self, wait: Optional[float] = None) -> "StreamReplica":
+        """
+        노드별 스트림 스레드를 시작합니다.
+        :param wait: (float) 초기 스냅샷을 기다릴 최대 초 (None이면 기다리지 않음)
+        """
+        for node in self.nodes:
+            thread = threading.Thread(target=self._run, args=(node,), name=f"replica-{node}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        if wait:
+            self.wait_ready(wait)
+        return self
+
+    def wait_ready(self, timeout: float) -> bool:
+        """모든 노드의 초기 스냅샷을 받을 때까지 최대 timeout초 기다립니다."""
+        deadline = time.monotonic() + timeout
+        return all(self._ready[node].wait(max(deadline - time.monotonic(), 0)) for node in self.nodes)
+
+    def stop(self) -> None:
+        """스트림을 닫고 스레드를 종료합니다."""
+        self._stopped.set()
+        for resp in list(self._responses.values()):
+            try:
+                resp.close()
+            except Exception:
+                pass
+        for thread in self._threads:
+            thread.join(timeout=5)
+
+    def ready(self, *nodes: str) -> bool:
+        """주어진 노드가 모두 미러링되어 최신 상태를 따라가고 있는지 여부."""
+        return all(node in self._ready and self._ready[node].is_set() for node in nodes)
+
+    def stats(self) -> Dict[str, Any]:
+        """노드별 준비 여부와 반영한 이벤트 수를 반환합니다."""
+        return {node: {"ready": self._ready[node].is_set(), "events": self.events[node]} for node in self.nodes}
+
+    # ==========================================================
+    # 조회 / 로컬 반영
+    # ==========================================================
+
+    def get(self, node: str, *parts: str) -> Any:
+        """
+        미러에서 node/parts 경로의 값을 반환합니다. 반환값은 이후 갱신에 의해 바뀌지 않는 스냅샷입니다.
+        (호출 측에서 값을 수정하면 미러가 오염되므로 수정이 필요하면 복사해서 사용)
+        """
+        value = self._data.get(node)
+        for part in parts:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(part)
+        return value
+
+    def apply_update(self, updates: Dict[str, Any]) -> None:
+        """
+        성공한 다중 경로 update를 미러에도 즉시 반영합니다. (스트림 이벤트보다 먼저 자신의 쓰기를 읽기 위함)
+        미러링 대상이 아닌 경로와 서버 값(.sv)은 건너뜁니다.
+        """
+        with self._lock:
+            for path, value in updates.items():
+                parts = _split(path)
+                if not parts or parts[0] not in self._data:
+                    continue
+                if isinstance(value, dict) and ".sv" in value:
+                    continue
+                self._data[parts[0]] = _assign(self._data[parts[0]], parts[1:], copy.deepcopy(value))
+
+    # ==========================================================
+    # 스트림 처리
+    # ==========================================================
+
+    def _apply_event(self, node: str, event: str, payload: Dict[str, Any]) -> None:
+        parts = _split(payload.get("path"))
+        data = payload.get("data")
+        with self._lock:
+            root = self._data.get(node)
+            if event == "put":
+                root = _assign(root, parts, data)
+            elif event == "patch" and isinstance(data, dict):
+                for key, value in data.items():
+                    root = _assign(root, parts + _split(key), value)
+            self._data[node] = root
+            self.events[node] += 1
+
+    def _on_node_event(self, node: str, event: str, payload: Dict[str, Any]) -> None:
+        self._apply_event(node, event, payload)
+        if not self._ready[node].is_set():
+            logger.info("Replica of %s is ready", node)
+            self._ready[node].set()
+
+    def _open(self, query):
+        """pyrebase 쿼리(child/order_by_* 등)의 URL로 SSE 스트림을 엽니다."""
+        url = query.build_request_url(None)
+        headers = dict(self._handler.db.build_headers(), Accept="text/event-stream")
+        headers["Cache-Control"] = "no-cache"
+        resp = self._session.get(url, headers=headers, stream=True, timeout=(5, self.read_timeout))
+        resp.raise_for_status()
+        return resp
+
+    def _stream(self, name: str, query, handle) -> None:
+        """
+        스트림 하나를 열어 put/patch 이벤트마다 handle(event, payload)를 호출합니다.
+        연결이 끊기거나 cancel/auth_revoked 이벤트를 받으면 반환합니다.
+        """
+        resp = self._open(query)
+        self._responses[name] = resp
+        try:
+            for event, payload in _events(_lines(resp)):
+                if self._stopped.is_set():
+                    return
+                if event in ("put", "patch"):
+                    handle(event, payload)
+                    self._backoff[name] = 1.0
+                elif event in ("cancel", "auth_revoked"):
+                    logger.warning("Replica stream of %s got %s; reconnecting", name, event)
+                    return
+        finally:
+            self._responses.pop(name, None)
+            resp.close()
+
+    def _supervise(self, name: str, connect, on_drop) -> None:
+        """connect()가 끝나거나 실패할 때마다 on_drop()을 호출하고 지수 백오프 후 다시 연결합니다."""
+        self._backoff[name] = 1.0
+        while not self._stopped.is_set():
+            try:
+                connect()
+            except Exception:
+                if not self._stopped.is_set():
+                    logger.exception("Replica stream of %s failed", name)
+            finally:
+                on_drop()
+            if not self._stopped.is_set():
+                self._stopped.wait(self._backoff[name])
+                self._backoff[name] = min(self._backoff[name] * 2, 30.0)
+
+    def _run(self, node: str) -> None:
+        self._supervise(
+            node,
+            lambda: self._stream(node, self._handler.db.child(node),
+                                 lambda event, payload: self._on_node_event(node, event, payload)),
+            self._ready[node].clear,
+        )
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+# 모듈 요약: 동시에 들어온 같은 읽기 요청(같은 경로와 쿼리)을 진행 중인 호출 하나로 합치는 single-flight 도구입니다.
+# 먼저 온 호출(leader)만 실제로 실행하고, 그 사이 같은 키로 들어온 호출은 leader의 결과(또는 예외)를 함께 받습니다.
+# 완료된 결과는 보관하지 않으므로 캐시와 달리 오래된 값을 돌려주지 않습니다. (프로세스 단위)
+# 쓰기가 끝나면 invalidate()로 진행 중인 호출을 목록에서 떼어 내, 그 뒤에 시작한 읽기가 쓰기 이전에 출발한
+# 응답에 합쳐지지 않게 합니다. (이미 합류한 호출은 원래 응답을 그대로 받음)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """스레드 간 single-flight. 합쳐진(절약된) 호출 수를 coalesced로 집계합니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        key로 진행 중인 호출이 있으면 그 결과를 기다려 반환하고, 없으면 fn()을 실행합니다.
+        :param key: 같은 요청을 식별하는 키 (예: URL)
+        :param fn: (callable) 인수 없는 호출
+        :return: fn()의 결과 (합쳐진 호출은 같은 객체를 공유)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    if self._calls.get(key) is call:
+                        del self._calls[key]
+                call.done.set()
+        else:
+            call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def invalidate(self) -> None:
+        """진행 중인 호출을 목록에서 떼어 냅니다. 이후 같은 키의 호출은 새로 실행됩니다. (쓰기 완료 후 호출)"""
+        with self._lock:
+            self._calls.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"coalesced": self.coalesced, "in_flight": len(self._calls)}
+
+
+class AsyncSingleFlight:
+    """
+    한 이벤트 루프 안에서의 single-flight. (AsyncDBhandler의 전용 루프에서만 사용)
+    leader를 호출한 쪽이 취소되어도 진행 중인 호출은 다른 대기자를 위해 계속 실행됩니다.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        key로 진행 중인 호출이 있으면 그 결과를 await하고, 없으면 factory()의 코루틴을 태스크로 실행합니다.
+        :param key: 같은 요청을 식별하는 키
+        :param factory: (callable) 코루틴을 만드는 인수 없는 호출
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(factory())
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def invalidate(self) -> None:
+        """SingleFlight.invalidate와 같이 진행 중인 호출을 목록에서 떼어 냅니다. (태스크는 계속 실행)"""
+        self._calls.clear()
+
+    def _forget(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # 구현: 모든 대기자가 취소된 경우에도 예외가 '회수되지 않음' 경고로 남지 않도록 확인
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {"coalesced": self.coalesced, "in_flight": len(self._calls)}
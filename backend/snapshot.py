@@ -0,0 +1,336 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: 파일 잠금 대신 프로세스 ID로 파일 이름을 구분
+    fcntl = None
+
+from fanout import fan_map
+from paths import _assign, _split
+from replica import REPLICA_NODES, StreamReplica
+
+logger = logging.getLogger(__name__)
+
+# 모듈 요약: 복제본 미러를 로컬 디스크에 스냅샷 + 추가 전용(append-only) 저널로 보존합니다.
+# 재시작한 프로세스는 스냅샷과 저널로 미러를 바로 복원하고, Firebase의 변경 피드(changes 노드)에서
+# 스냅샷 이후에 바뀐 경로만 받아 그 경로만 다시 조회합니다. (노드 전체를 내려받지 않음)
+
+SNAPSHOT_VERSION = 1
+# 한 디렉터리를 함께 쓸 수 있는 최대 워커 프로세스(슬롯) 수
+MAX_SLOTS = 64
+
+
+def _claim_slot(directory: str, name: str):
+    """
+    같은 디렉터리를 쓰는 워커 프로세스들이 서로 다른 파일 쌍을 쓰도록 슬롯 하나를 잠급니다.
+    <name>.<n>.lock에 배타적 flock을 걸어 닫을 때까지 유지합니다. (프로세스가 죽으면 OS가 해제)
+    재시작한 워커는 비어 있는 가장 작은 슬롯을 다시 잡아 그 슬롯의 스냅샷을 이어 씁니다.
+    fcntl이 없는 환경에서는 <name>.pid<pid>를 써서, 재시작하면 이전 스냅샷을 쓰지 못합니다.
+    :return: (tuple) (파일 이름 접두어, 잠금 파일 객체 또는 None)
+    """
+    os.makedirs(directory, exist_ok=True)
+    if fcntl is None:
+        return f"{name}.pid{os.getpid()}", None
+    for slot in range(MAX_SLOTS):
+        lock = open(os.path.join(directory, f"{name}.{slot}.lock"), "a")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock.close()
+            continue
+        return f"{name}.{slot}", lock
+    raise RuntimeError(f"all {MAX_SLOTS} snapshot slots in {directory} are in use")
+
+
+class SnapshotStore:
+    """
+    <name>.<슬롯>.snapshot.json(전체 상태, 원자적 교체)과 <name>.<슬롯>.journal.jsonl(변경분, 줄 단위 추가) 파일 쌍.
+    저널 줄마다 일련번호(s)를 붙여, 스냅샷을 저장한 뒤 저널을 비우기 전에 중단되더라도
+    이미 스냅샷에 포함된 줄은 다시 적용하지 않습니다.
+    여러 워커가 같은 디렉터리를 써도 슬롯 잠금(_claim_slot)으로 프로세스마다 다른 파일 쌍을 씁니다.
+    :param directory: (str) 파일을 둘 디렉터리
+    :param name: (str) 파일 이름 접두어
+    """
+
+    def __init__(self, directory: str, name: str = "replica"):
+        self.directory = directory
+        prefix, self._slot_lock = _claim_slot(directory, name)
+        self.snapshot_path = os.path.join(directory, f"{prefix}.snapshot.json")
+        self.journal_path = os.path.join(directory, f"{prefix}.journal.jsonl")
+        self.seq = 0
+        self.journal_entries = 0
+        self._journal = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """
+        스냅샷을 읽고 그 이후의 저널 줄을 순서대로 재적용합니다.
+        :return: (tuple) (노드 -> 값, meta) / 스냅샷이 없거나 읽을 수 없으면 (None, None)
+        """
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return None, None
+        except (OSError, ValueError):
+            logger.exception("Failed to read snapshot %s", self.snapshot_path)
+            return None, None
+        if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+            return None, None
+
+        data, meta = snapshot.get("data") or {}, snapshot.get("meta") or {}
+        self.seq = meta.get("seq", 0)
+        # 구현: 마지막 줄이 기록 도중 잘렸으면 그 앞까지만 적용 (복원 후 곧바로 새 스냅샷을 저장해 정리)
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        logger.warning("Ignoring truncated journal tail in %s", self.journal_path)
+                        break
+                    if entry["s"] <= self.seq:
+                        continue
+                    for path, value in entry["u"].items():
+                        parts = _split(path)
+                        if parts and parts[0] in data:
+                            data[parts[0]] = _assign(data[parts[0]], parts[1:], value)
+                    if entry.get("t") is not None:
+                        meta["t"] = max(meta.get("t") or 0, entry["t"])
+                    self.seq = entry["s"]
+                    self.journal_entries += 1
+        except FileNotFoundError:
+            pass
+        meta["seq"] = self.seq
+        return data, meta
+
+    def append(self, updates: Dict[str, Any], t: Optional[int] = None) -> None:
+        """
+        변경분 한 줄을 저널에 추가합니다.
+        :param updates: (dict) 경로 -> 새 값 (None이면 삭제)
+        :param t: (int) 이 변경분까지 반영한 변경 피드의 서버 시각(ms)
+        """
+        line = json.dumps({"s": self.seq + 1, "t": t, "u": updates}, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            if self._journal is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self._journal = open(self.journal_path, "a", encoding="utf-8")
+            self._journal.write(line + "\n")
+            self._journal.flush()
+            self.seq += 1
+            self.journal_entries += 1
+
+    def save(self, data: Dict[str, Any], meta: Dict[str, Any]) -> None:
+        """
+        전체 상태를 임시 파일에 쓴 뒤 교체(os.replace)하고 저널을 비웁니다.
+        :param data: (dict) 노드 -> 값
+        :param meta: (dict) 워터마크(t) 등 복원에 필요한 정보
+        """
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            meta = dict(meta, seq=self.seq, saved_at=int(time.time() * 1000))
+            tmp_path = self.snapshot_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": SNAPSHOT_VERSION, "meta": meta, "data": data}, f,
+                          ensure_ascii=False, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            open(self.journal_path, "w", encoding="utf-8").close()
+            self.journal_entries = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            # 구현: 슬롯 잠금을 풀어 다른(재시작한) 워커가 이 슬롯의 스냅샷을 이어 쓰게 함
+            if self._slot_lock is not None:
+                self._slot_lock.close()
+                self._slot_lock = None
+
+
+class JournaledReplica(StreamReplica):
+    """
+    변경 피드(changes/<key> = {t: 서버 시각, paths: 바뀐 경로})를 따라가며 미러를 갱신하고 디스크에 보존하는 복제본.
+
+    - 시작: 스냅샷+저널 복원 → 워터마크(t) 이후 변경 경로만 재조회 → 준비 완료
+    - 스냅샷이 없거나 노드 구성이 다르거나 피드 보존 기간보다 오래되었으면 노드 전체를 한 번 받아 새 스냅샷 저장
+    - 이후 changes 스트림(orderBy t, startAt 워터마크 - margin)으로 들어오는 경로를 재조회해 반영하고 저널에 추가
+    변경 피드에 기록되지 않는 쓰기(콘솔 직접 수정, DB_CHANGE_FEED가 꺼진 프로세스)는 반영되지 않습니다.
+    :param store: (SnapshotStore) 스냅샷/저널 저장소
+    :param retention_days: (float) 변경 피드 보존 일수 (이보다 오래된 스냅샷은 버림)
+    :param margin_ms: (int) 워터마크를 이만큼 앞당겨 구독 (쓰기 순서와 서버 시각이 어긋나는 경우 대비, 재조회는 멱등)
+    :param compact_every: (int) 저널이 이 줄 수를 넘으면 새 스냅샷으로 압축
+    :param node_fetch_threshold: (int) 한 번에 바뀐 경로가 이보다 많은 노드는 노드 전체를 다시 조회
+    """
+
+    def __init__(self, handler, nodes: Iterable[str] = REPLICA_NODES, store: Optional[SnapshotStore] = None,
+                 retention_days: float = 7.0, margin_ms: int = 5000, compact_every: int = 1000,
+                 node_fetch_threshold: int = 100):
+        super().__init__(handler, nodes)
+        self.store = store or SnapshotStore(os.path.join(".", "replica"))
+        self.retention_ms = int(retention_days * 86400 * 1000)
+        self.margin_ms = margin_ms
+        self.compact_every = compact_every
+        self.node_fetch_threshold = node_fetch_threshold
+        self.watermark: Optional[int] = None
+        self.restored_from_disk = False
+        self._restored = False
+
+    def start(self, wait: Optional[float] = None) -> "JournaledReplica":
+        thread = threading.Thread(target=self._run_feed, name="replica-changes", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        if wait:
+            self.wait_ready(wait)
+        return self
+
+    def stop(self) -> None:
+        """스트림을 닫고, 복원이 끝난 상태라면 마지막 상태를 스냅샷으로 저장합니다."""
+        super().stop()
+        if self._restored:
+            self.compact()
+        self.store.close()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats["feed"] = {
+            "watermark": self.watermark,
+            "journal_entries": self.store.journal_entries,
+            "restored_from_disk": self.restored_from_disk,
+        }
+        return stats
+
+    def compact(self) -> None:
+        """현재 미러를 새 스냅샷으로 저장하고 저널을 비웁니다."""
+        with self._lock:
+            data = {node: self._data.get(node) for node in self.nodes}
+        # 구현: 미러는 경로 복사로만 바뀌므로 잠금 밖에서 직렬화해도 안전
+        self.store.save(data, {"t": self.watermark, "nodes": list(self.nodes)})
+
+    # ==========================================================
+    # 복원
+    # ==========================================================
+
+    def _set_ready(self, ready: bool) -> None:
+        for node in self.nodes:
+            if ready:
+                self._ready[node].set()
+            else:
+                self._ready[node].clear()
+
+    def _restore(self) -> None:
+        started = time.perf_counter()
+        data, meta = self.store.load()
+        usable = (
+            data is not None
+            and set(self.nodes) <= set(data)
+            and meta.get("t") is not None
+            and time.time() * 1000 - meta["t"] < self.retention_ms
+        )
+        if not usable:
+            self._full_load()
+            return
+        with self._lock:
+            self._data = {node: data[node] for node in self.nodes}
+        self.watermark = meta["t"]
+        self.restored_from_disk = True
+        logger.info("Restored replica snapshot (%d journal entries) in %.1f ms",
+                    self.store.journal_entries, (time.perf_counter() - started) * 1000)
+
+    def _full_load(self) -> None:
+        db = self._handler.db
+        # 구현: 전체 조회 전에 최신 변경 시각을 먼저 잡아, 조회 중에 생긴 변경은 스트림에서 다시 받도록 함
+        latest = db.child("changes").order_by_child("t").limit_to_last(1).get().val()
+        times = [entry.get("t") for entry in (latest.values() if isinstance(latest, dict) else [])
+                 if isinstance(entry, dict) and isinstance(entry.get("t"), (int, float))]
+        watermark = int(max(times)) if times else int(time.time() * 1000)
+        values = fan_map(lambda node: self._handler.db.child(node).get().val(), self.nodes)
+        with self._lock:
+            self._data = dict(zip(self.nodes, values))
+        self.watermark = watermark
+        self.store.save(dict(self._data), {"t": watermark, "nodes": list(self.nodes)})
+        logger.info("Loaded replica nodes %s from Firebase", ", ".join(self.nodes))
+
+    # ==========================================================
+    # 변경 피드 처리
+    # ==========================================================
+
+    def _run_feed(self) -> None:
+        self._supervise("changes", self._follow_feed, lambda: self._set_ready(False))
+
+    def _follow_feed(self) -> None:
+        if not self._restored:
+            self._restore()
+            self._restored = True
+            # 구현: 복원 결과(잘린 저널 꼬리 정리 포함)를 새 스냅샷으로 확정
+            self.compact()
+        start_at = max((self.watermark or 0) - self.margin_ms, 0)
+        query = self._handler.db.child("changes").order_by_child("t").start_at(start_at)
+        self._stream("changes", query, self._on_feed_event)
+
+    def _on_feed_event(self, event: str, payload: Dict[str, Any]) -> None:
+        path = _split(payload.get("path"))
+        data = payload.get("data")
+        # 구현: 스트림 데이터를 changes/<key> 항목 목록으로 정규화 (항목 내부 필드만 바뀐 이벤트는 무시)
+        if not path and isinstance(data, dict):
+            entries = list(data.values())
+        elif len(path) == 1 and event == "put":
+            entries = [data]
+        else:
+            entries = []
+        self._apply_changes([entry for entry in entries if isinstance(entry, dict)])
+        if not self.ready(*self.nodes):
+            logger.info("Replica caught up with the change feed (watermark %s)", self.watermark)
+            self._set_ready(True)
+
+    def _fetch_targets(self, paths) -> list:
+        """바뀐 경로를 다시 조회할 대상 경로로 정리합니다. (변경이 많은 노드는 노드 전체, 상위 경로부터)"""
+        by_node = {}
+        for path in paths:
+            parts = _split(path)
+            if parts and parts[0] in self.nodes:
+                by_node.setdefault(parts[0], set()).add("/".join(parts))
+        targets = []
+        for node, node_paths in by_node.items():
+            if node in node_paths or len(node_paths) > self.node_fetch_threshold:
+                targets.append(node)
+            else:
+                targets.extend(node_paths)
+        return sorted(targets, key=lambda p: (p.count("/"), p))
+
+    def _apply_changes(self, entries) -> None:
+        paths, t = set(), None
+        for entry in entries:
+            entry_paths = entry.get("paths")
+            if isinstance(entry_paths, dict):
+                entry_paths = entry_paths.values()
+            paths.update(p for p in entry_paths or () if isinstance(p, str))
+            if isinstance(entry.get("t"), (int, float)):
+                t = max(t or 0, int(entry["t"]))
+
+        # 구현: 바뀐 경로의 현재 값을 동시에 조회 (순서와 무관하게 최신 값으로 수렴, 재적용해도 안전)
+        targets = self._fetch_targets(paths)
+        values = fan_map(lambda path: self._handler.db.child(path).get().val(), targets)
+        updates = dict(zip(targets, values))
+        if updates:
+            with self._lock:
+                for path, value in updates.items():
+                    parts = _split(path)
+                    self._data[parts[0]] = _assign(self._data.get(parts[0]), parts[1:], value)
+                    self.events[parts[0]] += 1
+        if t is not None and t > (self.watermark or 0):
+            self.watermark = t
+        if updates or t is not None:
+            self.store.append(updates, self.watermark)
+        if self.store.journal_entries >= self.compact_every:
+            self.compact()
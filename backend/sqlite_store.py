@@ -0,0 +1,584 @@
+import argparse
+import contextlib
+import copy
+import json
+import logging
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from metrics import observe_db_request
+from query_engine import PUSH_CHARS, _etag, _key_order, apply_query
+
+logger = logging.getLogger(__name__)
+
+# 모듈 요약: DBhandler가 Firebase 대신 쓸 수 있는 로컬 SQLite 저장소입니다. (단일 노드 배포/개발/벤치마크용)
+# DBhandler의 모든 메서드가 Realtime Database 경로 모델("노드/키/...")로 작성되어 있으므로,
+# 같은 경로 모델을 유지한 채 최상위 노드의 자식 하나(item/<키>, user/<ID>, likes/<상품> 등)를 문서 한 행으로 저장합니다.
+# - 기본 키 (node, key): 사용자 ID(user/<ID>), 판매/구매 인덱스(items_by_author|items_by_buyer/<ID>),
+#   찜 역인덱스(user_likes/<사용자>/<상품>) 단건 조회와 orderByKey 범위 조회
+# - likes_index (item, user): 찜(likes/<상품>/<사용자>)을 사용자 단위 행으로도 저장해, 찜 여부 확인이
+#   인기 상품의 찜 문서 전체를 읽지 않도록 함 (같은 트랜잭션에서 docs와 함께 갱신)
+# - INDEXED_FIELDS: orderByChild 쿼리에 쓰는 필드별 부분 인덱스 (database.rules.json의 .indexOn과 같은 역할)
+# 다중 경로 update, 조건부 쓰기(ETag), 서버 값(.sv timestamp/increment)은 SQLite 트랜잭션 하나로 원자적으로 적용됩니다.
+# 쿼리/ETag 규칙은 Firebase 대역 서버(firebase_standin)와 같은 구현(query_engine)을 사용합니다. 스트림(복제본)은 지원하지 않으며 DBhandler.enable_replica가 이 백엔드에서는 켜지 않습니다.
+# 사용법: DB_BACKEND=sqlite DB_SQLITE_PATH=./market.sqlite3 python backend/app.py
+#        python backend/sqlite_store.py import export.json   (Firebase 콘솔에서 내보낸 JSON 가져오기)
+
+INDEXED_FIELDS = {
+    "item": ("author", "buyer", "category", "created_at", "created_key", "category_key"),
+    "item_summary": ("created_key", "category_key"),
+    "review": ("latest_key", "rating_key"),
+    "changes": ("t",),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    node TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (node, key)
+) WITHOUT ROWID
+"""
+
+# 찜 여부 (상품, 사용자) 인덱스: likes/<상품> 문서의 자식을 한 행씩 저장합니다. (사용자 -> 상품 방향은 user_likes 노드)
+LIKES_NODE = "likes"
+LIKES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS likes_index (
+    item TEXT NOT NULL,
+    user TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (item, user)
+) WITHOUT ROWID
+"""
+
+# 최상위 노드 자체가 원시 값(예: review_count)일 때 쓰는 키 (Firebase 키는 빈 문자열일 수 없음)
+NODE_VALUE_KEY = ""
+
+
+def _split(path: str) -> List[str]:
+    """'a/b/c' 형태의 경로를 ['a', 'b', 'c']로 분해합니다."""
+    return [p for p in str(path or "").strip("/").split("/") if p]
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _literal(text: str) -> str:
+    """SQL 문자열 리터럴. (부분 인덱스와 쿼리의 WHERE가 같은 상수여야 인덱스를 사용)"""
+    return "'" + text.replace("'", "''") + "'"
+
+
+def _extract(field: str) -> str:
+    """orderByChild 필드('a' 또는 'a/b')의 json_extract 식."""
+    json_path = "$" + "".join('."' + p.replace('"', '\\"') + '"' for p in _split(field))
+    return f"json_extract(value, {_literal(json_path)})"
+
+
+def _index_name(node: str, field: str) -> str:
+    return '"docs_' + re.sub(r"\W", "_", f"{node}__{field}") + '"'
+
+
+def _get_in(value: Any, parts: List[str]) -> Any:
+    for p in parts:
+        if isinstance(value, list) and p.isdigit() and int(p) < len(value):
+            value = value[int(p)]
+        elif isinstance(value, dict):
+            value = value.get(p)
+        else:
+            return None
+    return value
+
+
+def _prune(value: Any) -> Any:
+    """None 값과 빈 객체를 제거합니다. (Firebase는 빈 노드를 저장하지 않음)"""
+    if isinstance(value, dict):
+        out = {k: v for k, v in ((k, _prune(v)) for k, v in value.items()) if v is not None}
+        return out or None
+    return value
+
+
+def _assign(doc: Any, parts: List[str], value: Any) -> Any:
+    """doc의 parts 위치를 value로 바꾼 새 값을 반환합니다. (비어버린 상위 객체는 None)"""
+    if not parts:
+        return value
+    if isinstance(doc, list):
+        doc = {str(i): v for i, v in enumerate(doc) if v is not None}
+    doc = dict(doc) if isinstance(doc, dict) else {}
+    child = _assign(doc.get(parts[0]), parts[1:], value)
+    if child is None:
+        doc.pop(parts[0], None)
+    else:
+        doc[parts[0]] = child
+    return doc or None
+
+
+def _has_server_value(value: Any) -> bool:
+    return isinstance(value, dict) and (".sv" in value or any(_has_server_value(v) for v in value.values()))
+
+
+def _resolve(value: Any, current: Any, now: int) -> Any:
+    """서버 값({'.sv': 'timestamp'} / {'.sv': {'increment': n}})을 current 기준의 실제 값으로 치환합니다."""
+    if isinstance(value, dict):
+        sv = value.get(".sv")
+        if sv == "timestamp":
+            return now
+        if isinstance(sv, dict) and "increment" in sv:
+            base = current if isinstance(current, (int, float)) and not isinstance(current, bool) else 0
+            return base + sv["increment"]
+        return {k: _resolve(v, current.get(k) if isinstance(current, dict) else None, now) for k, v in value.items()}
+    return value
+
+
+def _apply(value: Any, params: Dict[str, Any]) -> Any:
+    """쿼리 파라미터(파이썬 값)를 query_engine.apply_query(JSON 인코딩 문자열) 형식으로 바꿔 적용합니다."""
+    encoded = {}
+    for name, param in params.items():
+        if name == "shallow":
+            encoded[name] = "true" if param else "false"
+        elif name in ("limitToFirst", "limitToLast"):
+            encoded[name] = str(param)
+        else:
+            encoded[name] = json.dumps(param)
+    return apply_query(value, encoded)
+
+
+class SQLiteStore:
+    """
+    JSON 트리를 (node, key) 문서 행으로 저장하는 SQLite 저장소. (스레드마다 별도 연결, WAL 모드)
+    get/update/set은 Firebase REST 응답과 같은 형태의 값을 반환하며, AsyncDBhandler는 request()로 호출합니다.
+
+    Environment:
+      DB_SQLITE_TIMEOUT: 쓰기 잠금을 기다릴 최대 초 (기본: 5)
+    """
+
+    def __init__(self, path: str, timeout: Optional[float] = None, indexed_fields: Dict[str, Tuple[str, ...]] = INDEXED_FIELDS):
+        self.path = path
+        self.timeout = timeout if timeout is not None else float(os.getenv("DB_SQLITE_TIMEOUT", 5))
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.indexed_fields = indexed_fields
+        self._counters = {"requests": 0, "failures": 0, "conflicts": 0}
+        self._last_push_time = 0
+        self._last_rand_chars: List[int] = []
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._transaction(write=True) as conn:
+            conn.execute(SCHEMA)
+            created = not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'likes_index'").fetchone()
+            conn.execute(LIKES_SCHEMA)
+            if created:
+                # 구현: 인덱스 테이블이 없던 파일은 기존 찜 문서로 채움
+                rows = conn.execute("SELECT key, value FROM docs WHERE node = ? AND key != ?",
+                                    (LIKES_NODE, NODE_VALUE_KEY)).fetchall()
+                for item, raw in rows:
+                    self._index_likes(conn, item, json.loads(raw))
+            for node, fields in indexed_fields.items():
+                for field in fields:
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS {_index_name(node, field)} "
+                                 f"ON docs({_extract(field)}, key) WHERE node = {_literal(node)}")
+
+    # -- 연결/트랜잭션 -----------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextlib.contextmanager
+    def _transaction(self, write: bool = False):
+        """읽기는 일관된 스냅샷(BEGIN), 쓰기는 처음부터 쓰기 잠금(BEGIN IMMEDIATE)으로 실행합니다."""
+        conn = self._connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @contextlib.contextmanager
+    def _counted(self, method: str, path: str, params: Optional[Dict[str, Any]] = None):
+        self._count("requests")
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self._count("failures")
+            raise
+        finally:
+            observe_db_request(None, time.perf_counter() - started, method, path=path, params=params)
+
+    def _count(self, field: str) -> None:
+        with self._lock:
+            self._counters[field] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """요청/실패/조건부 쓰기 충돌 횟수를 반환합니다."""
+        with self._lock:
+            return dict(self._counters, backend="sqlite", path=self.path)
+
+    # -- 경로 읽기/쓰기 ----------------------------------------------------
+
+    def _read(self, conn: sqlite3.Connection, parts: List[str]) -> Any:
+        if not parts:
+            root: Dict[str, Any] = {}
+            for node, key, raw in conn.execute("SELECT node, key, value FROM docs ORDER BY node, key"):
+                if key == NODE_VALUE_KEY:
+                    root[node] = json.loads(raw)
+                else:
+                    root.setdefault(node, {})[key] = json.loads(raw)
+            return root or None
+        if len(parts) == 1:
+            rows = conn.execute("SELECT key, value FROM docs WHERE node = ? ORDER BY key", (parts[0],)).fetchall()
+            if rows and rows[0][0] == NODE_VALUE_KEY:
+                return json.loads(rows[0][1])
+            return {key: json.loads(raw) for key, raw in rows} or None
+        if parts[0] == LIKES_NODE and len(parts) == 3:
+            row = conn.execute("SELECT value FROM likes_index WHERE item = ? AND user = ?", (parts[1], parts[2])).fetchone()
+            return json.loads(row[0]) if row else None
+        row = conn.execute("SELECT value FROM docs WHERE node = ? AND key = ?", (parts[0], parts[1])).fetchone()
+        return _get_in(json.loads(row[0]), parts[2:]) if row else None
+
+    def _index_likes(self, conn: sqlite3.Connection, item: Optional[str], doc: Any) -> None:
+        """likes_index에서 상품 item(None이면 전체)의 행을 찜 문서 doc(None이면 삭제)의 자식으로 바꿉니다."""
+        if item is None:
+            conn.execute("DELETE FROM likes_index")
+        else:
+            conn.execute("DELETE FROM likes_index WHERE item = ?", (item,))
+        if isinstance(doc, dict):
+            conn.executemany("INSERT INTO likes_index (item, user, value) VALUES (?, ?, ?)",
+                             [(item, user, _dumps(value)) for user, value in doc.items()])
+
+    def _write(self, conn: sqlite3.Connection, parts: List[str], value: Any) -> None:
+        """parts 위치를 value(서버 값 치환과 정리가 끝난 값, None이면 삭제)로 덮어씁니다."""
+        if not parts:
+            conn.execute("DELETE FROM docs")
+            self._index_likes(conn, None, None)
+            for node, child in (value if isinstance(value, dict) else {}).items():
+                self._write(conn, [node], child)
+            return
+        node = parts[0]
+        if len(parts) == 1:
+            conn.execute("DELETE FROM docs WHERE node = ?", (node,))
+            if isinstance(value, dict):
+                conn.executemany("INSERT INTO docs (node, key, value) VALUES (?, ?, ?)",
+                                 [(node, key, _dumps(child)) for key, child in value.items()])
+            elif value is not None:
+                conn.execute("INSERT INTO docs (node, key, value) VALUES (?, ?, ?)", (node, NODE_VALUE_KEY, _dumps(value)))
+            if node == LIKES_NODE:
+                self._index_likes(conn, None, None)
+                for item, doc in (value if isinstance(value, dict) else {}).items():
+                    self._index_likes(conn, item, doc)
+            return
+        # 구현: 노드 아래에 자식을 쓰면 노드 자체의 원시 값은 사라짐 (Firebase와 같음)
+        conn.execute("DELETE FROM docs WHERE node = ? AND key = ?", (node, NODE_VALUE_KEY))
+        key = parts[1]
+        leaf = value
+        if len(parts) > 2:
+            row = conn.execute("SELECT value FROM docs WHERE node = ? AND key = ?", (node, key)).fetchone()
+            value = _assign(json.loads(row[0]) if row else None, parts[2:], value)
+        if value is None:
+            conn.execute("DELETE FROM docs WHERE node = ? AND key = ?", (node, key))
+        else:
+            conn.execute("INSERT OR REPLACE INTO docs (node, key, value) VALUES (?, ?, ?)", (node, key, _dumps(value)))
+        if node == LIKES_NODE:
+            # 구현: 찜 한 건(likes/<상품>/<사용자>)은 그 행만, 그 밖의 쓰기는 상품의 행 전체를 다시 씀
+            if len(parts) == 3 and leaf is None:
+                conn.execute("DELETE FROM likes_index WHERE item = ? AND user = ?", (key, parts[2]))
+            elif len(parts) == 3:
+                conn.execute("INSERT OR REPLACE INTO likes_index (item, user, value) VALUES (?, ?, ?)",
+                             (key, parts[2], _dumps(leaf)))
+            else:
+                self._index_likes(conn, key, value)
+
+    # -- 쿼리 --------------------------------------------------------------
+
+    def _query(self, conn: sqlite3.Connection, parts: List[str], params: Dict[str, Any]) -> Any:
+        if params.get("shallow"):
+            if len(parts) == 1:
+                keys = [key for (key,) in conn.execute("SELECT key FROM docs WHERE node = ? ORDER BY key", (parts[0],))]
+                if keys != [NODE_VALUE_KEY]:
+                    return {key: True for key in keys} or None
+            value = self._read(conn, parts)
+            return {key: True for key in value} if isinstance(value, dict) else value
+        if params.get("orderBy") is None:
+            return self._read(conn, parts)
+        if len(parts) == 1:
+            rows = self._indexed_rows(conn, parts[0], params)
+            if rows is not None:
+                # 구현: 인덱스로 좁힌 후보에 같은 쿼리를 다시 적용해 키 정렬/경계 규칙을 Firebase와 맞춤
+                return _apply(rows, params)
+        return _apply(self._read(conn, parts), params)
+
+    def _indexed_rows(self, conn: sqlite3.Connection, node: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        최상위 노드에 대한 orderByKey/orderByChild 쿼리의 후보 행을 인덱스로 조회합니다.
+        :return: (dict) 키 -> 값 (인덱스로 처리할 수 없는 쿼리는 None → 노드 전체에 쿼리 적용)
+        """
+        order_by = params["orderBy"]
+        bounds = [params[name] for name in ("startAt", "endAt", "equalTo") if name in params]
+        if order_by == "$value" or any(isinstance(b, (bool, dict, list)) for b in bounds):
+            return None
+        if "limitToFirst" in params and "limitToLast" in params:
+            return None
+        select = "SELECT key, value FROM docs{} WHERE node = " + _literal(node) + " AND key != " + _literal(NODE_VALUE_KEY)
+
+        if order_by == "$key":
+            # 구현: 문자열 경계는 기본 키 범위로 조회 (정수 키 정렬 차이는 _apply가 다시 걸러냄)
+            where, args = [], []
+            low = params.get("equalTo", params.get("startAt"))
+            high = params.get("equalTo", params.get("endAt"))
+            if isinstance(low, str) and _key_order(low)[0] == 1:
+                where.append("key >= ?")
+                args.append(low)
+            if isinstance(high, str) and _key_order(high)[0] == 1:
+                where.append("key <= ?")
+                args.append(high)
+            sql = select.format("") + "".join(f" AND {w}" for w in where) + " ORDER BY key"
+            return {key: json.loads(raw) for key, raw in conn.execute(sql, args)}
+
+        expr = _extract(order_by)
+        where, args = [], []
+        if "equalTo" in params:
+            if params["equalTo"] is None:
+                where.append(f"{expr} IS NULL")
+            else:
+                where.append(f"{expr} = ?")
+                args.append(params["equalTo"])
+        low = params.get("startAt")
+        if low is not None:
+            where.append(f"{expr} >= ?")
+            args.append(low)
+        if "endAt" in params:
+            high = params["endAt"]
+            if high is None:
+                where.append(f"{expr} IS NULL")
+            elif low is None:
+                # 구현: 하한이 없으면 필드가 없는(null) 자식도 포함 (Firebase 정렬에서 null이 가장 앞)
+                where.append(f"({expr} IS NULL OR {expr} <= ?)")
+                args.append(high)
+            else:
+                where.append(f"{expr} <= ?")
+                args.append(high)
+        # 구현: 통계(ANALYZE)가 없으면 플래너가 기본 키(node) 검색을 고르므로, 인덱스가 있는 필드는 명시적으로 지정
+        indexed = order_by in self.indexed_fields.get(node, ())
+        sql = select.format(f" INDEXED BY {_index_name(node, order_by)}" if indexed else "") + "".join(f" AND {w}" for w in where)
+        if "limitToLast" in params:
+            sql += f" ORDER BY {expr} DESC, key DESC LIMIT ?"
+            args.append(int(params["limitToLast"]))
+            rows = conn.execute(sql, args).fetchall()[::-1]
+        else:
+            sql += f" ORDER BY {expr}, key"
+            if "limitToFirst" in params:
+                sql += " LIMIT ?"
+                args.append(int(params["limitToFirst"]))
+            rows = conn.execute(sql, args).fetchall()
+        return {key: json.loads(raw) for key, raw in rows}
+
+    # -- 공개 연산 ---------------------------------------------------------
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        경로의 값을 조회합니다. (REST GET 응답과 같은 형태: shallow면 {키: True}, 정렬 쿼리면 정렬된 dict)
+        :param params: (dict) orderBy/startAt/endAt/equalTo/limitToFirst/limitToLast/shallow (파이썬 값)
+        """
+        with self._counted("GET", path, params), self._transaction() as conn:
+            return self._query(conn, _split(path), params or {})
+
+    def etag(self, path: str) -> Tuple[str, Any]:
+        """경로의 (ETag, 값)을 반환합니다."""
+        with self._counted("GET", path), self._transaction() as conn:
+            value = self._read(conn, _split(path))
+        return _etag(value), value
+
+    def update(self, path: str, updates: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        path 기준 상대 경로들에 값을 한 트랜잭션으로 씁니다. (None은 삭제)
+        :return: (dict) 서버 값을 치환한 updates
+        """
+        parts = _split(path)
+        with self._counted("PATCH", path), self._transaction(write=True) as conn:
+            now = int(time.time() * 1000)
+            resolved = {}
+            for rel, value in updates.items():
+                current = self._read(conn, parts + _split(rel)) if _has_server_value(value) else None
+                resolved[rel] = _resolve(value, current, now)
+            for rel, value in resolved.items():
+                self._write(conn, parts + _split(rel), _prune(copy.deepcopy(value)))
+        return resolved
+
+    def set(self, path: str, value: Any, if_match: Optional[str] = None) -> Tuple[bool, Any]:
+        """
+        경로를 value로 덮어씁니다. (None이면 삭제)
+        :param if_match: (str) 지정하면 현재 ETag가 같을 때만 씀
+        :return: (tuple) (성공 여부, 쓴 값 또는 ETag 불일치 시 현재 값)
+        """
+        parts = _split(path)
+        with self._counted("PUT", path), self._transaction(write=True) as conn:
+            needs_current = if_match is not None or _has_server_value(value)
+            current = self._read(conn, parts) if needs_current else None
+            if if_match is not None and if_match != _etag(current):
+                self._count("conflicts")
+                return False, current
+            value = _prune(_resolve(copy.deepcopy(value), current, int(time.time() * 1000)))
+            self._write(conn, parts, value)
+        return True, value
+
+    def request(self, method: str, path: str, params: Optional[Dict[str, Any]] = None, body: Any = None) -> Any:
+        """REST 요청 하나를 처리하고 REST 응답과 같은 JSON 값을 반환합니다. (AsyncDBhandler용)"""
+        if method == "GET":
+            return self.get(path, params)
+        if method == "PATCH":
+            return self.update(path, body or {})
+        if method == "PUT":
+            return self.set(path, body)[1]
+        if method == "DELETE":
+            self.set(path, None)
+            return None
+        if method == "POST":
+            key = self.generate_key()
+            self.set(f"{path}/{key}", body)
+            return {"name": key}
+        raise ValueError(f"Unsupported method: {method}")
+
+    def generate_key(self) -> str:
+        """Firebase push ID와 같은 규칙(시각 8자 + 난수 12자, 같은 밀리초에는 증가)으로 키를 만듭니다."""
+        with self._lock:
+            now = int(time.time() * 1000)
+            if now != self._last_push_time or not self._last_rand_chars:
+                self._last_rand_chars = [random.randrange(64) for _ in range(12)]
+            else:
+                for i in reversed(range(12)):
+                    if self._last_rand_chars[i] < 63:
+                        self._last_rand_chars[i] += 1
+                        break
+                    self._last_rand_chars[i] = 0
+            self._last_push_time = now
+            stamp = "".join(PUSH_CHARS[(now >> (6 * i)) % 64] for i in reversed(range(8)))
+            return stamp + "".join(PUSH_CHARS[c] for c in self._last_rand_chars)
+
+
+class _LocalResponse:
+    """pyrebase PyreResponse.val()과 같은 형태의 값을 돌려주는 응답."""
+
+    def __init__(self, value):
+        self._value = value
+
+    def val(self):
+        return self._value
+
+
+class SQLiteDatabase:
+    """SQLiteStore를 pyrebase Database와 같은 쿼리 빌더 API로 제공합니다. 호출마다 새 객체를 반환하므로 공유해도 안전합니다."""
+
+    def __init__(self, store: SQLiteStore, path: str = "", params: Optional[Dict[str, Any]] = None):
+        self.store = store
+        self._path = path
+        self._params = params or {}
+
+    def _with(self, **params):
+        return SQLiteDatabase(self.store, self._path, dict(self._params, **params))
+
+    def child(self, *args):
+        parts = [self._path] if self._path else []
+        parts += [str(arg) for arg in args]
+        return SQLiteDatabase(self.store, "/".join(parts), self._params)
+
+    def order_by_key(self):
+        return self._with(orderBy="$key")
+
+    def order_by_value(self):
+        return self._with(orderBy="$value")
+
+    def order_by_child(self, order):
+        return self._with(orderBy=order)
+
+    def start_at(self, start):
+        return self._with(startAt=start)
+
+    def end_at(self, end):
+        return self._with(endAt=end)
+
+    def equal_to(self, equal):
+        return self._with(equalTo=equal)
+
+    def limit_to_first(self, limit_first):
+        return self._with(limitToFirst=limit_first)
+
+    def limit_to_last(self, limit_last):
+        return self._with(limitToLast=limit_last)
+
+    def shallow(self):
+        return self._with(shallow=True)
+
+    def get(self):
+        value = self.store.get(self._path, self._params)
+        # 구현: pyrebase와 같이 shallow 조회는 키 목록으로 반환
+        if self._params.get("shallow") and isinstance(value, dict):
+            value = value.keys()
+        return _LocalResponse(value)
+
+    def update(self, data):
+        return self.store.update(self._path, data)
+
+    def set(self, data):
+        return self.store.set(self._path, data)[1]
+
+    def remove(self):
+        self.store.set(self._path, None)
+
+    def push(self, data):
+        return self.store.request("POST", self._path, body=data)
+
+    def generate_key(self):
+        return self.store.generate_key()
+
+    def get_etag(self):
+        etag, value = self.store.etag(self._path)
+        return {"ETag": etag, "value": value}
+
+    def conditional_set(self, data, etag):
+        # 구현: pyrebase와 같이 ETag 불일치 시 {"ETag", "value"}(현재 값)를 반환
+        ok, value = self.store.set(self._path, data, if_match=etag)
+        return value if ok else {"ETag": _etag(value), "value": value}
+
+    def conditional_remove(self, etag):
+        ok, value = self.store.set(self._path, None, if_match=etag)
+        return None if ok else {"ETag": _etag(value), "value": value}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SQLite 저장소 가져오기/내보내기")
+    parser.add_argument("command", choices=["import", "export"], help="import: JSON 트리 가져오기, export: JSON으로 내보내기")
+    parser.add_argument("file", help="JSON 파일 (Firebase 콘솔의 JSON 내보내기 형식)")
+    parser.add_argument("--path", default=os.getenv("DB_SQLITE_PATH", os.path.join("./backend", "ewhamarket.sqlite3")),
+                        help="SQLite 파일 경로 (기본: DB_SQLITE_PATH)")
+    args = parser.parse_args()
+
+    store = SQLiteStore(args.path)
+    if args.command == "import":
+        with open(args.file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        store.set("", data)
+        print(f"import: {len(data or {})}개 최상위 노드를 {args.path}에 기록")
+    else:
+        with open(args.file, "w", encoding="utf-8") as f:
+            json.dump(store.get(""), f, ensure_ascii=False)
+        print(f"export: {args.path} -> {args.file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+import argparse
+import hashlib
+import json
+import logging
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict
+
+from database import (ITEM_COUNT_TOTAL, _item_sort_fields, _item_summary, _review_sort_fields, _safe_key,
+                      _user_public_fields)
+
+logger = logging.getLogger(__name__)
+
+# 모듈 요약: 벤치마크용 대규모 합성 데이터셋을 결정적으로(같은 시드 → 같은 트리) 생성합니다.
+# 사용자/상품/찜/리뷰 원본과 함께, DBhandler의 쓰기 경로가 유지하는 파생 노드
+# (user_public, item_summary, item_counts, items_by_author/buyer, user_likes, like_count, reviews_by_writer, review_count)를
+# database.py의 같은 헬퍼로 만들어 마이그레이션 없이 바로 쓸 수 있습니다.
+# 모든 사용자의 비밀번호는 BENCH_PASSWORD이며, 찜은 인기 상품에 몰리도록 치우쳐 분포합니다.
+# 사용법: python backend/synthetic_data.py --scale 1.0 --out dump.json     (5만 사용자, 20만 상품, 200만 찜, 10만 리뷰)
+#        python backend/synthetic_data.py --scale 0.05 --serve --port 9000  (생성한 데이터로 Firebase 대역 서버 실행)
+#        python backend/synthetic_data.py --scale 0.05 --sqlite backend/bench.sqlite3
+
+BENCH_PASSWORD = "bench-password"
+FULL_SCALE = {"users": 50_000, "items": 200_000, "likes": 2_000_000, "reviews": 100_000}
+
+CATEGORIES = ("전공서적", "전자기기", "생활용품", "의류/잡화")
+REGIONS = ("ECC", "정문", "후문", "신촌", "기타")
+TRADE_METHODS = ("직거래", "택배")
+CONDITIONS = ("상태 최상", "약간의 하자", "사용감 있음")
+SOLD_STATUS = "거래 완료"
+START_TIME = datetime(2024, 3, 1, 9, 0, 0)
+
+
+def user_id(index: int) -> str:
+    return f"user{index:06d}"
+
+
+def item_key(index: int) -> str:
+    return f"item{index:07d}"
+
+
+def generate(users: int = FULL_SCALE["users"], items: int = FULL_SCALE["items"], likes: int = FULL_SCALE["likes"],
+             reviews: int = FULL_SCALE["reviews"], seed: int = 20240301) -> Dict[str, Any]:
+    """
+    합성 데이터 트리를 생성합니다.
+    :param users: (int) 사용자 수
+    :param items: (int) 상품 수 (판매자는 무작위 사용자)
+    :param likes: (int) 찜 수 (상품/사용자 쌍은 중복 없음, users * items보다 클 수 없음)
+    :param reviews: (int) 리뷰 수 (구매된 상품마다 구매자가 하나씩 작성, items보다 클 수 없음)
+    :param seed: (int) 난수 시드
+    :return: (dict) Realtime Database 루트 트리
+    """
+    if users < 2 or items < 1:
+        raise ValueError("users >= 2, items >= 1 이어야 합니다.")
+    likes = min(likes, users * items)
+    reviews = min(reviews, items)
+    rng = random.Random(seed)
+    pw_hash = hashlib.sha256(BENCH_PASSWORD.encode("utf-8")).hexdigest()
+
+    tree: Dict[str, Any] = {node: {} for node in (
+        "user", "user_public", "item", "item_summary", "item_counts", "items_by_author", "items_by_buyer",
+        "likes", "user_likes", "like_count", "review", "reviews_by_writer")}
+
+    # 구현: 사용자 (ID 키, user_public projection 포함)
+    for u in range(users):
+        uid = user_id(u)
+        info = {"id": uid, "pw": pw_hash, "email": f"{uid}@ewha.ac.kr", "phone": f"010-{u // 10000:04d}-{u % 10000:04d}",
+                "profile_img": ""}
+        tree["user"][uid] = info
+        tree["user_public"][uid] = _user_public_fields(info)
+
+    # 구현: 상품 (시간순 등록, 판매자 무작위) 및 구매 상태 - 리뷰 수 이상, 최소 30%가 판매 완료
+    sold = set(rng.sample(range(items), min(items, max(reviews, int(items * 0.3)))))
+    counts = {ITEM_COUNT_TOTAL: 0}
+    step = max(1, int(timedelta(days=365).total_seconds() // items))
+    for i in range(items):
+        key = item_key(i)
+        author = user_id(rng.randrange(users))
+        category = rng.choice(CATEGORIES)
+        info = {
+            "title": key,
+            "price": str(rng.randrange(1, 500) * 1000),
+            "region": rng.choice(REGIONS),
+            "status": rng.choice(CONDITIONS),
+            "desc": f"{category} 판매합니다. " * rng.randrange(1, 20),
+            "author": author,
+            "img_path": "",
+            "category": category,
+            "trade_method": rng.choice(TRADE_METHODS),
+            "created_at": (START_TIME + timedelta(seconds=i * step)).strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        if i in sold:
+            buyer = author
+            while buyer == author:
+                buyer = user_id(rng.randrange(users))
+            info.update(buyer=buyer, status=SOLD_STATUS)
+            tree["items_by_buyer"].setdefault(buyer, {})[key] = True
+        info.update(_item_sort_fields(key, info))
+        tree["item"][key] = info
+        tree["item_summary"][key] = _item_summary(info)
+        tree["items_by_author"].setdefault(author, {})[key] = info["status"]
+        counts[ITEM_COUNT_TOTAL] += 1
+        counts[_safe_key(category)] = counts.get(_safe_key(category), 0) + 1
+    tree["item_counts"] = counts
+
+    # 구현: 찜 - 상품 번호를 제곱 분포로 뽑아 일부 인기 상품에 몰리게 하고, 중복 쌍은 다시 뽑음
+    while likes > 0:
+        i = min(int(items * rng.random() ** 2), items - 1)
+        key, uid = item_key(i), user_id(rng.randrange(users))
+        likers = tree["likes"].setdefault(key, {})
+        if uid in likers:
+            continue
+        likers[uid] = True
+        tree["user_likes"].setdefault(uid, {})[key] = True
+        tree["like_count"][key] = tree["like_count"].get(key, 0) + 1
+        likes -= 1
+
+    # 구현: 리뷰 - 판매 완료 상품의 구매자가 작성 (키: '<상품 키>_<작성자>')
+    for i in sorted(sold)[:reviews]:
+        key = item_key(i)
+        writer = tree["item"][key]["buyer"]
+        review_key = f"{key}_{writer}"
+        created = datetime.strptime(tree["item"][key]["created_at"], "%Y-%m-%d %H:%M:%S") + timedelta(days=rng.randrange(1, 30))
+        info = {
+            "title": f"{key} 후기",
+            "rate": str(rng.choice((1, 2, 3, 3.5, 4, 4, 4.5, 5, 5, 5))),
+            "content": "좋은 거래였습니다. " * rng.randrange(1, 10),
+            "img_path": "",
+            "item_name": key,
+            "writer_id": writer,
+            "created_at": created.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        info.update(_review_sort_fields(review_key, info))
+        tree["review"][review_key] = info
+        tree["reviews_by_writer"].setdefault(writer, {})[key] = True
+    tree["review_count"] = len(tree["review"])
+    return {node: value for node, value in tree.items() if value}
+
+
+def scaled(scale: float, seed: int = 20240301) -> Dict[str, Any]:
+    """FULL_SCALE에 scale을 곱한 크기로 generate()를 호출합니다."""
+    sizes = {name: max(int(n * scale), 2) for name, n in FULL_SCALE.items()}
+    return generate(seed=seed, **sizes)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="벤치마크용 합성 데이터셋 생성")
+    parser.add_argument("--scale", type=float, default=1.0, help="전체 규모 배율 (1.0 = 5만 사용자/20만 상품/200만 찜/10만 리뷰)")
+    parser.add_argument("--seed", type=int, default=20240301, help="난수 시드 (같은 시드면 같은 데이터)")
+    parser.add_argument("--out", default=None, help="JSON으로 저장할 파일 (firebase_standin --data / Firebase 콘솔 가져오기 형식)")
+    parser.add_argument("--sqlite", default=None, help="기록할 SQLite 저장소 파일 (기존 내용은 덮어씀)")
+    parser.add_argument("--serve", action="store_true", help="생성한 데이터로 Firebase 대역 서버 실행")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", type=float, default=0.0, help="대역 서버 응답 지연(초)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if not (args.out or args.sqlite or args.serve):
+        parser.error("--out, --sqlite, --serve 중 하나 이상을 지정하세요.")
+    started = time.perf_counter()
+    data = scaled(args.scale, args.seed)
+    sizes = {node: len(data.get(node) or {}) for node in ("user", "item", "review")}
+    sizes["likes"] = sum(data.get("like_count", {}).values())
+    print(f"generated {sizes} in {time.perf_counter() - started:.1f}s (password: {BENCH_PASSWORD})")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        print(f"saved: {args.out}")
+    if args.sqlite:
+        from sqlite_store import SQLiteStore
+        SQLiteStore(args.sqlite).set("", data)
+        print(f"saved: {args.sqlite}")
+    if args.serve:
+        from firebase_standin import StandinServer
+        server = StandinServer(data, args.host, args.port, latency=args.latency)
+        print(f"Firebase stand-in listening on {server.url}")
+        server.httpd.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
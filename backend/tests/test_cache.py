@@ -0,0 +1,107 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cache import CachedDBhandler, TTLCache  # noqa: E402
+
+# 모듈 요약: CachedDBhandler의 태그 무효화와 진행 중 조회의 세대 검사를 확인합니다.
+# 원본 핸들러는 메모리 dict로 DBhandler의 리뷰/상품 경로 구성(리뷰 키 '<상품 키>_<작성자>')만 흉내 냅니다.
+
+
+class FakeHandler:
+    """상품 키 변경 시 리뷰와 작성자 인덱스를 새 키로 옮기는 최소한의 원본 핸들러."""
+
+    def __init__(self):
+        self.items = {"old": {"title": "책상", "author": "seller"}}
+        self.reviews = {"old_buyer": {"item_name": "old", "writer_id": "buyer", "title": "좋아요"}}
+        self.reviews_by_writer = {"buyer": {"old": True}}
+        self.loads = 0
+
+    def get_reviews_page(self, sort="latest", cursor=None, direction="next", per_page=4):
+        self.loads += 1
+        rows = [(key, dict(review)) for key, review in sorted(self.reviews.items())]
+        return {"items": rows[:per_page], "next_cursor": None, "prev_cursor": None}
+
+    def get_review_by_key(self, review_key):
+        review = self.reviews.get(review_key)
+        return dict(review) if review else None
+
+    def check_reviews_exist(self, item_names, user_id):
+        written = self.reviews_by_writer.get(user_id, {})
+        return {name: name in written for name in item_names or []}
+
+    def update_item(self, original_key, new_data, img_path, author_id, new_key=None, thumb_path=None):
+        target_key = new_key or original_key
+        self.items[target_key] = dict(self.items.pop(original_key), **new_data)
+        if target_key != original_key:
+            for review_key in [k for k, r in self.reviews.items() if r["item_name"] == original_key]:
+                review = self.reviews.pop(review_key)
+                review["item_name"] = target_key
+                self.reviews[f"{target_key}_{review['writer_id']}"] = review
+                written = self.reviews_by_writer[review["writer_id"]]
+                del written[original_key]
+                written[target_key] = True
+        return True
+
+
+class RenameInvalidationTest(unittest.TestCase):
+    def setUp(self):
+        self.handler = FakeHandler()
+        self.db = CachedDBhandler(self.handler)
+
+    def test_review_list_after_rename(self):
+        before = self.db.get_reviews_page()
+        self.assertEqual([r["item_name"] for _, r in before["items"]], ["old"])
+
+        self.db.update_item("old", {"title": "새 책상"}, None, "seller", new_key="new")
+
+        after = self.db.get_reviews_page()
+        self.assertEqual([key for key, _ in after["items"]], ["new_buyer"])
+        self.assertEqual([r["item_name"] for _, r in after["items"]], ["new"])
+
+    def test_review_and_writer_entries_after_rename(self):
+        self.assertIsNotNone(self.db.get_review_by_key("old_buyer"))
+        self.assertEqual(self.db.check_reviews_exist(["old", "new"], "buyer"), {"old": True, "new": False})
+
+        self.db.update_item("old", {"title": "새 책상"}, None, "seller", new_key="new")
+
+        self.assertIsNone(self.db.get_review_by_key("old_buyer"))
+        self.assertEqual(self.db.check_reviews_exist(["old", "new"], "buyer"), {"old": False, "new": True})
+
+
+class InFlightLoadTest(unittest.TestCase):
+    def test_load_overlapping_invalidate_is_not_stored(self):
+        handler = FakeHandler()
+        db = CachedDBhandler(handler)
+        real_load = handler.get_reviews_page
+
+        def load_then_write(*args, **kwargs):
+            # 구현: 조회 결과를 받은 뒤 저장하기 전에 다른 요청의 쓰기(무효화)가 끼어든 상황
+            page = real_load(*args, **kwargs)
+            db.update_item("old", {"title": "새 책상"}, None, "seller", new_key="new")
+            return page
+
+        handler.get_reviews_page = load_then_write
+        stale = db.get_reviews_page()
+        self.assertEqual([key for key, _ in stale["items"]], ["old_buyer"])
+
+        handler.get_reviews_page = real_load
+        fresh = db.get_reviews_page()
+        self.assertEqual([key for key, _ in fresh["items"]], ["new_buyer"])
+        self.assertEqual(handler.loads, 2)
+
+    def test_set_with_old_generation_is_skipped(self):
+        cache = TTLCache()
+        generation = cache.generation
+        cache.invalidate(("item", "x"))
+        cache.set(("items", "item", "x"), {"title": "old"}, [("item", "x")], generation)
+        self.assertEqual(cache.get(("items", "item", "x")), (False, None))
+
+        cache.set(("items", "item", "x"), {"title": "new"}, [("item", "x")], cache.generation)
+        self.assertEqual(cache.get(("items", "item", "x")), (True, {"title": "new"}))
+
+
+if __name__ == "__main__":
+    unittest.main()
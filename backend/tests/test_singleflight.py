@@ -0,0 +1,59 @@
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from singleflight import SingleFlight  # noqa: E402
+
+# 모듈 요약: 쓰기 뒤에 시작한 읽기가 쓰기 전에 출발한 진행 중 호출에 합쳐지지 않는지 확인합니다.
+
+
+class InvalidateTest(unittest.TestCase):
+    def test_call_after_invalidate_does_not_join_earlier_flight(self):
+        flights = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        results = {}
+
+        def stale_read():
+            started.set()
+            release.wait(5)
+            return "before write"
+
+        leader = threading.Thread(target=lambda: results.setdefault("leader", flights.do("item/a", stale_read)))
+        leader.start()
+        started.wait(5)
+
+        flights.invalidate()
+        results["after"] = flights.do("item/a", lambda: "after write")
+        release.set()
+        leader.join(5)
+
+        self.assertEqual(results, {"leader": "before write", "after": "after write"})
+        self.assertEqual(flights.stats(), {"coalesced": 0, "in_flight": 0})
+
+    def test_calls_without_invalidate_are_coalesced(self):
+        flights = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+
+        def read():
+            started.set()
+            release.wait(5)
+            return "value"
+
+        leader = threading.Thread(target=flights.do, args=("item/a", read))
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(target=flights.do, args=("item/a", lambda: "unused"))
+        follower.start()
+        while flights.stats()["coalesced"] == 0:
+            threading.Event().wait(0.001)
+        release.set()
+        leader.join(5)
+        follower.join(5)
+        self.assertEqual(flights.stats(), {"coalesced": 1, "in_flight": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
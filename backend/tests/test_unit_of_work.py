@@ -0,0 +1,58 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from unit_of_work import merge_updates  # noqa: E402
+
+# 모듈 요약: batch()가 모은 다중 경로 update에 상위/하위 경로가 함께 남지 않는지 확인합니다.
+
+
+def _overlapping(pending):
+    """pending에서 한쪽이 다른 쪽의 상위 경로인 쌍을 반환합니다. (Firebase가 거부하는 update)"""
+    paths = [p.split("/") for p in pending]
+    return [("/".join(a), "/".join(b)) for a in paths for b in paths if a != b and b[:len(a)] == a]
+
+
+class MergeUpdatesTest(unittest.TestCase):
+    def merged(self, *steps):
+        pending = {}
+        for updates in steps:
+            merge_updates(pending, updates)
+        self.assertEqual(_overlapping(pending), [])
+        return pending
+
+    def test_child_write_after_set_to_none(self):
+        pending = self.merged({"likes/item1": None}, {"likes/item1/u1": True})
+        self.assertEqual(pending, {"likes/item1": {"u1": True}})
+
+    def test_child_write_after_scalar(self):
+        pending = self.merged({"item/a/status": "판매중"}, {"item/a/status/extra": 1})
+        self.assertEqual(pending, {"item/a/status": {"extra": 1}})
+
+    def test_child_delete_after_set_to_none_stays_deleted(self):
+        pending = self.merged({"likes/item1": None}, {"likes/item1/u1": None})
+        self.assertEqual(pending, {"likes/item1": None})
+
+    def test_child_write_into_dict(self):
+        pending = self.merged({"item/a": {"title": "x"}}, {"item/a/price": 3})
+        self.assertEqual(pending, {"item/a": {"title": "x", "price": 3}})
+
+    def test_increment_under_pending_ancestor(self):
+        pending = self.merged({"like_count": {"a": 2}}, {"like_count/a": {".sv": {"increment": 1}}},
+                              {"like_count/b": {".sv": {"increment": -1}}})
+        self.assertEqual(pending, {"like_count": {"a": 3, "b": -1}})
+
+    def test_increments_on_same_path_are_summed(self):
+        pending = self.merged({"like_count/a": {".sv": {"increment": 1}}},
+                              {"like_count/a": {".sv": {"increment": 1}}})
+        self.assertEqual(pending, {"like_count/a": {".sv": {"increment": 2}}})
+
+    def test_parent_write_replaces_children(self):
+        pending = self.merged({"likes/item1/u1": True, "likes/item1/u2": True}, {"likes/item1": None})
+        self.assertEqual(pending, {"likes/item1": None})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import logging
+import os
+from typing import Optional
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow는 선택 의존성: 없으면 썸네일 없이 원본 이미지를 사용
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# 모듈 요약: 목록 페이지용 상품 이미지 썸네일을 만듭니다.
+# 업로드 폴더의 thumbs/ 아래에 긴 변이 THUMB_SIZE 이하인 축소본을 저장하고 정적 경로를 반환합니다.
+# Pillow가 설치되지 않았거나 변환에 실패하면 None을 반환하며, 이때 목록은 원본 이미지를 그대로 씁니다.
+
+THUMB_SIZE = int(os.getenv("THUMB_SIZE", 320))
+THUMB_DIR = "thumbs"
+
+
+def make_thumbnail(upload_folder: str, filename: str) -> Optional[str]:
+    """
+    업로드된 이미지의 썸네일을 만듭니다.
+    :param upload_folder: (str) 원본 이미지가 저장된 업로드 폴더
+    :param filename: (str) 원본 파일 이름
+    :return: (str) 썸네일 정적 경로 ("uploads/thumbs/<파일>") 또는 None (Pillow 없음/변환 실패)
+    """
+    if Image is None or not filename:
+        return None
+    save_dir = os.path.join(upload_folder, THUMB_DIR)
+    try:
+        os.makedirs(save_dir, exist_ok=True)
+        with Image.open(os.path.join(upload_folder, filename)) as image:
+            image.thumbnail((THUMB_SIZE, THUMB_SIZE))
+            # 구현: JPEG로 저장할 수 없는 모드(팔레트/투명도)는 RGB로 변환
+            if image.format == "JPEG" and image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            image.save(os.path.join(save_dir, filename))
+        return f"uploads/{THUMB_DIR}/{filename}"
+    except Exception:
+        logger.exception(f"썸네일 생성 실패: {filename}")
+        return None
@@ -0,0 +1,156 @@
+import logging
+import os
+import threading
+import time
+from typing import Optional, Dict, Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import TimeoutError as Urllib3Timeout
+from urllib3.util.retry import Retry
+
+from metrics import observe_db_request
+from singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# 모듈 요약: Firebase REST 호출에 쓰는 HTTP 전송 계층입니다.
+# keep-alive 연결 풀(워커 프로세스당 크기 지정), 연결/읽기 타임아웃,
+# 멱등 읽기(GET)의 제한된 재시도와 백오프, 같은 URL 동시 GET의 single-flight 합치기를 제공하며,
+# 풀 크기 조정을 위한 통계를 노출합니다.
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class TransportConfig:
+    """전송 계층 설정. 환경 변수에서 기본값을 읽습니다.
+
+    Environment:
+      DB_POOL_SIZE: 호스트당 유지할 keep-alive 연결 수 (기본: 10, 워커의 스레드 수 이상 권장)
+      DB_CONNECT_TIMEOUT / DB_READ_TIMEOUT: 연결/읽기 타임아웃 초 (기본: 3.05 / 10)
+      DB_READ_RETRIES: GET 재시도 횟수 (기본: 2)
+      DB_RETRY_BACKOFF: 재시도 백오프 계수 초 (기본: 0.2 → 0.2, 0.4, 0.8 ...)
+      DB_SINGLEFLIGHT: 1이면 같은 URL로 동시에 들어온 GET을 요청 하나로 합침 (기본: 1)
+    """
+
+    def __init__(self, pool_size: Optional[int] = None, connect_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None, read_retries: Optional[int] = None,
+                 retry_backoff: Optional[float] = None, singleflight: Optional[bool] = None):
+        self.pool_size = pool_size if pool_size is not None else int(os.getenv("DB_POOL_SIZE", 10))
+        self.connect_timeout = connect_timeout if connect_timeout is not None else float(os.getenv("DB_CONNECT_TIMEOUT", 3.05))
+        self.read_timeout = read_timeout if read_timeout is not None else float(os.getenv("DB_READ_TIMEOUT", 10))
+        self.read_retries = read_retries if read_retries is not None else int(os.getenv("DB_READ_RETRIES", 2))
+        self.retry_backoff = retry_backoff if retry_backoff is not None else float(os.getenv("DB_RETRY_BACKOFF", 0.2))
+        self.singleflight = singleflight if singleflight is not None else os.getenv("DB_SINGLEFLIGHT", "1") != "0"
+
+
+class _CountingRetry(Retry):
+    """타임아웃과 실제 재시도 횟수를 세션 통계에 기록하는 Retry."""
+
+    def __init__(self, *args, on_event=None, **kwargs):
+        self._on_event = on_event
+        super().__init__(*args, **kwargs)
+
+    def new(self, **kw):
+        retry = super().new(**kw)
+        retry._on_event = self._on_event
+        return retry
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        if self._on_event and isinstance(error, Urllib3Timeout):
+            self._on_event("timeouts")
+        # 구현: 재시도 불가/소진 시 상위 구현이 예외를 던지므로, 반환될 때만 재시도로 집계
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        if self._on_event:
+            self._on_event("retries")
+        return retry
+
+
+class PooledSession(requests.Session):
+    """pyrebase Database의 requests 세션을 대체하는 keep-alive 세션.
+
+    - 기본 타임아웃을 모든 요청에 적용 (pyrebase는 timeout을 넘기지 않음)
+    - GET만 상태 코드/읽기 오류에 대해 재시도, 연결 실패는 요청 전송 전이므로 모든 메서드에서 재시도
+    - 풀이 가득 차면 대기하지 않고 임시 연결을 만든 뒤 폐기 (stats의 connections_created가 pool_size를 넘으면 풀 부족)
+    - 같은 URL/인증으로 동시에 들어온 GET은 진행 중인 요청 하나의 응답 객체를 함께 사용 (stats의 coalesced)
+    """
+
+    def __init__(self, config: Optional[TransportConfig] = None):
+        super().__init__()
+        self.config = config or TransportConfig()
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "failures": 0, "timeouts": 0, "retries": 0}
+        self.flights = SingleFlight() if self.config.singleflight else None
+
+        retry = _CountingRetry(
+            total=self.config.read_retries,
+            connect=self.config.read_retries,
+            read=self.config.read_retries,
+            status=self.config.read_retries,
+            backoff_factor=self.config.retry_backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            raise_on_status=False,
+            on_event=self._count,
+        )
+        self.adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.config.pool_size,
+                                   max_retries=retry, pool_block=False)
+        for scheme in ("http://", "https://"):
+            self.mount(scheme, self.adapter)
+
+    def _count(self, field):
+        with self._lock:
+            self._counters[field] += 1
+
+    def request(self, method, url, **kwargs):
+        # 구현: 호출 측이 타임아웃을 지정하지 않으면 (연결, 읽기) 기본값 적용
+        kwargs.setdefault("timeout", (self.config.connect_timeout, self.config.read_timeout))
+        # 구현: 본문/추가 파라미터가 없는 일반 GET만 URL과 인증/ETag 요청 헤더 기준으로 합침 (스트림 제외)
+        if (self.flights is not None and method.upper() == "GET" and not kwargs.get("stream")
+                and not kwargs.get("params") and not kwargs.get("data") and not kwargs.get("json")):
+            headers = kwargs.get("headers") or {}
+            key = (url, headers.get("Authorization"), headers.get("X-Firebase-ETag"), headers.get("If-None-Match"))
+            return self.flights.do(key, lambda: self._send(method, url, **kwargs))
+        if self.flights is None or method.upper() in ("GET", "HEAD"):
+            return self._send(method, url, **kwargs)
+        # 구현: 쓰기가 끝난 뒤 시작한 GET이 쓰기 전에 출발한 진행 중 GET에 합쳐지지 않도록 떼어 냄
+        try:
+            return self._send(method, url, **kwargs)
+        finally:
+            self.flights.invalidate()
+
+    def _send(self, method, url, **kwargs):
+        self._count("requests")
+        started = time.perf_counter()
+        try:
+            response = super().request(method, url, **kwargs)
+            if not kwargs.get("stream"):
+                # 구현: 본문을 미리 읽어 두어 합쳐진 호출들이 같은 응답을 안전하게 공유하도록 함
+                observe_db_request(len(response.content), time.perf_counter() - started, method, url=url)
+            return response
+        except requests.RequestException:
+            self._count("failures")
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        요청/실패/재시도 횟수와 호스트별 연결 풀 상태를 반환합니다.
+        :return: (dict) counters, pool_size, pools(호스트 -> connections_created/idle/requests)
+        """
+        with self._lock:
+            counters = dict(self._counters)
+        pools = {}
+        # 구현: urllib3 풀 매니저의 호스트별 연결 풀 상태 수집
+        for key in list(self.adapter.poolmanager.pools.keys()):
+            pool = self.adapter.poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            idle = sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool is not None else 0
+            pools[f"{key.key_scheme}://{key.key_host}:{key.key_port}"] = {
+                "connections_created": pool.num_connections,
+                "requests": pool.num_requests,
+                "idle": idle,
+            }
+        if self.flights is not None:
+            counters.update(self.flights.stats())
+        return dict(counters, pool_size=self.config.pool_size, pools=pools)
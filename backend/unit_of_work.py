@@ -0,0 +1,166 @@
+import contextvars
+import copy
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from paths import _assign, _split
+
+# 모듈 요약: 요청 하나 동안 DB 경로 읽기를 기억하는 identity map(UnitOfWork)과 쓰기 묶음(batch)입니다.
+# app.py가 요청 시작/종료 시 begin_unit_of_work()/end_unit_of_work()를 호출하며,
+# DBhandler/AsyncDBhandler는 contextvar로 현재 작업을 찾습니다. (fan-out 스레드와 async 루프에도 전파)
+
+_current_uow: contextvars.ContextVar = contextvars.ContextVar("db_unit_of_work", default=None)
+_current_batch: contextvars.ContextVar = contextvars.ContextVar("db_write_batch", default=None)
+
+
+def current_unit_of_work() -> Optional["UnitOfWork"]:
+    """현재 요청의 UnitOfWork (요청 밖이면 None)."""
+    return _current_uow.get()
+
+
+def begin_unit_of_work() -> contextvars.Token:
+    """새 UnitOfWork를 현재 컨텍스트에 설정하고, 종료 시 넘길 토큰을 반환합니다."""
+    return _current_uow.set(UnitOfWork())
+
+
+def end_unit_of_work(token: contextvars.Token) -> None:
+    """begin_unit_of_work() 이전 상태로 되돌립니다."""
+    try:
+        _current_uow.reset(token)
+    except ValueError:
+        # 구현: 다른 컨텍스트에서 호출된 경우에도 이후 요청으로 새지 않도록 비움
+        _current_uow.set(None)
+
+
+def current_batch() -> Optional[Dict[str, Any]]:
+    """DBhandler.batch() 블록 안이면 모으고 있는 update dict (아니면 None)."""
+    return _current_batch.get()
+
+
+def begin_batch():
+    """
+    쓰기 묶음을 시작합니다.
+    :return: (tuple) (모을 update dict, 종료 시 넘길 토큰)
+    """
+    pending = {}
+    return pending, _current_batch.set(pending)
+
+
+def end_batch(token: contextvars.Token) -> None:
+    _current_batch.reset(token)
+
+
+def _increment(value) -> Optional[float]:
+    if isinstance(value, dict) and isinstance(value.get(".sv"), dict):
+        return value[".sv"].get("increment")
+    return None
+
+
+def merge_updates(pending: Dict[str, Any], updates: Dict[str, Any]) -> None:
+    """
+    다중 경로 update를 pending에 합칩니다. 한 요청 안에 상위/하위 경로가 함께 있으면 Firebase가 거부하므로,
+    상위 경로를 쓰면 기존 하위 경로를 지우고, 이미 있는 상위 경로 아래를 쓰면 그 상위 값에 반영합니다.
+    (상위 값이 None이나 원시 값/increment면 순서대로 적용한 결과처럼 새 dict로 바꾸고,
+     하위 increment는 상위 값 안의 숫자에 더해 넣습니다)
+    """
+    for path, value in updates.items():
+        parts = _split(path)
+        key = "/".join(parts)
+        if _increment(value) is not None and _increment(pending.get(key)) is not None:
+            pending[key] = {".sv": {"increment": _increment(pending[key]) + _increment(value)}}
+            continue
+        for other in list(pending):
+            other_parts = _split(other)
+            if other_parts[:len(parts)] == parts and len(other_parts) > len(parts):
+                del pending[other]
+            elif parts[:len(other_parts)] == other_parts and len(parts) > len(other_parts):
+                base = pending[other] if isinstance(pending[other], dict) and ".sv" not in pending[other] else {}
+                rest = parts[len(other_parts):]
+                if _increment(value) is not None:
+                    current = base
+                    for part in rest:
+                        current = current.get(part) if isinstance(current, dict) else None
+                    number = current if isinstance(current, (int, float)) and not isinstance(current, bool) else 0
+                    value = number + _increment(value)
+                pending[other] = _assign(base, rest, value)
+                break
+        else:
+            pending[key] = value
+
+
+class UnitOfWork:
+    """
+    요청 단위 DB identity map. (스레드 안전)
+    - 읽기: 경로별 결과를 기억하여, 같은 경로나 이미 읽은 상위 경로 아래를 다시 읽으면 DB에 가지 않습니다.
+    - 쓰기: 성공한 update를 기억한 값에 반영합니다. 서버 increment는 기억한 숫자에 더하고,
+            현재 값을 모르면 해당 경로를 잊어 다음 읽기에서 다시 조회합니다.
+    반환 값은 항상 사본이므로 호출 측이 수정해도 기억한 값은 바뀌지 않습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reads: Dict[Tuple[str, ...], Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _find(self, parts):
+        """parts 또는 가장 가까운 기억된 상위 경로에서 값을 찾습니다. (lock 보유 상태에서 호출)"""
+        for i in range(len(parts), 0, -1):
+            if parts[:i] in self._reads:
+                value = self._reads[parts[:i]]
+                for part in parts[i:]:
+                    value = value.get(part) if isinstance(value, dict) else None
+                return True, value
+        return False, None
+
+    def lookup(self, path: str):
+        """
+        기억한 값을 조회합니다.
+        :return: (tuple) (적중 여부, 값의 사본)
+        """
+        parts = tuple(_split(path))
+        with self._lock:
+            hit, value = self._find(parts)
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return hit, copy.deepcopy(value)
+
+    def remember(self, path: str, value: Any) -> None:
+        """DB에서 읽은 값을 기억합니다."""
+        with self._lock:
+            self._reads[tuple(_split(path))] = copy.deepcopy(value)
+
+    def record_write(self, updates: Dict[str, Any]) -> None:
+        """성공한 다중 경로 update를 기억한 값에 반영합니다."""
+        with self._lock:
+            for path, value in updates.items():
+                parts = tuple(_split(path))
+                increment = _increment(value)
+                if increment is not None:
+                    known, current = self._find(parts)
+                    if known and isinstance(current, (int, float)) and not isinstance(current, bool):
+                        value = current + increment
+                    elif known and current is None:
+                        value = increment
+                    else:
+                        # 구현: 현재 값을 모르면 이 경로를 포함하는 기억을 모두 잊음
+                        for key in list(self._reads):
+                            if parts[:len(key)] == key or key[:len(parts)] == parts:
+                                del self._reads[key]
+                        continue
+                value = copy.deepcopy(value)
+                covered = False
+                for key in list(self._reads):
+                    if key[:len(parts)] == parts and len(key) > len(parts):
+                        del self._reads[key]
+                    elif parts[:len(key)] == key:
+                        self._reads[key] = _assign(self._reads[key], list(parts[len(key):]), value)
+                        covered = True
+                if not covered:
+                    self._reads[parts] = value
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "paths": len(self._reads)}